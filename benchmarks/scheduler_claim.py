@@ -0,0 +1,103 @@
+"""
+Latency of the scheduler claim query against a growing number of finished rows.
+
+For every `--finished` size the table gets that many completed schedules plus `--pending` due ones,
+then the claim is timed with the partial `ix_scheduled_url_pending` index and again with only the
+plain status index. Everything runs in one transaction that is rolled back, and every claim runs in
+a savepoint that is rolled back, so all rounds see the same table. The transaction holds an
+exclusive lock on `scheduled_url` while the index is dropped: point it at a local Postgres only.
+
+    python -m benchmarks.scheduler_claim --finished 10000 1000000 --batch-size 100
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, create_async_engine
+
+from src.app.scheduler.dto import SchedulerStatusType
+from src.app.scheduler.repo import claim_due_scheduled_urls_stmt
+from src.core.conf.settings import SETTINGS
+
+_OWNER = "benchmark"
+_LEASE_DURATION = 300.0
+_FILL = text(
+    """
+    INSERT INTO scheduled_url (task_data, scheduled_time, url, url_hash, retry_count, status)
+    SELECT '{}'::jsonb,
+           (now() AT TIME ZONE 'UTC') - interval '1 day' + g * interval '1 millisecond',
+           'https://bench.invalid/' || :prefix || '/' || g,
+           sha256(convert_to('https://bench.invalid/' || :prefix || '/' || g, 'UTF8')),
+           0,
+           CAST(:status AS scheduled_url_status)
+    FROM generate_series(1, :rows) AS g
+    """
+)
+
+
+async def _time_claims(conn: AsyncConnection, batch_size: int, rounds: int) -> list[float]:
+    _timings = []
+    for _ in range(rounds):
+        _savepoint = await conn.begin_nested()
+        _started = time.perf_counter()
+        _claimed = (await conn.execute(claim_due_scheduled_urls_stmt(batch_size, _OWNER, _LEASE_DURATION))).all()
+        _timings.append((time.perf_counter() - _started) * 1000)
+        await _savepoint.rollback()
+        assert len(_claimed) == batch_size, f"claimed {len(_claimed)} of {batch_size}"
+    return _timings
+
+
+async def _plan(conn: AsyncConnection, batch_size: int) -> str:
+    _savepoint = await conn.begin_nested()
+    _stmt = claim_due_scheduled_urls_stmt(batch_size, _OWNER, _LEASE_DURATION).compile(
+        dialect=conn.dialect, compile_kwargs={"literal_binds": True}
+    )
+    _rows = (await conn.execute(text(f"EXPLAIN (ANALYZE, BUFFERS) {_stmt}"))).scalars().all()
+    await _savepoint.rollback()
+    return "\n".join(f"    {_row}" for _row in _rows)
+
+
+def _report(label: str, timings: list[float]) -> None:
+    _p95 = statistics.quantiles(timings, n=20)[-1] if len(timings) > 1 else timings[0]
+    print(f"  {label:<24} median {statistics.median(timings):8.2f} ms   p95 {_p95:8.2f} ms")
+
+
+async def _run_size(conn: AsyncConnection, finished: int, args: argparse.Namespace) -> None:
+    _transaction = await conn.begin()
+    try:
+        await conn.execute(_FILL, {"prefix": "done", "rows": finished, "status": SchedulerStatusType.COMPLETED.str_value})
+        await conn.execute(_FILL, {"prefix": "due", "rows": args.pending, "status": SchedulerStatusType.PENDING.str_value})
+        await conn.execute(text("ANALYZE scheduled_url"))
+        print(f"{finished} finished rows, {args.pending} due rows, claiming {args.batch_size}")
+        _report("partial index", await _time_claims(conn, args.batch_size, args.rounds))
+        if args.explain:
+            print(await _plan(conn, args.batch_size))
+        await conn.execute(text("DROP INDEX ix_scheduled_url_pending"))
+        _report("status index only", await _time_claims(conn, args.batch_size, args.rounds))
+        if args.explain:
+            print(await _plan(conn, args.batch_size))
+    finally:
+        await _transaction.rollback()
+
+
+async def _main(args: argparse.Namespace) -> None:
+    _engine = create_async_engine(SETTINGS.DATABASE.DATABASE_URL)
+    try:
+        async with _engine.connect() as _conn:
+            for _finished in args.finished:
+                await _run_size(_conn, _finished, args)
+    finally:
+        await _engine.dispose()
+
+
+if __name__ == "__main__":
+    _parser = argparse.ArgumentParser(description="Benchmark the scheduler claim query.")
+    _parser.add_argument("--finished", type=int, nargs="+", default=[10_000, 1_000_000], help="finished rows per run")
+    _parser.add_argument("--pending", type=int, default=10_000, help="due pending rows per run")
+    _parser.add_argument("--batch-size", type=int, default=SETTINGS.SCHEDULER.SCHEDULER_CLAIM_BATCH_SIZE)
+    _parser.add_argument("--rounds", type=int, default=50)
+    _parser.add_argument("--explain", action="store_true", help="print EXPLAIN (ANALYZE, BUFFERS) of each variant")
+    asyncio.run(_main(_parser.parse_args()))
@@ -9,6 +9,8 @@ from sqlalchemy import text
 from starlette.middleware.cors import CORSMiddleware
 from starlette.requests import Request
 
+from src.app.crawler.links import LINKS_POOL
+from src.app.crawler.parsing import PARSING_POOL
 from src.app.crawler.rest_api import crawler_router
 from src.core.conf.settings import SETTINGS
 from src.core.di import DependencyContainer
@@ -33,11 +35,20 @@ async def lifespan(_app: CustomFastAPI):
         async with _app.container.pg_db.provided.engine().begin() as _conn:
             await _conn.execute(text("SET lock_timeout = '4s'"))
             await _conn.execute(text("SET statement_timeout = '8s'"))
+        await _app.container.http_clients().start()
+        await _app.container.process_pools().start(LINKS_POOL, PARSING_POOL)
         await _app.container.rmq_broker.provided.connect()()
         await _app.container.scheduler_service.provided.start_scheduled_url_fetcher()()
     except Exception as _e:
         LOGGER.exception(_e)
     yield
+    await _app.container.scheduler_service().stop()
+    await _app.container.http_clients().dispose()
+    await _app.container.pg_listener().stop()
+    await _app.container.article_writer().close()
+    await _app.container.schedule_outcome_writer().close()
+    await _app.container.process_pools().dispose()
+    _app.container.page_archive().close()
 
 
 def create_app() -> CustomFastAPI:
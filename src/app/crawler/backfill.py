@@ -0,0 +1,172 @@
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Optional
+
+from src.app.crawler.dto import ParsedArticleDto
+from src.app.crawler.keywords import KeywordRegistry, KeywordSnapshot
+from src.app.crawler.parsing import parse_archived_articles
+from src.app.crawler.profiles import ExtractionProfileRegistry
+from src.app.crawler.repo import UrlRepository
+from src.app.crawler.writer import ArticleWriter
+from src.core.conf.settings import SETTINGS
+from src.core.db.pg_uow import PgSQLAlchemyUnitOfWork
+
+
+@dataclass
+class BackfillCheckpoint:
+    last_url_id: int = 0
+    processed: int = 0
+    failed: int = 0
+    elapsed: float = 0.0
+
+    @classmethod
+    def load(cls, path: str) -> "BackfillCheckpoint":
+        if not os.path.exists(path):
+            return cls()
+        with open(path) as _file:
+            return cls(**json.load(_file))
+
+    def save(self, path: str) -> None:
+        _tmp = f"{path}.tmp"
+        with open(_tmp, "w") as _file:
+            json.dump(asdict(self), _file)
+        os.replace(_tmp, path)  # never leave a half-written checkpoint behind
+
+
+class ArticleBackfill:
+    """
+    Re-parses every archived page with the current extractors, without touching the network.
+
+    Urls are read in id order, pages are parsed by a process pool straight from the page archive
+    and results are written back one batch per transaction. The last written url id is checkpointed
+    after each commit, so an interrupted run continues where it stopped; re-running a batch is safe
+    because its children are replaced, not appended.
+    """
+
+    def __init__(
+        self,
+        uow: PgSQLAlchemyUnitOfWork,
+        keyword_registry: KeywordRegistry,
+        profile_registry: ExtractionProfileRegistry,
+        article_writer: ArticleWriter,
+        workers: int,
+        batch_size: int,
+        chunk_size: int,
+        checkpoint_path: str,
+        logger=None,
+    ):
+        self._uow = uow
+        self._keyword_registry = keyword_registry
+        self._profile_registry = profile_registry
+        self._article_writer = article_writer
+        self._workers = workers
+        self._batch_size = batch_size
+        self._chunk_size = chunk_size
+        self._checkpoint_path = checkpoint_path
+        self._logger = logger
+
+    async def _next_batch(self, after_url_id: int) -> list:
+        async with self._uow.atomic(read_only=True) as session:
+            return await self._uow.get_repository(UrlRepository, session).get_archived_urls(after_url_id, self._batch_size)
+
+    async def _remaining(self, after_url_id: int) -> int:
+        async with self._uow.atomic(read_only=True) as session:
+            return await self._uow.get_repository(UrlRepository, session).count_archived_urls(after_url_id)
+
+    async def _parse_batch(
+        self, pool: ProcessPoolExecutor, rows: list, keywords: KeywordSnapshot
+    ) -> list[ParsedArticleDto | tuple[int, str]]:
+        _loop = asyncio.get_running_loop()
+        _items = [(_row.id, _row.blob_pointer, await self._profile_registry.profile_for(_row.url)) for _row in rows]
+        _chunks = [_items[_i : _i + self._chunk_size] for _i in range(0, len(_items), self._chunk_size)]
+        _results = await asyncio.gather(
+            *[_loop.run_in_executor(pool, parse_archived_articles, _chunk, keywords) for _chunk in _chunks]
+        )
+        return [_result for _chunk_results in _results for _result in _chunk_results]
+
+    def _report(self, checkpoint: BackfillCheckpoint, run_processed: int, run_started: float, remaining: int) -> None:
+        if not self._logger:
+            return
+        _elapsed = time.monotonic() - run_started
+        _rate = run_processed / _elapsed if _elapsed else 0.0
+        _left = max(remaining - run_processed, 0)
+        _eta = f"{_left / _rate:0.0f}s" if _rate else "n/a"
+        self._logger.info(
+            f"Backfill: {checkpoint.processed} pages done ({checkpoint.failed} failed), "
+            f"{run_processed}/{remaining} this run, {_rate:0.1f} pages/s, "
+            f"last url id {checkpoint.last_url_id}, ETA {_eta}"
+        )
+
+    async def run(self, restart: bool = False, limit: Optional[int] = None) -> BackfillCheckpoint:
+        _checkpoint = BackfillCheckpoint() if restart else BackfillCheckpoint.load(self._checkpoint_path)
+        _remaining = await self._remaining(_checkpoint.last_url_id)
+        if limit is not None:
+            _remaining = min(_remaining, limit)
+        if self._logger:
+            self._logger.info(
+                f"Backfill started after url id {_checkpoint.last_url_id}: {_remaining} pages, {self._workers} workers"
+            )
+        _run_started, _run_processed = time.monotonic(), 0
+        # spawn: workers must not inherit the event loop and the open DB connections of this process
+        _context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=self._workers, mp_context=_context) as _pool:
+            _rows = await self._next_batch(_checkpoint.last_url_id)
+            while _rows and _run_processed < _remaining:
+                _rows = _rows[: _remaining - _run_processed]
+                _batch_started = time.monotonic()
+                # fetch the next ids while this batch is being parsed and written
+                _next_rows = asyncio.create_task(self._next_batch(_rows[-1].id))
+                try:
+                    _keywords = await self._keyword_registry.snapshot()
+                    _parsed = await self._parse_batch(_pool, _rows, _keywords)
+                    _articles = [_result for _result in _parsed if isinstance(_result, ParsedArticleDto)]
+                    for _result in _parsed:
+                        if not isinstance(_result, ParsedArticleDto) and self._logger:
+                            self._logger.warning(f"Backfill failed for url {_result[0]}: {_result[1]}")
+                    await self._article_writer.write(_articles, {_row.id: _row.crawled_at for _row in _rows})
+                except BaseException:
+                    _next_rows.cancel()
+                    raise
+                _checkpoint.last_url_id = _rows[-1].id
+                _checkpoint.processed += len(_articles)
+                _checkpoint.failed += len(_parsed) - len(_articles)
+                _checkpoint.elapsed += time.monotonic() - _batch_started
+                _checkpoint.save(self._checkpoint_path)
+                _run_processed += len(_rows)
+                self._report(_checkpoint, _run_processed, _run_started, _remaining)
+                _rows = await _next_rows
+        if self._logger:
+            self._logger.info(f"Backfill finished: {asdict(_checkpoint)}")
+        return _checkpoint
+
+
+async def _main(args: argparse.Namespace) -> None:
+    from src.core.di import DependencyContainer  # the container itself imports this module
+
+    _container = DependencyContainer()
+    _container.config.from_dict(SETTINGS.model_dump())
+    _overrides = {
+        _name: _value
+        for _name, _value in {"workers": args.workers, "batch_size": args.batch_size}.items()
+        if _value is not None
+    }
+    try:
+        await _container.article_backfill(**_overrides).run(restart=args.restart, limit=args.limit)
+    finally:
+        _container.page_archive().close()
+        await _container.uow().dispose_uow()
+
+
+if __name__ == "__main__":
+    _parser = argparse.ArgumentParser(description="Re-parse archived pages with the current extractors.")
+    _parser.add_argument("--restart", action="store_true", help="ignore the checkpoint and start from the first url")
+    _parser.add_argument("--limit", type=int, default=None, help="stop after this many pages")
+    _parser.add_argument("--workers", type=int, default=None)
+    _parser.add_argument("--batch-size", type=int, default=None)
+    asyncio.run(_main(_parser.parse_args()))
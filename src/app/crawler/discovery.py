@@ -0,0 +1,112 @@
+import datetime
+from email.utils import parsedate_to_datetime
+from typing import Optional
+from xml.etree.ElementTree import Element, ParseError, XMLPullParser
+
+from src.app.crawler.dto import FeedEntryDto
+
+FEED_CONTENT_TYPES = {
+    "application/xml",
+    "text/xml",
+    "application/rss+xml",
+    "application/atom+xml",
+    "application/rdf+xml",
+    "text/plain",
+}
+
+_ENTRY_TAGS = {"url", "sitemap", "item", "entry"}
+_TIME_TAGS = ("lastmod", "updated", "published", "pubDate", "date")
+
+
+def _local_name(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def parse_feed_datetime(value: Optional[str]) -> Optional[datetime.datetime]:
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        _parsed = datetime.datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        try:
+            _parsed = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+    return _parsed if _parsed.tzinfo else _parsed.replace(tzinfo=datetime.timezone.utc)
+
+
+class FeedParser:
+    """
+    Incremental parser for sitemaps, sitemap indexes, RSS and Atom feeds.
+
+    Text is pushed with `feed` as it is downloaded; each `<url>`, `<sitemap>`, `<item>` or `<entry>`
+    is turned into a `FeedEntryDto` and dropped from the tree right away, so memory stays flat
+    no matter how long the document is.
+    """
+
+    def __init__(self):
+        self._parser = XMLPullParser(events=("start", "end"))
+        self._entries: list[FeedEntryDto] = []
+        self._stack: list[Element] = []
+        self._entry_depth: Optional[int] = None
+
+    def feed(self, chunk: str) -> None:
+        self._parser.feed(chunk)
+        self._drain()
+
+    def close(self) -> list[FeedEntryDto]:
+        try:
+            self._parser.close()
+        except ParseError:
+            pass  # keep whatever was parsed from a truncated document
+        self._drain()
+        return self._entries
+
+    def _drain(self) -> None:
+        for _event, _element in self._parser.read_events():
+            if _event == "start":
+                self._stack.append(_element)
+                if self._entry_depth is None and _local_name(_element.tag) in _ENTRY_TAGS:
+                    self._entry_depth = len(self._stack)
+                continue
+            if len(self._stack) == self._entry_depth:
+                self._entry_depth = None
+                _entry = self._to_entry(_element)
+                if _entry:
+                    self._entries.append(_entry)
+            self._stack.pop()
+            if self._entry_depth is None and self._stack:
+                self._stack[-1].remove(_element)
+
+    @staticmethod
+    def _child_text(element: Element, *names: str) -> Optional[str]:
+        for _child in element:
+            if _local_name(_child.tag) in names and _child.text and _child.text.strip():
+                return _child.text.strip()
+        return None
+
+    @staticmethod
+    def _link(element: Element) -> Optional[str]:
+        _fallback = None
+        for _child in element:
+            if _local_name(_child.tag) != "link":
+                continue
+            if _child.text and _child.text.strip():
+                return _child.text.strip()  # RSS
+            _href = _child.get("href")
+            if _href and _child.get("rel", "alternate") == "alternate":
+                return _href  # Atom
+            _fallback = _fallback or _href
+        return _fallback
+
+    def _to_entry(self, element: Element) -> Optional[FeedEntryDto]:
+        _tag = _local_name(element.tag)
+        _url = self._child_text(element, "loc") if _tag in {"url", "sitemap"} else self._link(element)
+        if not _url:
+            return None
+        return FeedEntryDto(
+            url=_url,
+            updated_at=parse_feed_datetime(self._child_text(element, *_TIME_TAGS)),
+            is_sitemap=_tag == "sitemap",
+        )
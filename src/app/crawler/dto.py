@@ -1,4 +1,7 @@
 import datetime
+from typing import Optional
+
+from pydantic import field_validator
 
 from src.core.utils.base_dtos import BaseDto, CamelBaseModel
 
@@ -11,8 +14,8 @@ class ContentDto(BaseDto, CamelBaseModel):
 class MetaDto(BaseDto, CamelBaseModel):
     content_type: str
     http_status: int
-    author_id: int
-    published_at: datetime.datetime
+    author_id: Optional[int] = None
+    published_at: Optional[datetime.datetime] = None
 
 
 class AuthorDto(BaseDto, CamelBaseModel):
@@ -21,5 +24,82 @@ class AuthorDto(BaseDto, CamelBaseModel):
 
 
 class IndexDto(BaseDto, CamelBaseModel):
-    keyword: str
-    frequency: int
+    keyword_ids: list[int]
+    frequencies: list[int]
+
+    @classmethod
+    def from_counts(cls, counts: dict[int, int]) -> "IndexDto":
+        _keyword_ids = sorted(counts)
+        return cls(keyword_ids=_keyword_ids, frequencies=[counts[_id] for _id in _keyword_ids])
+
+    def to_counts(self) -> dict[int, int]:
+        return dict(zip(self.keyword_ids, self.frequencies, strict=True))
+
+
+class ExtractionProfileDto(BaseDto):
+    """Per-domain extraction rules; frozen so the compiled form can be cached by value in every process."""
+
+    domain: str
+    title_selector: Optional[str] = None
+    body_selector: Optional[str] = None
+    author_selector: Optional[str] = None
+    published_at_selector: Optional[str] = None
+    use_json_ld: bool = True
+    use_open_graph: bool = True
+    link_allow_patterns: tuple[str, ...] = ()
+    link_deny_patterns: tuple[str, ...] = ()
+    is_active: bool = True
+    updated_at: Optional[datetime.datetime] = None
+
+    class Config:  # type: ignore
+        frozen = True
+
+    @field_validator("domain")
+    @classmethod
+    def validate_domain(cls, v: str) -> str:
+        _domain = v.strip().lower()
+        return _domain[4:] if _domain.startswith("www.") else _domain
+
+
+class UrlValidatorsDto(BaseDto):
+    """Conditional request validators and body hash of a fetched page."""
+
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    content_hash: str
+
+
+class ParsedArticleDto(BaseDto):
+    url_id: int
+    content: ContentDto
+    meta: MetaDto
+    author: AuthorDto
+    index: IndexDto
+    # stored with the article: a page counts as unchanged only once its article is written
+    validators: Optional[UrlValidatorsDto] = None
+
+
+class ScrapedPageDto(BaseDto):
+    url: str
+    final_url: str
+    status_code: int
+    headers: dict[str, str]
+    content_type: str
+    encoding: str
+    redirects: int = 0
+    size: int
+    elapsed: float
+    text: str
+
+
+class FetchedPageDto(BaseDto):
+    text: str
+    content_type: str
+    http_status: int
+    validators: UrlValidatorsDto
+
+
+class FeedEntryDto(BaseDto):
+    url: str
+    updated_at: Optional[datetime.datetime] = None
+    is_sitemap: bool = False
@@ -4,3 +4,8 @@ from src.core.utils.api.http_exceptions import RequestError
 class UrlExistsError(RequestError):
     code = "URL_EXISTS"
     message = "URL already exists"
+
+
+class InvalidExtractionProfileError(RequestError):
+    code = "INVALID_EXTRACTION_PROFILE"
+    message = "Extraction profile has an invalid selector or link pattern"
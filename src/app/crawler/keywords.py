@@ -0,0 +1,158 @@
+import asyncio
+import hashlib
+import json
+import os
+import re
+import time
+import unicodedata
+from collections import Counter
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Iterable, Optional
+
+from src.app.crawler.repo import KeywordRepository
+from src.core.db.pg_uow import PgSQLAlchemyUnitOfWork
+
+_NON_WORD_RE = re.compile(r"[\W_]+")
+
+
+def normalize_text(text: str) -> str:
+    """
+    NFKC + casefold, with every run of non word characters collapsed into one space and the
+    result padded with spaces. `str.isalnum`-style word characters cover Armenian, Cyrillic etc.,
+    so a keyword wrapped in spaces can only match whole words.
+    """
+    _text = _NON_WORD_RE.sub(" ", unicodedata.normalize("NFKC", text).casefold()).strip()
+    return f" {_text} " if _text else ""
+
+
+class KeywordAutomaton:
+    """
+    Aho–Corasick automaton over normalized keywords: `count` reports the frequency of every
+    keyword in one linear pass over the text, whatever the size of the keyword list.
+    """
+
+    def __init__(self, keywords: Iterable[tuple[int, str]]):
+        self.keyword_ids: list[int] = []
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._output: list[tuple[int, ...]] = [()]
+        _seen: set[str] = set()
+        for _keyword_id, _keyword in keywords:
+            _pattern = normalize_text(_keyword)
+            if not _pattern or _pattern in _seen:
+                continue
+            _seen.add(_pattern)
+            self._insert(_pattern, len(self.keyword_ids))
+            self.keyword_ids.append(_keyword_id)
+        self._link()
+
+    def _insert(self, pattern: str, position: int) -> None:
+        _state = 0
+        for _char in pattern:
+            _next = self._goto[_state].get(_char)
+            if _next is None:
+                _next = self._goto[_state][_char] = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(())
+            _state = _next
+        self._output[_state] += (position,)
+
+    def _link(self) -> None:
+        _queue = list(self._goto[0].values())
+        for _state in _queue:  # breadth first, so fail targets are always complete
+            for _char, _next in self._goto[_state].items():
+                _queue.append(_next)
+                _fail = self._fail[_state]
+                while _fail and _char not in self._goto[_fail]:
+                    _fail = self._fail[_fail]
+                self._fail[_next] = self._goto[_fail].get(_char, 0)
+                self._output[_next] += self._output[self._fail[_next]]
+
+    def _count(self, text: str) -> Counter[int]:
+        _counts: Counter[int] = Counter()
+        _goto, _fail, _output = self._goto, self._fail, self._output
+        _state = 0
+        for _char in normalize_text(text):
+            while _state and _char not in _goto[_state]:
+                _state = _fail[_state]
+            _state = _goto[_state].get(_char, 0)
+            for _position in _output[_state]:
+                _counts[_position] += 1
+        return _counts
+
+    def count(self, text: str) -> dict[int, int]:
+        """Frequencies of the keywords found in `text`, by `keyword.id`."""
+        return {self.keyword_ids[_position]: _count for _position, _count in self._count(text).items()}
+
+
+@dataclass(frozen=True)
+class KeywordSnapshot:
+    """
+    Picklable handle of a keyword list: only the fingerprint and the path of the spooled list
+    travel to pool workers, which build the automaton once per fingerprint.
+    """
+
+    fingerprint: str
+    path: str
+
+
+def keywords_fingerprint(keywords: Iterable[tuple[int, str]]) -> str:
+    return hashlib.sha256(json.dumps(sorted(keywords), ensure_ascii=False).encode()).hexdigest()
+
+
+@lru_cache(maxsize=4)
+def load_automaton(snapshot: KeywordSnapshot) -> KeywordAutomaton:
+    with open(snapshot.path, encoding="utf-8") as _file:
+        return KeywordAutomaton(json.load(_file))
+
+
+class KeywordRegistry:
+    """
+    Keeps the active keyword list of the `keyword` table in sync.
+
+    The table is checked at most every `refresh_interval` seconds; the list is reloaded and a new
+    snapshot is spooled to `snapshot_dir` only when its fingerprint changes.
+    """
+
+    def __init__(self, uow: PgSQLAlchemyUnitOfWork, snapshot_dir: str, refresh_interval: float, logger=None):
+        self._uow = uow
+        self._snapshot_dir = snapshot_dir
+        self._refresh_interval = refresh_interval
+        self._snapshot: Optional[KeywordSnapshot] = None
+        self._version: Optional[tuple] = None
+        self._checked_at = 0.0
+        self._lock = asyncio.Lock()
+        self._logger = logger
+
+    def _spool(self, fingerprint: str, keywords: list[tuple[int, str]]) -> str:
+        os.makedirs(self._snapshot_dir, exist_ok=True)
+        _path = os.path.join(self._snapshot_dir, f"keywords-{fingerprint}.json")
+        if not os.path.exists(_path):
+            _tmp = f"{_path}.{os.getpid()}.tmp"
+            with open(_tmp, "w", encoding="utf-8") as _file:
+                json.dump(keywords, _file, ensure_ascii=False)
+            os.replace(_tmp, _path)
+        return _path
+
+    async def snapshot(self) -> KeywordSnapshot:
+        if self._snapshot and time.monotonic() - self._checked_at < self._refresh_interval:
+            return self._snapshot
+        async with self._lock:
+            if self._snapshot and time.monotonic() - self._checked_at < self._refresh_interval:
+                return self._snapshot
+            async with self._uow.atomic(read_only=True) as session:
+                _repo = self._uow.get_repository(KeywordRepository, session)
+                _version = await _repo.get_keywords_version()
+                _keywords = await _repo.get_active_keywords() if _version != self._version or not self._snapshot else None
+            if _keywords is not None:
+                _fingerprint = keywords_fingerprint(_keywords)
+                if not self._snapshot or _fingerprint != self._snapshot.fingerprint:
+                    _path = await asyncio.to_thread(self._spool, _fingerprint, _keywords)
+                    self._snapshot = KeywordSnapshot(fingerprint=_fingerprint, path=_path)
+                    if self._logger:
+                        self._logger.info(f"Keyword list changed: {len(_keywords)} keywords ({_fingerprint[:12]})")
+            self._version = _version
+            self._checked_at = time.monotonic()
+            return self._snapshot
@@ -0,0 +1,114 @@
+import codecs
+import re
+from html.parser import HTMLParser
+from typing import Optional
+from urllib.parse import urldefrag, urljoin, urlsplit
+
+from src.app.crawler.dto import ExtractionProfileDto
+from src.app.crawler.profiles import compile_profile
+from src.core.utils.charset import SNIFF_BYTES, detect_charset
+from src.core.utils.urls import domain_of, is_same_site, normalize_url, url_hash
+
+LINKS_POOL = "links"
+LINK_SCHEMES = {"http", "https"}
+_CHUNK_SIZE = 64 * 1024
+_LINK_TAGS = {"a", "area"}
+# never an article, whatever the site
+_ASSET_RE = re.compile(
+    r"\.(?:jpe?g|png|gif|webp|svg|ico|bmp|css|js|json|xml|rss|atom|pdf|docx?|xlsx?|pptx?|zip|rar|gz|mp[34]|avi|mov|webm)$",
+    re.IGNORECASE,
+)
+
+
+class LinkExtractor(HTMLParser):
+    """
+    Streaming `href` collector: the document is tokenized as it is fed and no tree is built.
+
+    Relative links are resolved against the first `<base href>` of the page (or the page url),
+    fragments are dropped, only http(s) links are kept and duplicates are removed in order.
+    """
+
+    def __init__(self, base_url: str):
+        super().__init__(convert_charrefs=True)
+        self._base_url = base_url
+        self._base_seen = False
+        self._links: dict[str, None] = {}
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, Optional[str]]]) -> None:
+        if tag == "base" and not self._base_seen:
+            _href = dict(attrs).get("href")
+            if _href:
+                self._base_url = urljoin(self._base_url, _href.strip())
+                self._base_seen = True
+        elif tag in _LINK_TAGS:
+            _href = dict(attrs).get("href")
+            if _href:
+                self._add(_href)
+
+    handle_startendtag = handle_starttag
+
+    def _add(self, href: str) -> None:
+        _url, _ = urldefrag(urljoin(self._base_url, href.strip()))
+        if _url and urlsplit(_url).scheme in LINK_SCHEMES:
+            self._links.setdefault(_url, None)
+
+    @property
+    def links(self) -> list[str]:
+        return list(self._links)
+
+
+def extract_links(content: str | bytes, base_url: str, content_type: Optional[str] = None) -> list[str]:
+    """
+    Collect the links of an HTML document.
+
+    Raw bytes are decoded incrementally with the charset from the `Content-Type` header,
+    a byte order mark or the `<meta>` declaration, in that order.
+    """
+    _extractor = LinkExtractor(base_url)
+    if isinstance(content, bytes):
+        _decoder = codecs.getincrementaldecoder(detect_charset(content_type, content[:SNIFF_BYTES]))(errors="replace")
+        for _start in range(0, len(content), _CHUNK_SIZE):
+            _extractor.feed(_decoder.decode(content[_start : _start + _CHUNK_SIZE]))
+        _extractor.feed(_decoder.decode(b"", final=True))
+    else:
+        for _start in range(0, len(content), _CHUNK_SIZE):
+            _extractor.feed(content[_start : _start + _CHUNK_SIZE])
+    _extractor.close()
+    return _extractor.links
+
+
+def filter_links(links: list[str], base_url: str, profile: Optional[ExtractionProfileDto] = None) -> list[str]:
+    """
+    Keep the links worth scheduling: normalized, on the site of `base_url` (or of its profile),
+    not a static asset and not the page itself. With a profile, a link must not match its deny
+    patterns and, if it has allow patterns, must match one of them. Links sharing a `url_hash`
+    (e.g. with and without `www.`) are kept once, in their first spelling.
+    """
+    _compiled = compile_profile(profile) if profile else None
+    _domain = profile.domain if profile else domain_of(base_url)
+    _allow = _compiled.link_allow if _compiled else None
+    _deny = _compiled.link_deny if _compiled else None
+    _self = url_hash(base_url)
+    _kept: dict[bytes, str] = {}
+    for _link in links:
+        try:
+            _url = normalize_url(_link)
+        except ValueError:  # e.g. a non numeric port
+            continue
+        _key = url_hash(_url)
+        if _key == _self or not is_same_site(_url, _domain) or _ASSET_RE.search(urlsplit(_url).path):
+            continue
+        if (_deny and _deny.search(_url)) or (_allow and not _allow.search(_url)):
+            continue
+        _kept.setdefault(_key, _url)
+    return list(_kept.values())
+
+
+def extract_article_links(
+    content: str | bytes,
+    base_url: str,
+    content_type: Optional[str] = None,
+    profile: Optional[ExtractionProfileDto] = None,
+) -> list[str]:
+    """Process pool entrypoint: `extract_links` followed by `filter_links`."""
+    return filter_links(extract_links(content, base_url, content_type), base_url, profile)
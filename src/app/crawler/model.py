@@ -1,11 +1,13 @@
+import datetime
 from typing import Optional
 
-from sqlalchemy import ForeignKey
+from sqlalchemy import INTEGER, Boolean, DateTime, ForeignKey, Index, String, true
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.app.crawler.mixins import UrlForeignKeyMixin, UrlRelationshipMixin
 from src.core.db.pg_base_model import IntPkIdMixin, PgBaseModel, created_at
-from src.core.db.pg_mixin import StatusMixin
+from src.core.db.pg_mixin import StatusMixin, UrlHashMixin
 from src.core.utils.base_value_objects import BaseIntEnum
 
 
@@ -21,14 +23,20 @@ class CrawlingStatus(BaseIntEnum):
     STOPPED = 8  # Stopped by user
 
 
-class Url(PgBaseModel, IntPkIdMixin, StatusMixin):
+class Url(PgBaseModel, IntPkIdMixin, StatusMixin, UrlHashMixin):
     _status_from = CrawlingStatus
     _status_name = "crawling_status"
 
     url: Mapped[str]
     crawled_at: Mapped[Optional[created_at]]
-
-    index: Mapped[Optional[list["Index"]]] = relationship("Index", back_populates="url", cascade="all, delete-orphan")
+    etag: Mapped[Optional[str]] = mapped_column(nullable=True)
+    last_modified: Mapped[Optional[str]] = mapped_column(nullable=True)
+    content_hash: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+    blob_pointer: Mapped[Optional[str]] = mapped_column(nullable=True)  # location of the page in PAGE_ARCHIVE
+
+    index: Mapped[Optional["IndexPosting"]] = relationship(
+        "IndexPosting", back_populates="url", cascade="all, delete-orphan", uselist=False
+    )
     content: Mapped["Content"] = relationship("Content", back_populates="url", cascade="all, delete-orphan")
     meta: Mapped["Meta"] = relationship("Meta", back_populates="url", cascade="all, delete-orphan")
     author: Mapped["Author"] = relationship("Author", back_populates="url", cascade="all, delete-orphan")
@@ -39,9 +47,18 @@ class Content(PgBaseModel, IntPkIdMixin, UrlForeignKeyMixin, UrlRelationshipMixi
     content: Mapped[str]
 
 
-class Index(PgBaseModel, IntPkIdMixin, UrlForeignKeyMixin, UrlRelationshipMixin):
-    keyword: Mapped[str]
-    frequency: Mapped[int]
+class IndexPosting(PgBaseModel, UrlRelationshipMixin):
+    """
+    Keyword postings of one article, dictionary encoded: `keyword_ids` (ascending `keyword.id`s)
+    and `frequencies` are parallel arrays, so an article costs one row whatever its keyword count.
+    """
+
+    __table_args__ = (Index("ix_index_posting_keyword_ids", "keyword_ids", postgresql_using="gin"),)
+    _url_back_populates = "index"
+
+    url_id: Mapped[int] = mapped_column(INTEGER, ForeignKey("url.id", ondelete="CASCADE"), primary_key=True)
+    keyword_ids: Mapped[list[int]] = mapped_column(ARRAY(INTEGER), nullable=False)
+    frequencies: Mapped[list[int]] = mapped_column(ARRAY(INTEGER), nullable=False)
 
 
 class Author(PgBaseModel, IntPkIdMixin, UrlForeignKeyMixin, UrlRelationshipMixin):
@@ -54,3 +71,27 @@ class Meta(PgBaseModel, IntPkIdMixin, UrlForeignKeyMixin, UrlRelationshipMixin):
     http_status: Mapped[int]
     author_id = mapped_column(ForeignKey("author.id"), nullable=True)
     published_at: Mapped[created_at]
+
+
+class FeedSource(PgBaseModel, IntPkIdMixin):
+    url: Mapped[str] = mapped_column(nullable=False, unique=True)
+    last_seen_at: Mapped[Optional[datetime.datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    last_checked_at: Mapped[Optional[datetime.datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+
+
+class Keyword(PgBaseModel, IntPkIdMixin):
+    keyword: Mapped[str] = mapped_column(nullable=False, unique=True)
+    is_active: Mapped[bool] = mapped_column(Boolean, nullable=False, server_default=true())
+
+
+class ExtractionProfile(PgBaseModel, IntPkIdMixin):
+    domain: Mapped[str] = mapped_column(nullable=False, unique=True)
+    title_selector: Mapped[Optional[str]] = mapped_column(nullable=True)
+    body_selector: Mapped[Optional[str]] = mapped_column(nullable=True)
+    author_selector: Mapped[Optional[str]] = mapped_column(nullable=True)
+    published_at_selector: Mapped[Optional[str]] = mapped_column(nullable=True)
+    use_json_ld: Mapped[bool] = mapped_column(Boolean, nullable=False, server_default=true())
+    use_open_graph: Mapped[bool] = mapped_column(Boolean, nullable=False, server_default=true())
+    link_allow_patterns: Mapped[list[str]] = mapped_column(ARRAY(String), nullable=False, server_default="{}")
+    link_deny_patterns: Mapped[list[str]] = mapped_column(ARRAY(String), nullable=False, server_default="{}")
+    is_active: Mapped[bool] = mapped_column(Boolean, nullable=False, server_default=true())
@@ -0,0 +1,205 @@
+"""
+Synchronous article extractors.
+
+`parse_article` builds one tree per document and every extractor reads from it; the selectors,
+JSON-LD and OpenGraph of a site extraction profile come first. Entrypoints only
+take plain, picklable arguments, so they run in worker processes of a `ProcessPoolExecutor`.
+"""
+
+import datetime
+import json
+from dataclasses import dataclass
+from typing import Optional
+from urllib.parse import urlsplit
+
+from bs4 import BeautifulSoup
+from soupsieve import SoupSieve
+
+from src.app.crawler.discovery import parse_feed_datetime
+from src.app.crawler.dto import AuthorDto, ContentDto, ExtractionProfileDto, IndexDto, MetaDto, ParsedArticleDto
+from src.app.crawler.keywords import KeywordSnapshot, load_automaton
+from src.app.crawler.profiles import CompiledProfile, compile_profile
+from src.core.utils.page_archive import PAGE_ARCHIVE
+
+PARSING_POOL = "parsing"
+
+_PUBLISHED_SELECTORS = (
+    ("meta", {"property": "article:published_time"}, "content"),
+    ("meta", {"itemprop": "datePublished"}, "content"),
+    ("meta", {"name": "pubdate"}, "content"),
+    ("time", {"datetime": True}, "datetime"),
+)
+_ARTICLE_TYPES = {"Article", "NewsArticle", "BlogPosting", "ReportageNewsArticle", "AnalysisNewsArticle", "OpinionNewsArticle"}
+
+
+def _meta_content(soup: BeautifulSoup, **attrs) -> Optional[str]:
+    _tag = soup.find("meta", attrs=attrs)
+    _value = _tag.get("content") if _tag else None
+    return _value.strip() if _value and _value.strip() else None
+
+
+@dataclass
+class ArticleFields:
+    """Values found by the fast paths of a known site; whatever stays empty is left to the heuristics."""
+
+    title: Optional[str] = None
+    body: Optional[str] = None
+    author_name: Optional[str] = None
+    author_url: Optional[str] = None
+    published_at: Optional[datetime.datetime] = None
+
+    def fill(self, **values) -> None:
+        for _name, _value in values.items():
+            if _value and not getattr(self, _name):
+                setattr(self, _name, _value)
+
+
+def _json_ld_article(soup: BeautifulSoup) -> dict:
+    for _script in soup.find_all("script", type="application/ld+json"):
+        try:
+            _nodes = [json.loads(_script.string or "")]
+        except ValueError:
+            continue
+        while _nodes:
+            _node = _nodes.pop(0)
+            if isinstance(_node, list):
+                _nodes.extend(_node)
+            elif isinstance(_node, dict):
+                _types = _node.get("@type")
+                if _ARTICLE_TYPES.intersection(_types if isinstance(_types, list) else [_types]):
+                    return _node
+                _nodes.extend(_node.get("@graph", []))
+    return {}
+
+
+def _json_ld_text(article: dict, key: str) -> Optional[str]:
+    _value = article.get(key)
+    return _value.strip() or None if isinstance(_value, str) else None
+
+
+def _json_ld_author(article: dict) -> tuple[Optional[str], Optional[str]]:
+    _author = article.get("author")
+    if isinstance(_author, list):
+        _author = _author[0] if _author else None
+    if isinstance(_author, dict):
+        return _author.get("name"), _author.get("url")
+    return (_author if isinstance(_author, str) else None), None
+
+
+def _select_texts(soup: BeautifulSoup, selector: Optional[SoupSieve]) -> list[str]:
+    if selector is None:
+        return []
+    return [_text for _node in selector.select(soup) if (_text := _node.get_text("\n", strip=True))]
+
+
+def extract_profile_fields(soup: BeautifulSoup, profile: CompiledProfile) -> ArticleFields:
+    """The selectors of the profile win; JSON-LD and then OpenGraph fill the fields they left empty."""
+    _fields = ArticleFields(
+        title=next(iter(_select_texts(soup, profile.title)), None),
+        body="\n".join(_select_texts(soup, profile.body)) or None,
+        author_name=next(iter(_select_texts(soup, profile.author)), None),
+    )
+    for _node in profile.published_at.select(soup) if profile.published_at is not None else ():
+        _fields.published_at = parse_feed_datetime(_node.get("datetime") or _node.get("content") or _node.get_text(strip=True))
+        if _fields.published_at:
+            break
+    if profile.profile.use_json_ld:
+        _article = _json_ld_article(soup)
+        _author_name, _author_url = _json_ld_author(_article)
+        _fields.fill(
+            title=_json_ld_text(_article, "headline"),
+            body=_json_ld_text(_article, "articleBody"),
+            author_name=_author_name,
+            author_url=_author_url,
+            published_at=parse_feed_datetime(_json_ld_text(_article, "datePublished")),
+        )
+    if profile.profile.use_open_graph:
+        _fields.fill(
+            title=_meta_content(soup, property="og:title"),
+            author_name=_meta_content(soup, property="article:author"),
+            published_at=parse_feed_datetime(_meta_content(soup, property="article:published_time")),
+        )
+    return _fields
+
+
+def extract_content(soup: BeautifulSoup, fields: ArticleFields) -> ContentDto:
+    _title = fields.title or _meta_content(soup, property="og:title")
+    if not _title:
+        _heading = soup.title or soup.h1
+        _title = _heading.get_text(strip=True) if _heading else ""
+    _body = fields.body
+    if not _body:
+        _root = soup.article or soup.body or soup
+        _paragraphs = [_p.get_text(" ", strip=True) for _p in _root.find_all("p")]
+        _body = "\n".join(_p for _p in _paragraphs if _p)
+    return ContentDto(title=_title, content=_body)
+
+
+def extract_meta(
+    soup: BeautifulSoup, fields: ArticleFields, content_type: str = "text/html", http_status: int = 200
+) -> MetaDto:
+    _published_at = fields.published_at
+    for _name, _attrs, _attr in _PUBLISHED_SELECTORS if not _published_at else ():
+        _tag = soup.find(_name, attrs=_attrs)
+        _published_at = parse_feed_datetime(_tag.get(_attr)) if _tag else None
+        if _published_at:
+            break
+    return MetaDto(content_type=content_type, http_status=http_status, published_at=_published_at)
+
+
+def extract_author(soup: BeautifulSoup, fields: ArticleFields) -> AuthorDto:
+    _name, _web_site = fields.author_name, fields.author_url
+    _link = None if _name and _web_site else soup.find(["a", "link"], rel="author", href=True)
+    if not _name:
+        _name = _meta_content(soup, name="author") or _meta_content(soup, property="article:author")
+    if not _name and _link:
+        _name = _link.get_text(strip=True)
+    if not _web_site:
+        _web_site = _link.get("href") if _link else None
+    if not _web_site:
+        _canonical = soup.find("link", rel="canonical", href=True)
+        _web_site = urlsplit(_canonical["href"]).netloc if _canonical else ""
+    return AuthorDto(name=_name or "", web_site=_web_site or "")
+
+
+def extract_index(soup: BeautifulSoup, keywords: KeywordSnapshot) -> IndexDto:
+    return IndexDto.from_counts(load_automaton(keywords).count(soup.get_text(" ")))
+
+
+def parse_article(
+    url_id: int,
+    data: str,
+    keywords: KeywordSnapshot,
+    profile: Optional[ExtractionProfileDto] = None,
+    content_type: str = "text/html",
+    http_status: int = 200,
+) -> ParsedArticleDto:
+    """
+    Parse the document once and run every extractor over the same tree. Sites with an extraction
+    profile are read through its fast paths; the generic heuristics only fill what those left empty.
+    """
+    _soup = BeautifulSoup(data, "html.parser")
+    _fields = extract_profile_fields(_soup, compile_profile(profile)) if profile else ArticleFields()
+    return ParsedArticleDto(
+        url_id=url_id,
+        content=extract_content(_soup, _fields),
+        meta=extract_meta(_soup, _fields, content_type, http_status),
+        author=extract_author(_soup, _fields),
+        index=extract_index(_soup, keywords),
+    )
+
+
+def parse_archived_articles(
+    items: list[tuple[int, str, Optional[ExtractionProfileDto]]], keywords: KeywordSnapshot
+) -> list[ParsedArticleDto | tuple[int, str]]:
+    """
+    Process pool entrypoint: read each `(url_id, blob_pointer, profile)` from the page archive of
+    this process and parse it. Failures are returned as `(url_id, error)` instead of aborting the chunk.
+    """
+    _results: list[ParsedArticleDto | tuple[int, str]] = []
+    for _url_id, _blob_pointer, _profile in items:
+        try:
+            _results.append(parse_article(_url_id, PAGE_ARCHIVE.read_text(_blob_pointer), keywords, _profile))
+        except Exception as e:
+            _results.append((_url_id, f"{type(e).__name__}: {e}"))
+    return _results
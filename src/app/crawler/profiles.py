@@ -0,0 +1,102 @@
+import asyncio
+import re
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional
+
+import soupsieve
+from soupsieve import SoupSieve
+
+from src.app.crawler.dto import ExtractionProfileDto
+from src.app.crawler.repo import ExtractionProfileRepository
+from src.core.db.pg_uow import PgSQLAlchemyUnitOfWork
+from src.core.utils.urls import domain_of
+
+
+def combine_patterns(patterns: tuple[str, ...]) -> Optional[re.Pattern]:
+    """One alternation for a whole pattern list, so a link is checked with a single regex search."""
+    if not patterns:
+        return None
+    return re.compile("|".join(f"(?:{_pattern})" for _pattern in patterns))
+
+
+@dataclass(frozen=True)
+class CompiledProfile:
+    profile: ExtractionProfileDto
+    title: Optional[SoupSieve]
+    body: Optional[SoupSieve]
+    author: Optional[SoupSieve]
+    published_at: Optional[SoupSieve]
+    link_allow: Optional[re.Pattern]
+    link_deny: Optional[re.Pattern]
+
+
+def _compile_selector(selector: Optional[str]) -> Optional[SoupSieve]:
+    return soupsieve.compile(selector) if selector else None
+
+
+@lru_cache(maxsize=1024)
+def compile_profile(profile: ExtractionProfileDto) -> CompiledProfile:
+    """Compiled once per profile version in every process; raises on an invalid selector or pattern."""
+    return CompiledProfile(
+        profile=profile,
+        title=_compile_selector(profile.title_selector),
+        body=_compile_selector(profile.body_selector),
+        author=_compile_selector(profile.author_selector),
+        published_at=_compile_selector(profile.published_at_selector),
+        link_allow=combine_patterns(profile.link_allow_patterns),
+        link_deny=combine_patterns(profile.link_deny_patterns),
+    )
+
+
+class ExtractionProfileRegistry:
+    """
+    In-memory copy of the active rows of `extraction_profile`, keyed by domain.
+
+    The table is checked at most every `refresh_interval` seconds and reloaded only when its
+    count/max(updated_at) marker moved; `invalidate` forces the next lookup to check again.
+    """
+
+    def __init__(self, uow: PgSQLAlchemyUnitOfWork, refresh_interval: float, logger=None):
+        self._uow = uow
+        self._refresh_interval = refresh_interval
+        self._profiles: dict[str, ExtractionProfileDto] = {}
+        self._version: Optional[tuple] = None
+        self._checked_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+        self._logger = logger
+
+    def _is_fresh(self) -> bool:
+        return self._checked_at is not None and time.monotonic() - self._checked_at < self._refresh_interval
+
+    def invalidate(self) -> None:
+        self._checked_at = None
+
+    async def profiles(self) -> dict[str, ExtractionProfileDto]:
+        if self._is_fresh():
+            return self._profiles
+        async with self._lock:
+            if self._is_fresh():
+                return self._profiles
+            async with self._uow.atomic(read_only=True) as session:
+                _repo = self._uow.get_repository(ExtractionProfileRepository, session)
+                _version = await _repo.get_profiles_version()
+                if _version != self._version:
+                    _rows = await _repo.get_active_profiles()
+                    self._profiles = {_row.domain: ExtractionProfileDto.model_validate(_row) for _row in _rows}
+                    if self._logger:
+                        self._logger.info(f"Extraction profiles loaded: {sorted(self._profiles)}")
+            self._version = _version
+            self._checked_at = time.monotonic()
+            return self._profiles
+
+    async def profile_for(self, url: str) -> Optional[ExtractionProfileDto]:
+        """Profile of the url host or of its closest parent domain."""
+        _profiles = await self.profiles()
+        _labels = domain_of(url).split(".")
+        for _i in range(len(_labels) - 1):
+            _profile = _profiles.get(".".join(_labels[_i:]))
+            if _profile:
+                return _profile
+        return None
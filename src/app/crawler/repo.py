@@ -1,8 +1,14 @@
-from sqlalchemy import select, update
+import datetime
+from typing import Optional
 
-from src.app.crawler.model import Author, Content, Index, Meta, Url
+from sqlalchemy import Row, delete, func, select, update
+from sqlalchemy.dialects.postgresql import insert
+
+from src.app.crawler.dto import ExtractionProfileDto, IndexDto, ParsedArticleDto
+from src.app.crawler.model import Author, Content, ExtractionProfile, FeedSource, IndexPosting, Keyword, Meta, Url
 from src.core.db.pg_base_repo import BaseRepository
 from src.core.utils.types import URL_ID
+from src.core.utils.urls import url_hash
 
 
 class UrlRepository(BaseRepository[Url]):
@@ -13,20 +19,148 @@ class UrlRepository(BaseRepository[Url]):
         return await self.bulk_insert_orm_without_commit(urls)
 
     async def is_url_exists(self, url: str) -> bool:
-        _stmt = select(Url).filter(Url.url.ilike(url))
+        _stmt = select(Url.id).where(Url.url_hash == url_hash(url))
         return True if await self.run_select_stmt_for_one(_stmt) else False
 
+    async def add_url_if_not_exists(self, url: str, status: str) -> bool:
+        _stmt = (
+            insert(Url)
+            .values(url=url, status=status)
+            .on_conflict_do_nothing(index_elements=[Url.url_hash])
+            .returning(Url.id)
+        )
+        return await self.run_select_stmt_for_one(_stmt) is not None
+
     async def update_url(self, url_id: URL_ID, kwargs: dict) -> Url:
         _stmt = update(Url).where(Url.id == url_id).values(**kwargs)
         return await self.update_stmt_without_commit(_stmt)
 
+    async def save_validators(self, validators: dict[int, dict]) -> None:
+        """`etag`, `last_modified` and `content_hash` of many urls with one executemany UPDATE by primary key."""
+        if validators:
+            await self.session.execute(update(Url), [{"id": _url_id, **_values} for _url_id, _values in validators.items()])
+
     async def get_url(self, url: str) -> Url:
-        _stmt = select(Url).filter(Url.url.ilike(url))
+        _stmt = select(Url).where(Url.url_hash == url_hash(url))
         return await self.run_select_stmt_for_one(_stmt)
 
+    async def get_archived_urls(self, after_url_id: int, limit: int) -> list[Row]:
+        _stmt = (
+            select(Url.id, Url.url, Url.blob_pointer, Url.crawled_at)
+            .where(Url.id > after_url_id, Url.blob_pointer.is_not(None))
+            .order_by(Url.id)
+            .limit(limit)
+        )
+        return await self.run_select_stmt_for_all_with_row(_stmt)
 
-class IndexRepository(BaseRepository[Index]):
-    ...
+    async def count_archived_urls(self, after_url_id: int) -> int:
+        _stmt = select(func.count()).select_from(Url).where(Url.id > after_url_id, Url.blob_pointer.is_not(None))
+        return await self.run_select_stmt_for_one(_stmt)
+
+    async def replace_articles(self, articles: list[ParsedArticleDto], published_fallback: dict[int, datetime.datetime]):
+        """
+        Swap the parsed children of many urls at once: old rows are deleted and the new ones
+        are written with one multi-row INSERT per table, then the validators of the fetched pages
+        are stored on their urls. Keyword postings are written by `IndexRepository`.
+        """
+        if not articles:
+            return
+        await self.save_validators(
+            {_a.url_id: _a.validators.model_dump() for _a in articles if _a.validators is not None}
+        )
+        _url_ids = [_article.url_id for _article in articles]
+        for _model in (Meta, Content, Author):
+            await self.run_delete_stmt_without_commit(delete(_model).where(_model.url_id.in_(_url_ids)))
+        await self.session.execute(
+            insert(Content), [{"url_id": _a.url_id, **_a.content.model_dump()} for _a in articles]
+        )
+        _authors = await self.session.execute(
+            insert(Author).returning(Author.id, Author.url_id),
+            [{"url_id": _a.url_id, **_a.author.model_dump()} for _a in articles],
+        )
+        _author_ids = {_url_id: _author_id for _author_id, _url_id in _authors.all()}
+        await self.session.execute(
+            insert(Meta),
+            [
+                {
+                    "url_id": _a.url_id,
+                    "content_type": _a.meta.content_type,
+                    "http_status": _a.meta.http_status,
+                    "author_id": _author_ids.get(_a.url_id),
+                    "published_at": _a.meta.published_at or published_fallback[_a.url_id],
+                }
+                for _a in articles
+            ],
+        )
+
+
+class IndexRepository(BaseRepository[IndexPosting]):
+    async def write_postings(self, postings: dict[int, IndexDto]) -> None:
+        """Replace the postings of many urls with one multi-row upsert; urls without keywords get none."""
+        _rows = [
+            {"url_id": _url_id, "keyword_ids": _index.keyword_ids, "frequencies": _index.frequencies}
+            for _url_id, _index in postings.items()
+            if _index.keyword_ids
+        ]
+        _empty = [_url_id for _url_id, _index in postings.items() if not _index.keyword_ids]
+        if _empty:
+            await self.delete_postings(_empty)
+        if not _rows:
+            return
+        _stmt = insert(IndexPosting).values(_rows)
+        _stmt = _stmt.on_conflict_do_update(
+            index_elements=[IndexPosting.url_id],
+            set_={
+                "keyword_ids": _stmt.excluded.keyword_ids,
+                "frequencies": _stmt.excluded.frequencies,
+                "updated_at": func.now(),
+            },
+        )
+        await self.session.execute(_stmt)
+
+    async def copy_postings(self, postings: dict[int, IndexDto]) -> None:
+        """
+        Replace the postings of many urls with a binary COPY on the connection of the session, which
+        keeps it in the same transaction. Falls back to `write_postings` when the driver is not asyncpg.
+        """
+        _connection = await (await self.session.connection()).get_raw_connection()
+        _driver = _connection.driver_connection
+        if not hasattr(_driver, "copy_records_to_table"):
+            return await self.write_postings(postings)
+        await self.delete_postings(list(postings))
+        _records = [
+            (_url_id, _index.keyword_ids, _index.frequencies) for _url_id, _index in postings.items() if _index.keyword_ids
+        ]
+        if _records:
+            await _driver.copy_records_to_table(
+                IndexPosting.__tablename__, records=_records, columns=["url_id", "keyword_ids", "frequencies"]
+            )
+
+    async def delete_postings(self, url_ids: list[int]) -> None:
+        await self.run_delete_stmt_without_commit(delete(IndexPosting).where(IndexPosting.url_id.in_(url_ids)))
+
+    async def get_postings(self, url_ids: list[int]) -> dict[int, IndexDto]:
+        _stmt = select(IndexPosting.url_id, IndexPosting.keyword_ids, IndexPosting.frequencies).where(
+            IndexPosting.url_id.in_(url_ids)
+        )
+        return {
+            _row.url_id: IndexDto(keyword_ids=_row.keyword_ids, frequencies=_row.frequencies)
+            for _row in await self.run_select_stmt_for_all_with_row(_stmt)
+        }
+
+    async def get_url_ids_by_keywords(self, keyword_ids: list[int], limit: int, after_url_id: int = 0) -> list[int]:
+        """Urls mentioning all of `keyword_ids`, answered by the GIN index on the postings array."""
+        _stmt = (
+            select(IndexPosting.url_id)
+            .where(IndexPosting.keyword_ids.contains(keyword_ids), IndexPosting.url_id > after_url_id)
+            .order_by(IndexPosting.url_id)
+            .limit(limit)
+        )
+        return await self.run_select_stmt_for_all(_stmt)
+
+    async def get_keyword_frequencies(self, url_id: int) -> dict[int, int]:
+        _postings = await self.get_postings([url_id])
+        return _postings[url_id].to_counts() if url_id in _postings else {}
 
 
 class ContentRepository(BaseRepository[Content]):
@@ -39,3 +173,55 @@ class MetaRepository(BaseRepository[Meta]):
 
 class AuthorRepository(BaseRepository[Author]):
     ...
+
+
+class FeedSourceRepository(BaseRepository[FeedSource]):
+    async def get_or_create_feed_source(self, url: str) -> FeedSource:
+        _insert = insert(FeedSource).values(url=url).on_conflict_do_nothing(index_elements=[FeedSource.url])
+        await self.session.execute(_insert)
+        _stmt = select(FeedSource).filter(FeedSource.url == url)
+        return await self.run_select_stmt_for_one(_stmt)
+
+    async def mark_feed_source_checked(self, feed_id: int, last_seen_at: Optional[datetime.datetime]):
+        _values: dict = {"last_checked_at": datetime.datetime.now(tz=datetime.timezone.utc)}
+        if last_seen_at:
+            _values["last_seen_at"] = last_seen_at
+        _stmt = update(FeedSource).where(FeedSource.id == feed_id).values(**_values)
+        await self.update_stmt_without_commit(_stmt)
+
+
+class KeywordRepository(BaseRepository[Keyword]):
+    async def get_active_keywords(self) -> list[tuple[int, str]]:
+        _stmt = select(Keyword.id, Keyword.keyword).where(Keyword.is_active.is_(True)).order_by(Keyword.id)
+        return [tuple(_row) for _row in await self.run_select_stmt_for_all_with_row(_stmt)]
+
+    async def get_keywords_version(self) -> tuple:
+        """Cheap change marker: it moves whenever rows are added, removed or updated (`updated_at`)."""
+        _stmt = select(func.count(Keyword.id), func.max(Keyword.updated_at))
+        _result = await self.session.execute(_stmt)
+        return tuple(_result.one())
+
+
+class ExtractionProfileRepository(BaseRepository[ExtractionProfile]):
+    async def get_active_profiles(self) -> list[ExtractionProfile]:
+        _stmt = select(ExtractionProfile).where(ExtractionProfile.is_active.is_(True))
+        return await self.run_select_stmt_for_all(_stmt)
+
+    async def get_profiles(self) -> list[ExtractionProfile]:
+        _stmt = select(ExtractionProfile).order_by(ExtractionProfile.domain)
+        return await self.run_select_stmt_for_all(_stmt)
+
+    async def get_profiles_version(self) -> tuple:
+        _stmt = select(func.count(ExtractionProfile.id), func.max(ExtractionProfile.updated_at))
+        _result = await self.session.execute(_stmt)
+        return tuple(_result.one())
+
+    async def upsert_profile(self, profile: ExtractionProfileDto) -> ExtractionProfile:
+        _values = profile.model_dump(exclude={"updated_at"})
+        _stmt = insert(ExtractionProfile).values(**_values)
+        _stmt = _stmt.on_conflict_do_update(
+            index_elements=[ExtractionProfile.domain],
+            set_={**{_key: _stmt.excluded[_key] for _key in _values if _key != "domain"}, "updated_at": func.now()},
+        ).returning(ExtractionProfile)
+        _result = await self.session.execute(_stmt)
+        return _result.scalar_one()
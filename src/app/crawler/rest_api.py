@@ -1,10 +1,12 @@
 from dependency_injector.wiring import Provide, inject
 from fastapi import APIRouter, Depends
 
-from src.app.crawler.service import CrawlerService
+from src.app.crawler.dto import ExtractionProfileDto
+from src.app.crawler.service import CrawlerService, ParsingService
 from src.app.worker.dto import ByDateFetchUrlDto
 from src.core.di import DependencyContainer
 from src.core.utils.api.cbv import cbv
+from src.core.utils.api.circuit_breakers import CircuitBreakerRegistry
 from src.core.utils.api.response import ResponseDto
 from src.core.utils.base_value_objects import UrlString
 
@@ -25,8 +27,38 @@ class CrawlerController:
     async def add_url(
         self, urls: list[UrlString], crawler_service: CrawlerService = Depends(Provide[DependencyContainer.crawling_service])
     ) -> ResponseDto[list]:
-        await crawler_service.schedule_urls(urls)
-        return ResponseDto(data=urls)
+        return ResponseDto(data=await crawler_service.schedule_urls(urls))
+
+    @crawler_router.post("/discover-feeds")
+    @inject
+    async def discover_feeds(
+        self, urls: list[UrlString], crawler_service: CrawlerService = Depends(Provide[DependencyContainer.crawling_service])
+    ) -> ResponseDto[dict]:
+        _discovered = {_url: await crawler_service.discover_urls_from_feed(_url) for _url in urls}
+        return ResponseDto(data=_discovered)
+
+    @crawler_router.get("/circuit-breakers")
+    @inject
+    async def circuit_breakers(
+        self, registry: CircuitBreakerRegistry = Depends(Provide[DependencyContainer.circuit_breakers])
+    ) -> ResponseDto[list[dict]]:
+        return ResponseDto(data=registry.snapshot())
+
+    @crawler_router.get("/extraction-profiles")
+    @inject
+    async def extraction_profiles(
+        self, parsing_service: ParsingService = Depends(Provide[DependencyContainer.parsing_service])
+    ) -> ResponseDto[list[ExtractionProfileDto]]:
+        return ResponseDto(data=await parsing_service.get_extraction_profiles())
+
+    @crawler_router.put("/extraction-profiles")
+    @inject
+    async def upsert_extraction_profile(
+        self,
+        profile: ExtractionProfileDto,
+        parsing_service: ParsingService = Depends(Provide[DependencyContainer.parsing_service]),
+    ) -> ResponseDto[ExtractionProfileDto]:
+        return ResponseDto(data=await parsing_service.upsert_extraction_profile(profile))
 
     @crawler_router.get("/test")
     @inject
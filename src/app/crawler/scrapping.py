@@ -1,2 +1,68 @@
-class FakeCrawler:
-    ...
+import asyncio
+from typing import Optional, Protocol
+
+from src.app.crawler.dto import ScrapedPageDto
+from src.core.utils.api.custom_requests import create_streaming_get_request
+
+
+class Scraper(Protocol):
+    async def fetch_page(self, url: str, headers: Optional[dict] = None) -> ScrapedPageDto: ...
+
+    async def fetch_pages(self, urls: list[str]) -> list[ScrapedPageDto | Exception]: ...
+
+    async def scrape_data(self, url: str) -> str: ...
+
+
+class HttpScraper:
+    """
+    Scraper on top of the pooled HTTP client and the streaming GET: redirects are followed,
+    the charset is detected from the response, every network fetch goes through the per-host
+    throttle of the HTTP clients and at most `concurrency` pages are downloaded at once by this process.
+    """
+
+    def __init__(self, concurrency: int, logger=None):
+        self._concurrency = concurrency
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._logger = logger
+
+    async def fetch_page(self, url: str, headers: Optional[dict] = None) -> ScrapedPageDto:
+        async with self._semaphore:
+            _response = await create_streaming_get_request(url="", base_url=url, headers=headers, follow_redirects=True)
+        _page = ScrapedPageDto(
+            url=url,
+            final_url=_response.url,
+            status_code=_response.status_code,
+            headers=_response.headers,
+            content_type=_response.content_type,
+            encoding=_response.encoding,
+            redirects=_response.redirects,
+            size=_response.size,
+            elapsed=_response.elapsed,
+            text=_response.text or "",
+        )
+        if self._logger:
+            self._logger.info(
+                f"Fetched {url} -> {_page.final_url} [{_page.status_code}] "
+                f"{_page.size} bytes ({_page.encoding}) in {_page.elapsed:0.3f}s"
+            )
+        return _page
+
+    async def fetch_pages(self, urls: list[str]) -> list[ScrapedPageDto | Exception]:
+        _queue: asyncio.Queue[tuple[int, str]] = asyncio.Queue()
+        for _item in enumerate(urls):
+            _queue.put_nowait(_item)
+        _results: list[ScrapedPageDto | Exception] = [None] * len(urls)  # type: ignore
+
+        async def _worker():
+            while not _queue.empty():
+                _position, _url = _queue.get_nowait()
+                try:
+                    _results[_position] = await self.fetch_page(_url)
+                except Exception as e:
+                    _results[_position] = e
+
+        await asyncio.gather(*[_worker() for _ in range(min(self._concurrency, len(urls)))])
+        return _results
+
+    async def scrape_data(self, url: str) -> str:
+        return (await self.fetch_page(url)).text
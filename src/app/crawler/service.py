@@ -1,28 +1,57 @@
-import asyncio
 import datetime
-from typing import Any
+import hashlib
+import re
+from http import HTTPStatus
+from typing import Optional
 
-from bs4 import BeautifulSoup
+from soupsieve import SelectorSyntaxError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.app.crawler.dto import AuthorDto, ContentDto, IndexDto, MetaDto
-from src.app.crawler.exception import UrlExistsError
-from src.app.crawler.model import Author, Content, CrawlingStatus, Index, Meta, Url
-from src.app.crawler.repo import UrlRepository
+from src.app.crawler.discovery import FEED_CONTENT_TYPES, FeedParser
+from src.app.crawler.dto import (
+    ExtractionProfileDto,
+    FeedEntryDto,
+    FetchedPageDto,
+    ParsedArticleDto,
+    ScrapedPageDto,
+    UrlValidatorsDto,
+)
+from src.app.crawler.exception import InvalidExtractionProfileError, UrlExistsError
+from src.app.crawler.keywords import KeywordRegistry
+from src.app.crawler.links import LINKS_POOL, extract_article_links
+from src.app.crawler.model import CrawlingStatus, FeedSource, Url
+from src.app.crawler.parsing import PARSING_POOL, parse_article
+from src.app.crawler.profiles import ExtractionProfileRegistry, compile_profile
+from src.app.crawler.repo import ExtractionProfileRepository, FeedSourceRepository, UrlRepository
+from src.app.crawler.scrapping import Scraper
+from src.app.crawler.writer import ArticleWriter
 from src.app.scheduler.service import SchedulerService
 from src.app.worker.dto import ByDateFetchUrlDto
 from src.core.db.pg_uow import PgSQLAlchemyUnitOfWork
-from src.core.utils.api.custom_requests import create_get_request
+from src.core.utils.api.custom_requests import StreamedResponseDto, create_streaming_get_request
+from src.core.utils.api.http_exceptions import ServiceException
 from src.core.utils.api.logger import LOGGER
 from src.core.utils.base_value_objects import UrlString
+from src.core.utils.page_archive import PageArchive
+from src.core.utils.process_pool import ProcessPoolRegistry
 from src.core.utils.types import URL_ID
+from src.core.utils.urls import normalize_url
 
 
 class ParsingService:
-    def __init__(self, uow: PgSQLAlchemyUnitOfWork, scraper: Any):
+    def __init__(
+        self,
+        uow: PgSQLAlchemyUnitOfWork,
+        process_pools: ProcessPoolRegistry,
+        keyword_registry: KeywordRegistry,
+        profile_registry: ExtractionProfileRegistry,
+        article_writer: ArticleWriter,
+    ):
         self._uow = uow
-        self._scraper = scraper
-        self._keywords = {"a", "b"}  # TODO: Move to db
+        self._process_pools = process_pools
+        self._keyword_registry = keyword_registry
+        self._profile_registry = profile_registry
+        self._article_writer = article_writer
 
     async def is_unique_url(self, url: UrlString, session: AsyncSession, with_exception=True):
         _is_exists = await self._uow.get_repository(UrlRepository, session).is_url_exists(url)
@@ -32,75 +61,171 @@ class ParsingService:
 
     async def add_scheduled_url(self, url: UrlString) -> Url:
         async with self._uow.atomic() as session:
-            _url = await self._uow.get_repository(UrlRepository, session).get_url(url)
-            if _url:
+            _repo = self._uow.get_repository(UrlRepository, session)
+            if not await _repo.add_url_if_not_exists(normalize_url(url), CrawlingStatus.QUEUED.str_value):
                 LOGGER.info(f"Url {url} already exists in URL table")
-                return _url
-            return await self._uow.get_repository(UrlRepository, session).add_url(
-                Url.factory(url=url, status=CrawlingStatus.QUEUED.str_value)
-            )
+            return await _repo.get_url(url)
 
-    async def _parse_content(self, data: str) -> ContentDto:
-        ...
-
-    async def _parse_meta(self, data: str) -> MetaDto:
-        ...
+    async def parse_article(
+        self, url: Url, data: str, content_type: str = "text/html", http_status: int = 200
+    ) -> ParsedArticleDto:
+        _keywords = await self._keyword_registry.snapshot()
+        _profile = await self._profile_registry.profile_for(url.url)
+        return await self._process_pools.run(
+            parse_article, url.id, data, _keywords, _profile, content_type, http_status, pool=PARSING_POOL
+        )
 
-    async def _parse_author(self, data: str) -> AuthorDto:
-        ...
+    async def add_additional_data_to_url(
+        self,
+        url: Url,
+        data: str,
+        validators: Optional[UrlValidatorsDto] = None,
+        content_type: str = "text/html",
+        http_status: int = 200,
+    ):
+        _article = await self.parse_article(url, data, content_type, http_status)
+        if validators is not None:
+            _article = _article.model_copy(update={"validators": validators})
+        await self._article_writer.submit(_article, url.crawled_at)
 
-    async def _get_keyword_frequency(self, data: str) -> list[IndexDto]:
-        _keyword_to_frequency: list[IndexDto] = []
-        for _keyword in self._keywords:
-            # TODO: Find frequency in effective way + parallel
-            ...
-        return _keyword_to_frequency
+    async def find_sub_urls(self, content: str | bytes, base_url: str, content_type: Optional[str] = None) -> list[str]:
+        """Same-site links of the page that pass the link filter of its extraction profile."""
+        _profile = await self._profile_registry.profile_for(base_url)
+        _links = await self._process_pools.run(
+            extract_article_links, content, base_url, content_type, _profile, pool=LINKS_POOL
+        )
+        LOGGER.info(f"Found {len(_links)} sub urls on {base_url}")
+        return _links
 
-    async def _parse_index(self, data: str) -> list[IndexDto]:
-        return await self._get_keyword_frequency(data)
+    async def get_extraction_profiles(self) -> list[ExtractionProfileDto]:
+        async with self._uow.atomic(read_only=True) as session:
+            _profiles = await self._uow.get_repository(ExtractionProfileRepository, session).get_profiles()
+        return [ExtractionProfileDto.model_validate(_profile) for _profile in _profiles]
 
-    async def add_additional_data_to_url(self, url: Url, data: str):
-        _content: ContentDto = await self._parse_content(data)  # TODO: May be parallel bottom 3
-        _meta: MetaDto = await self._parse_meta(data)
-        _author: AuthorDto = await self._parse_author(data)
-        _indexes: list[IndexDto] = await self._parse_index(data)
+    async def upsert_extraction_profile(self, profile: ExtractionProfileDto) -> ExtractionProfileDto:
+        try:
+            compile_profile(profile)
+        except (re.error, SelectorSyntaxError) as e:
+            raise InvalidExtractionProfileError(f"Extraction profile of {profile.domain} is invalid: {e}") from e
         async with self._uow.atomic() as session:
-            url.content = Content.factory(**_content.model_dump())
-            url.author = Author.factory(**_author.model_dump())
-            url.meta = Meta.factory(**_author.model_dump())
-            url.index = [Index.factory(**_index.model_dump()) for _index in _indexes]
-            await self._uow.get_repository(UrlRepository, session).add_url(url)
-
-    @staticmethod
-    async def find_sub_urls(content: str) -> list[str]:
-        soup = BeautifulSoup(content, "html.parser")
-        return [link.get("href") for link in soup.find_all("a", href=True)]
+            _profile = await self._uow.get_repository(ExtractionProfileRepository, session).upsert_profile(profile)
+        self._profile_registry.invalidate()
+        return ExtractionProfileDto.model_validate(_profile)
 
 
 class FetchingService:
-    def __init__(self, uow: PgSQLAlchemyUnitOfWork, scraper: Any):
+    def __init__(
+        self,
+        uow: PgSQLAlchemyUnitOfWork,
+        scraper: Scraper,
+        page_archive: PageArchive,
+        feed_max_bytes: int,
+        feed_max_sitemaps: int,
+    ):
         self._uow = uow
         self._scraper = scraper
+        self._page_archive = page_archive
+        self._feed_max_bytes = feed_max_bytes
+        self._feed_max_sitemaps = feed_max_sitemaps
 
-    @staticmethod
-    async def check_url_by_date(url: UrlString, year: str, month: str, day: str) -> str:
-        _resp = await create_get_request(
+    async def check_url_by_date(self, url: UrlString, year: str, month: str, day: str) -> StreamedResponseDto:
+        return await create_streaming_get_request(
             base_url=url,
             url=f"{year}/{month}/{day}",
+            cache=1,
         )
-        return _resp
 
-    async def fetch_info_from_url(self, url: Url) -> str:
+    @staticmethod
+    def _conditional_headers(url: Url) -> Optional[dict]:
+        _headers = {}
+        if url.etag:
+            _headers["If-None-Match"] = url.etag
+        if url.last_modified:
+            _headers["If-Modified-Since"] = url.last_modified
+        return _headers or None
+
+    async def fetch_info_from_url(self, url: Url) -> Optional[FetchedPageDto]:
+        """
+        Fetch the page behind `url`; returns None when it has not changed since the last crawl (a 304
+        or the same body hash). The validators of a changed page are not stored here but together with
+        its article, so a page whose article was never written is fetched and parsed again.
+        """
         LOGGER.info(f"Fetching info from url {url.id}")
-        _data: str = await self._scraper.scrape_data(url.url)  # TODO: This should be fault tolerant
-        async with self._uow.atomic() as session:
-            await self._uow.get_repository(UrlRepository, session).update_url(
-                url_id=URL_ID(url.id),
-                kwargs={
-                    "crawled_at": datetime.datetime.now(tz=datetime.timezone.utc),
-                },
+        # TODO: This should be fault tolerant
+        _page: ScrapedPageDto = await self._scraper.fetch_page(url.url, headers=self._conditional_headers(url))
+        _values: dict = {"crawled_at": datetime.datetime.now(tz=datetime.timezone.utc)}
+        _fetched = None
+        if _page.status_code != HTTPStatus.NOT_MODIFIED:
+            _validators = UrlValidatorsDto(
+                etag=_page.headers.get("etag"),
+                last_modified=_page.headers.get("last-modified"),
+                content_hash=hashlib.sha256(_page.text.encode()).hexdigest(),
             )
-        return _data
+            if _validators.content_hash == url.content_hash:
+                _values.update(_validators.model_dump())  # its article is already written
+            else:
+                _values["blob_pointer"] = str(await self._page_archive.put_text(_page.text))
+                _fetched = FetchedPageDto(
+                    text=_page.text, content_type=_page.content_type, http_status=_page.status_code, validators=_validators
+                )
+        async with self._uow.atomic() as session:
+            await self._uow.get_repository(UrlRepository, session).update_url(url_id=URL_ID(url.id), kwargs=_values)
+        for _field, _value in _values.items():
+            setattr(url, _field, _value)
+        return _fetched
+
+    async def get_archived_page(self, url: Url) -> Optional[str]:
+        """Read back the last fetched body of `url` from the page archive, without hitting the network."""
+        if not url.blob_pointer:
+            return None
+        return await self._page_archive.get_text(url.blob_pointer)
+
+    async def get_feed_source(self, feed_url: UrlString) -> FeedSource:
+        async with self._uow.atomic() as session:
+            return await self._uow.get_repository(FeedSourceRepository, session).get_or_create_feed_source(feed_url)
+
+    async def mark_feed_source_checked(self, feed_id: int, last_seen_at: Optional[datetime.datetime]):
+        async with self._uow.atomic() as session:
+            await self._uow.get_repository(FeedSourceRepository, session).mark_feed_source_checked(feed_id, last_seen_at)
+
+    async def _stream_feed(self, url: str) -> list[FeedEntryDto]:
+        _parser = FeedParser()
+        await create_streaming_get_request(
+            url="",
+            base_url=url,
+            on_chunk=_parser.feed,
+            max_bytes=self._feed_max_bytes,
+            allowed_content_types=FEED_CONTENT_TYPES,
+            follow_redirects=True,
+        )
+        return _parser.close()
+
+    async def fetch_feed_entries(self, feed_url: UrlString, since: Optional[datetime.datetime]) -> list[FeedEntryDto]:
+        """
+        Read a sitemap (following sitemap indexes) or an RSS/Atom feed and return the
+        article entries changed after `since`; entries without a timestamp are always returned.
+        """
+        _pending, _visited, _entries = [feed_url], set(), []
+        while _pending and len(_visited) < self._feed_max_sitemaps:
+            _url = _pending.pop(0)
+            if _url in _visited:
+                continue
+            _visited.add(_url)
+            try:
+                _feed = await self._stream_feed(_url)
+            except ServiceException as e:
+                if _url == feed_url:
+                    raise
+                LOGGER.warning(f"Skipping sitemap {_url}: {e.message}")
+                continue
+            for _entry in _feed:
+                if since and _entry.updated_at and _entry.updated_at <= since:
+                    continue
+                if _entry.is_sitemap:
+                    _pending.append(_entry.url)
+                else:
+                    _entries.append(_entry)
+        return _entries
 
 
 class CrawlerService:
@@ -113,22 +238,36 @@ class CrawlerService:
 
     async def check_url_by_date_add_scheduled_url(self, url_date: ByDateFetchUrlDto):
         # Should be changed on Working Scrapper(scrapy, playwright...)
-        _content = await self._fetching_service.check_url_by_date(url_date.url, url_date.year, url_date.month, url_date.day)
-        if _content:
-            _sub_urls = await self._parsing_service.find_sub_urls(_content)
+        _resp = await self._fetching_service.check_url_by_date(url_date.url, url_date.year, url_date.month, url_date.day)
+        if _resp.text:
+            _sub_urls = await self._parsing_service.find_sub_urls(_resp.text, _resp.url)
             await self.schedule_urls(_sub_urls)
 
-    async def schedule_urls(self, urls: list[UrlString]):
-        await asyncio.gather(*[self._scheduler_service.add_scheduled_url(url) for url in urls])
+    async def discover_urls_from_feed(self, feed_url: UrlString) -> list[str]:
+        _source = await self._fetching_service.get_feed_source(feed_url)
+        _entries = await self._fetching_service.fetch_feed_entries(feed_url, _source.last_seen_at)
+        _urls = list(dict.fromkeys(_entry.url for _entry in _entries))
+        await self.schedule_urls(_urls)
+        _last_seen_at = max((_entry.updated_at for _entry in _entries if _entry.updated_at), default=None)
+        await self._fetching_service.mark_feed_source_checked(_source.id, _last_seen_at)
+        LOGGER.info(f"Discovered {len(_urls)} new urls from {feed_url}")
+        return _urls
+
+    async def schedule_urls(self, urls: list[UrlString]) -> list[str]:
+        return await self._scheduler_service.add_scheduled_urls(urls)
 
-    async def find_sub_urls(self, content: str) -> list[str]:
-        return await self._parsing_service.find_sub_urls(content)
+    async def find_sub_urls(self, content: str, base_url: str) -> list[str]:
+        return await self._parsing_service.find_sub_urls(content, base_url)
 
     async def fetch_info_from_url(self, url: UrlString) -> Url:
-        await asyncio.sleep(3)
         _url = await self._parsing_service.add_scheduled_url(url)
-        _data = await self._fetching_service.fetch_info_from_url(_url)
-        await self._parsing_service.add_additional_data_to_url(_url, _data)
+        _page = await self._fetching_service.fetch_info_from_url(_url)
+        if _page is None:
+            LOGGER.info(f"Url {_url.id} not modified since last crawl, skipping parsing")
+            return _url
+        await self._parsing_service.add_additional_data_to_url(
+            _url, _page.text, _page.validators, content_type=_page.content_type, http_status=_page.status_code
+        )
         return _url
 
     async def process_fetched_content(self, url_id: int):
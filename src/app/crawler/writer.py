@@ -0,0 +1,112 @@
+import asyncio
+import datetime
+from typing import Optional
+
+from src.app.crawler.dto import ParsedArticleDto
+from src.app.crawler.repo import IndexRepository, UrlRepository
+from src.core.db.pg_uow import PgSQLAlchemyUnitOfWork
+
+
+class ArticleWriter:
+    """
+    Persists parsed articles and all their children with a fixed number of statements per batch.
+
+    `write` stores a batch in one transaction: content, authors and meta with one multi-row INSERT
+    each, keyword postings with a binary COPY once the batch reaches `copy_threshold` articles.
+    `submit` lets concurrent consumers share those transactions: articles are buffered until
+    `batch_size` of them are waiting or `flush_interval` seconds passed, and each caller is
+    released when the commit holding its article is done. When a batch fails, its articles are
+    retried one per transaction so every caller gets the outcome of its own article.
+    """
+
+    def __init__(
+        self,
+        uow: PgSQLAlchemyUnitOfWork,
+        batch_size: int = 100,
+        flush_interval: float = 0.05,
+        copy_threshold: int = 500,
+        logger=None,
+    ):
+        self._uow = uow
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._copy_threshold = copy_threshold
+        self._pending: list[tuple[ParsedArticleDto, datetime.datetime, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._flushes: set[asyncio.Task] = set()
+        self._logger = logger
+
+    async def write(self, articles: list[ParsedArticleDto], published_fallback: dict[int, datetime.datetime]) -> None:
+        if not articles:
+            return
+        async with self._uow.atomic() as session:
+            await self._uow.get_repository(UrlRepository, session).replace_articles(articles, published_fallback)
+            _postings = {_article.url_id: _article.index for _article in articles}
+            _index_repo = self._uow.get_repository(IndexRepository, session)
+            if len(articles) >= self._copy_threshold:
+                await _index_repo.copy_postings(_postings)
+            else:
+                await _index_repo.write_postings(_postings)
+
+    async def submit(self, article: ParsedArticleDto, published_fallback: datetime.datetime) -> None:
+        _future = asyncio.get_running_loop().create_future()
+        self._pending.append((article, published_fallback, _future))
+        if len(self._pending) >= self._batch_size:
+            self._start_flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self._flush_interval, self._start_flush)
+        await _future
+
+    def _start_flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+        _batch, self._pending = self._pending, []
+        _task = asyncio.create_task(self._flush(_batch))
+        self._flushes.add(_task)
+        _task.add_done_callback(self._flushes.discard)
+
+    async def _flush(self, batch: list[tuple[ParsedArticleDto, datetime.datetime, asyncio.Future]]) -> None:
+        # the last submission of a url wins, a statement must not touch the same url twice
+        _latest = {_article.url_id: (_article, _fallback) for _article, _fallback, _ in batch}
+        _errors: dict[int, Exception] = {}
+        try:
+            await self.write(
+                [_article for _article, _ in _latest.values()],
+                {_url_id: _fallback for _url_id, (_, _fallback) in _latest.items()},
+            )
+        except Exception as e:
+            if self._logger:
+                self._logger.error(f"Article batch of {len(batch)} failed: {e}")
+            if len(_latest) == 1:
+                _errors = dict.fromkeys(_latest, e)
+            else:
+                _errors = await self._write_one_by_one(_latest)
+        for _article, _, _future in batch:
+            if _future.done():
+                continue
+            _error = _errors.get(_article.url_id)
+            if _error is None:
+                _future.set_result(None)
+            else:
+                _future.set_exception(_error)
+
+    async def _write_one_by_one(self, articles: dict[int, tuple[ParsedArticleDto, datetime.datetime]]) -> dict[int, Exception]:
+        """Fallback of a failed batch: one transaction per article, so a bad row only fails its own callers."""
+        _errors: dict[int, Exception] = {}
+        for _url_id, (_article, _fallback) in articles.items():
+            try:
+                await self.write([_article], {_url_id: _fallback})
+            except Exception as e:
+                if self._logger:
+                    self._logger.error(f"Article of url {_url_id} failed: {e}")
+                _errors[_url_id] = e
+        return _errors
+
+    async def close(self) -> None:
+        """Write whatever is still buffered and wait for the running flushes."""
+        self._start_flush()
+        if self._flushes:
+            await asyncio.gather(*self._flushes, return_exceptions=True)
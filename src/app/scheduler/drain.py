@@ -0,0 +1,164 @@
+import asyncio
+import datetime
+import time
+from typing import Awaitable, Callable, Optional
+
+# rows can be due but locked by another dispatcher, never spin faster than this
+_MIN_IDLE = 0.1
+
+
+class AdaptiveBatchSize:
+    """
+    Claim batch size driven by publish latency (AIMD): fed once per claimed batch with the time the
+    batch took to publish, it grows by `increment` rows while the smoothed latency stays under
+    `target_latency` and is cut multiplicatively as soon as it does not.
+    """
+
+    def __init__(
+        self,
+        initial: int,
+        minimum: int,
+        maximum: int,
+        target_latency: float,
+        backoff_factor: float = 0.5,
+        increment: int = 10,
+    ):
+        self._minimum = minimum
+        self._maximum = maximum
+        self._target_latency = target_latency
+        self._backoff_factor = backoff_factor
+        self._increment = increment
+        self._size = float(min(max(initial, minimum), maximum))
+        self.latency = 0.0
+
+    @property
+    def value(self) -> int:
+        return int(self._size)
+
+    def record(self, latency: float) -> None:
+        self.latency = latency if not self.latency else 0.8 * self.latency + 0.2 * latency
+        if self.latency > self._target_latency:
+            self._size = max(float(self._minimum), self._size * self._backoff_factor)
+        else:
+            self._size = min(float(self._maximum), self._size + self._increment)
+
+
+class DrainLoop:
+    """
+    Keeps claiming and dispatching batches while due rows remain, then sleeps until the next due
+    time reported by `next_due` (at most `max_idle` seconds) or until `wake` is called.
+
+    At most `max_in_flight` dispatches run at once and a claim never asks for more rows than there
+    are free slots, so claimed rows do not sit in `PROCESSING` waiting for a slot.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        claim: Callable[[int], Awaitable[list[dict]]],
+        dispatch: Callable[[dict], Awaitable[None]],
+        next_due: Callable[[], Awaitable[Optional[datetime.datetime]]],
+        batch_size: AdaptiveBatchSize,
+        max_in_flight: int,
+        max_idle: float,
+        logger=None,
+    ):
+        self._name = name
+        self._claim = claim
+        self._dispatch = dispatch
+        self._next_due = next_due
+        self._batch_size = batch_size
+        self._max_in_flight = max_in_flight
+        self._max_idle = max_idle
+        self._in_flight: set[asyncio.Task] = set()
+        self._slot_freed = asyncio.Event()
+        self._woken = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._sleep_until: Optional[datetime.datetime] = None
+        self._logger = logger
+
+    def start(self) -> asyncio.Task:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name=f"drain-{self._name}")
+        return self._task
+
+    def wake(self) -> None:
+        self._woken.set()
+
+    def notify_due(self, due: Optional[datetime.datetime]) -> None:
+        """Wake the loop if a row due at `due` (naive UTC, None if unknown) comes before its planned wake up."""
+        if due is None or self._sleep_until is None or due < self._sleep_until:
+            self.wake()
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+        if self._in_flight:
+            await asyncio.gather(*self._in_flight, return_exceptions=True)
+
+    def _record_batch(self, started: float) -> Callable[[asyncio.Future], None]:
+        def _record(batch: asyncio.Future) -> None:
+            if not batch.cancelled():
+                self._batch_size.record(time.perf_counter() - started)
+
+        return _record
+
+    def _on_done(self, task: asyncio.Task) -> None:
+        self._in_flight.discard(task)
+        self._slot_freed.set()
+        if not task.cancelled() and task.exception() and self._logger:
+            self._logger.error(f"{self._name} dispatch failed: {task.exception()}")
+
+    @staticmethod
+    def _utcnow() -> datetime.datetime:
+        return datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)  # scheduled_time is naive UTC
+
+    async def _idle(self) -> None:
+        _delay = self._max_idle
+        try:
+            _next_due = await self._next_due()
+        except Exception as e:
+            if self._logger:
+                self._logger.error(f"{self._name} next due lookup failed: {e}")
+            _next_due = None
+        if _next_due is not None:
+            _delay = min(max((_next_due - self._utcnow()).total_seconds(), _MIN_IDLE), self._max_idle)
+        self._sleep_until = self._utcnow() + datetime.timedelta(seconds=_delay)
+        try:
+            await asyncio.wait_for(self._woken.wait(), timeout=_delay)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            self._sleep_until = None
+
+    async def _run(self) -> None:
+        if self._logger:
+            self._logger.info(f"{self._name} drain loop started")
+        while True:
+            while len(self._in_flight) >= self._max_in_flight:
+                self._slot_freed.clear()
+                await self._slot_freed.wait()
+            self._woken.clear()
+            try:
+                _rows = await self._claim(min(self._batch_size.value, self._max_in_flight - len(self._in_flight)))
+            except Exception as e:
+                if self._logger:
+                    self._logger.error(f"{self._name} claim failed: {e}")
+                await asyncio.sleep(min(1.0, self._max_idle))
+                continue
+            if not _rows:
+                await self._idle()
+                continue
+            _started = time.perf_counter()
+            _tasks = [asyncio.create_task(self._dispatch(_row)) for _row in _rows]
+            for _task in _tasks:
+                self._in_flight.add(_task)
+                _task.add_done_callback(self._on_done)
+            # dispatches run concurrently, the batch latency is the one of its slowest publish
+            asyncio.gather(*_tasks, return_exceptions=True).add_done_callback(self._record_batch(_started))
+            if self._logger:
+                self._logger.debug(
+                    f"{self._name}: claimed {len(_rows)}, in flight {len(self._in_flight)}, "
+                    f"next batch {self._batch_size.value}, latency {self._batch_size.latency:0.3f}s"
+                )
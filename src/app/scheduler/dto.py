@@ -1,4 +1,6 @@
+from dataclasses import dataclass
 from datetime import datetime
+from typing import Optional
 
 from pydantic import BaseModel, field_validator
 
@@ -12,6 +14,17 @@ class SchedulerStatusType(BaseIntEnum):
     PROCESSING = 4
 
 
+@dataclass(slots=True)
+class ScheduleOutcome:
+    """Result of one dispatch, written back to its scheduled or predefined url row."""
+
+    id: int
+    status: SchedulerStatusType
+    retry_count: int
+    exception_info: Optional[str] = None
+    # next attempt of a retried row: `scheduled_time` of a scheduled url (None keeps it), `next_attempt_at` of a predefined one
+    retry_at: Optional[datetime] = None
+
 
 class TaskDataDto(BaseModel):
     queue: str
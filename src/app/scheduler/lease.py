@@ -0,0 +1,54 @@
+import asyncio
+from typing import Awaitable, Callable, Iterable, Optional
+
+
+class LeaseHeartbeat:
+    """
+    Keeps the leases of claimed rows alive while they are dispatched: every `interval` seconds the
+    deadline of every held row is pushed with one `extend` call. Rows are held from their claim
+    until the `ScheduleOutcomeWriter` flush holding their outcome is over, not merely until the
+    outcome is buffered, so a slow batch or a slow flush is not taken back by another replica.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        extend: Callable[[list[int]], Awaitable[int]],
+        interval: float,
+        logger=None,
+    ):
+        self._name = name
+        self._extend = extend
+        self._interval = interval
+        self._held: set[int] = set()
+        self._task: Optional[asyncio.Task] = None
+        self._logger = logger
+
+    def hold(self, ids: Iterable[int]) -> None:
+        self._held.update(ids)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name=f"heartbeat-{self._name}")
+
+    def release(self, row_id: int) -> None:
+        self._held.discard(row_id)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self._interval)
+            _ids = list(self._held)
+            if not _ids:
+                continue
+            try:
+                _extended = await self._extend(_ids)
+            except Exception as e:
+                if self._logger:
+                    self._logger.error(f"{self._name} lease heartbeat failed: {e}")
+                continue
+            if _extended < len(_ids) and self._logger:
+                self._logger.warning(f"{self._name}: {len(_ids) - _extended} of {len(_ids)} leases were lost")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
@@ -1,18 +1,42 @@
 from datetime import datetime
+from typing import Optional
 
+from sqlalchemy import Index, text
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column
 
 from src.app.scheduler.dto import SchedulerStatusType
 from src.core.db.pg_base_model import IntPkIdMixin, PgBaseModel
-from src.core.db.pg_mixin import StatusMixin
+from src.core.db.pg_mixin import StatusMixin, UrlHashMixin
+
+# claim queries only ever look at pending rows and leased ones, finished ones stay out of these indexes
+_PENDING = text(f"status = '{SchedulerStatusType.PENDING.str_value}'")
+_PROCESSING = text(f"status = '{SchedulerStatusType.PROCESSING.str_value}'")
+
+
+class LeaseMixin:
+    """
+    Scheduler replica dispatching a claimed row, the deadline after which any replica may take it back
+    and how many times in a row it was taken back since its last recorded outcome.
+    """
+
+    claimed_by: Mapped[Optional[str]] = mapped_column(nullable=True)
+    lease_expires_at: Mapped[Optional[datetime]] = mapped_column(nullable=True)
+    reclaim_count: Mapped[int] = mapped_column(nullable=False, default=0, server_default="0")
 
 
 class ScheduledUrl(
     PgBaseModel,
     IntPkIdMixin,
     StatusMixin,
+    UrlHashMixin,
+    LeaseMixin,
 ):
+    __table_args__ = (
+        Index("ix_scheduled_url_pending", "scheduled_time", postgresql_where=_PENDING),
+        Index("ix_scheduled_url_lease", "lease_expires_at", postgresql_where=_PROCESSING),
+    )
+
     _status_name = "scheduled_url_status"
     _status_from = SchedulerStatusType
 
@@ -23,7 +47,12 @@ class ScheduledUrl(
     exception_info: Mapped[str] = mapped_column(nullable=True)
 
 
-class PredefinedUrl(PgBaseModel, IntPkIdMixin, StatusMixin):
+class PredefinedUrl(PgBaseModel, IntPkIdMixin, StatusMixin, UrlHashMixin, LeaseMixin):
+    __table_args__ = (
+        Index("ix_predefined_url_pending", "id", postgresql_where=_PENDING),
+        Index("ix_predefined_url_lease", "lease_expires_at", postgresql_where=_PROCESSING),
+    )
+
     _status_name = "predefined_url_status"
     _status_from = SchedulerStatusType
 
@@ -31,3 +60,4 @@ class PredefinedUrl(PgBaseModel, IntPkIdMixin, StatusMixin):
     retry_count: Mapped[int] = mapped_column(nullable=False, default=0)
     exception_info: Mapped[str] = mapped_column(nullable=True)
     task_data: Mapped[dict] = mapped_column(JSONB, nullable=False)
+    next_attempt_at: Mapped[Optional[datetime]] = mapped_column(nullable=True)  # set while a failed dispatch waits
@@ -0,0 +1,95 @@
+import asyncio
+from typing import Optional
+
+from src.app.scheduler.dto import ScheduleOutcome
+from src.app.scheduler.model import PredefinedUrl, ScheduledUrl
+from src.app.scheduler.repo import SchedulerRepository
+from src.core.db.pg_uow import PgSQLAlchemyUnitOfWork
+
+
+class ScheduleOutcomeWriter:
+    """
+    Records dispatch outcomes of scheduled and predefined urls off the dispatch path.
+
+    `record_*` only buffers the outcome; once `batch_size` of them are waiting or `flush_interval`
+    seconds passed, every buffered outcome of a table is applied with one `UPDATE ... FROM (VALUES ...)`
+    in one transaction. Only rows still leased to `owner` are updated. A failed flush is logged and
+    its rows stay `PROCESSING` until their lease expires and they are claimed again.
+
+    `record_*` returns a future that is done once the flush holding the outcome is over, whether it
+    was written or not: the lease of the row has to be kept alive until then.
+    """
+
+    def __init__(
+        self,
+        uow: PgSQLAlchemyUnitOfWork,
+        owner: str,
+        batch_size: int = 500,
+        flush_interval: float = 0.05,
+        logger=None,
+    ):
+        self._uow = uow
+        self._owner = owner
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        # the last outcome of a row wins, a statement must not update the same row twice
+        self._pending: dict[type, dict[int, ScheduleOutcome]] = {ScheduledUrl: {}, PredefinedUrl: {}}
+        self._waiters: dict[type, list[asyncio.Future]] = {ScheduledUrl: [], PredefinedUrl: []}
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._flushes: set[asyncio.Task] = set()
+        self._logger = logger
+
+    async def write(self, model: type[ScheduledUrl | PredefinedUrl], outcomes: list[ScheduleOutcome]) -> None:
+        if not outcomes:
+            return
+        async with self._uow.atomic() as session:
+            await self._uow.get_repository(SchedulerRepository, session).record_outcomes(model, outcomes, self._owner)
+
+    def record_scheduled_url(self, outcome: ScheduleOutcome) -> asyncio.Future:
+        return self._record(ScheduledUrl, outcome)
+
+    def record_predefined_url(self, outcome: ScheduleOutcome) -> asyncio.Future:
+        return self._record(PredefinedUrl, outcome)
+
+    def _record(self, model: type, outcome: ScheduleOutcome) -> asyncio.Future:
+        _flushed = asyncio.get_running_loop().create_future()
+        self._pending[model][outcome.id] = outcome
+        self._waiters[model].append(_flushed)
+        if sum(map(len, self._pending.values())) >= self._batch_size:
+            self._start_flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self._flush_interval, self._start_flush)
+        return _flushed
+
+    def _start_flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        for _model, _outcomes in self._pending.items():
+            if not _outcomes:
+                continue
+            _waiters = self._waiters[_model]
+            self._pending[_model], self._waiters[_model] = {}, []
+            _task = asyncio.create_task(self._flush(_model, list(_outcomes.values()), _waiters))
+            self._flushes.add(_task)
+            _task.add_done_callback(self._flushes.discard)
+
+    async def _flush(self, model: type, outcomes: list[ScheduleOutcome], waiters: list[asyncio.Future]) -> None:
+        try:
+            await self.write(model, outcomes)
+        except Exception as e:
+            if self._logger:
+                self._logger.error(f"{model.__name__} outcome batch of {len(outcomes)} failed: {e}")
+        else:
+            if self._logger:
+                self._logger.debug(f"{model.__name__}: recorded {len(outcomes)} outcomes")
+        finally:
+            for _waiter in waiters:
+                if not _waiter.done():
+                    _waiter.set_result(None)
+
+    async def close(self) -> None:
+        """Write whatever is still buffered and wait for the running flushes."""
+        self._start_flush()
+        if self._flushes:
+            await asyncio.gather(*self._flushes, return_exceptions=True)
@@ -1,125 +1,218 @@
-from sqlalchemy import func, select, text, update
-
-from src.app.scheduler.dto import SchedulerStatusType
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import (
+    DateTime,
+    Float,
+    Integer,
+    Interval,
+    Row,
+    String,
+    Update,
+    case,
+    cast,
+    column,
+    func,
+    literal,
+    literal_column,
+    or_,
+    select,
+    union_all,
+    update,
+    values,
+)
+from sqlalchemy.dialects.postgresql import insert
+
+from src.app.scheduler.dto import ScheduleOutcome, SchedulerStatusType
 from src.app.scheduler.model import PredefinedUrl, ScheduledUrl
 from src.core.db.pg_base_repo import BaseRepository
+from src.core.utils.urls import url_hash
+
+_NOW_UTC = literal_column("(CURRENT_TIMESTAMP AT TIME ZONE 'UTC')", DateTime)
+# inlined, not bound: a generic plan of a prepared statement can only use the partial
+# `... WHERE status = '1'` / `'4'` indexes when the predicate is a literal
+_PENDING = literal_column(f"'{SchedulerStatusType.PENDING.str_value}'")
+_PROCESSING = literal_column(f"'{SchedulerStatusType.PROCESSING.str_value}'")
+
+
+def _lease_deadline(lease_duration: float):
+    # make_interval(years, months, weeks, days, hours, mins, secs)
+    return _NOW_UTC + func.make_interval(0, 0, 0, 0, 0, 0, literal(float(lease_duration), Float), type_=Interval)
+
+
+def _claim_stmt(
+    model: type[ScheduledUrl | PredefinedUrl],
+    due: list,
+    order_by,
+    limit: int,
+    owner: str,
+    lease_duration: float,
+) -> Update:
+    """
+    Lease up to `limit` rows to `owner` for `lease_duration` seconds and return them. Rows whose lease
+    expired (their owner died mid-dispatch) are taken back first, then due pending rows in `order_by`
+    order. Both come from partial indexes and `SKIP LOCKED` lets any number of replicas claim at once.
+    Taking a row back does not count as an attempt, it bumps `reclaim_count` instead so a row that
+    keeps killing its owner can be given up on.
+    """
+    _expired = (
+        select(model.id)
+        .where(model.status == _PROCESSING, model.lease_expires_at < _NOW_UTC)
+        .order_by(model.lease_expires_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+        .cte(f"expired_{model.__tablename__}")
+    )
+    _due = (
+        select(model.id)
+        .where(model.status == _PENDING, *due)
+        .order_by(order_by)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+        .cte(f"due_{model.__tablename__}")
+    )
+    # the CTEs are read lazily: once `limit` ids came from the expired leases no due row gets locked
+    _claimed = union_all(select(_expired.c.id), select(_due.c.id)).limit(limit).subquery()
+    return (
+        update(model)
+        .where(model.id.in_(select(_claimed.c.id)))
+        .values(
+            status=SchedulerStatusType.PROCESSING.str_value,
+            claimed_by=owner,
+            lease_expires_at=_lease_deadline(lease_duration),
+            reclaim_count=model.reclaim_count + case((model.status == _PROCESSING, 1), else_=0),
+        )
+        .returning(model.id, model.task_data, model.retry_count, model.reclaim_count, model.url)
+    )
+
+
+def claim_due_scheduled_urls_stmt(limit: int, owner: str, lease_duration: float) -> Update:
+    """Lease due scheduled urls, oldest first, from `ix_scheduled_url_pending` and `ix_scheduled_url_lease`."""
+    return _claim_stmt(
+        ScheduledUrl,
+        [ScheduledUrl.scheduled_time <= _NOW_UTC],
+        ScheduledUrl.scheduled_time,
+        limit,
+        owner,
+        lease_duration,
+    )
+
+
+def claim_pending_predefined_urls_stmt(limit: int, owner: str, lease_duration: float) -> Update:
+    """
+    Lease pending predefined urls from `ix_predefined_url_pending` and `ix_predefined_url_lease`.
+    Rows waiting for the retry of a failed dispatch are skipped until their `next_attempt_at`.
+    """
+    return _claim_stmt(
+        PredefinedUrl,
+        [or_(PredefinedUrl.next_attempt_at.is_(None), PredefinedUrl.next_attempt_at <= _NOW_UTC)],
+        PredefinedUrl.id,
+        limit,
+        owner,
+        lease_duration,
+    )
+
+
+def extend_leases_stmt(model: type[ScheduledUrl | PredefinedUrl], ids: list[int], owner: str, lease_duration: float) -> Update:
+    return (
+        update(model)
+        .where(model.id.in_(ids), model.status == _PROCESSING, model.claimed_by == owner)
+        .values(lease_expires_at=_lease_deadline(lease_duration))
+    )
+
+
+def _next_lease_deadline(model: type[ScheduledUrl | PredefinedUrl]):
+    return select(func.min(model.lease_expires_at)).where(model.status == _PROCESSING).scalar_subquery()
+
+
+def record_outcomes_stmt(model: type[ScheduledUrl | PredefinedUrl], outcomes: list[ScheduleOutcome], owner: str) -> Update:
+    """
+    One `UPDATE ... FROM (VALUES ...)` applying status, retry count, exception and next attempt time
+    of every outcome and releasing its lease. A scheduled url without a retry time keeps its
+    `scheduled_time`. Rows no longer leased to `owner` were taken back by another replica and are left alone.
+    """
+    _outcome = values(
+        column("id", Integer),
+        column("status", String),
+        column("retry_count", Integer),
+        column("exception_info", String),
+        column("retry_at", DateTime),
+        name="outcome",
+    ).data([(_o.id, _o.status.str_value, _o.retry_count, _o.exception_info, _o.retry_at) for _o in outcomes])
+    # a VALUES column holding only NULLs is typed text, hence the casts
+    _changes = {
+        "status": cast(_outcome.c.status, model.status.type),
+        "retry_count": _outcome.c.retry_count,
+        "exception_info": cast(_outcome.c.exception_info, String),
+        "claimed_by": None,
+        "lease_expires_at": None,
+        "reclaim_count": 0,
+    }
+    if model is ScheduledUrl:
+        _changes["scheduled_time"] = func.coalesce(cast(_outcome.c.retry_at, DateTime), ScheduledUrl.scheduled_time)
+    else:
+        _changes["next_attempt_at"] = cast(_outcome.c.retry_at, DateTime)
+    return (
+        update(model)
+        .where(model.id == _outcome.c.id, model.status == _PROCESSING, model.claimed_by == owner)
+        .values(**_changes)
+    )
 
 
 class SchedulerRepository(BaseRepository[ScheduledUrl]):
     async def is_url_exists(self, url: str) -> bool:
-        _stmt = select(ScheduledUrl).filter(ScheduledUrl.url.ilike(url))
+        _stmt = select(ScheduledUrl.id).where(ScheduledUrl.url_hash == url_hash(url))
         return True if await self.run_select_stmt_for_one(_stmt) else False
 
     async def add_scheduled_url(self, schedule: ScheduledUrl) -> ScheduledUrl:
         return await self.insert_one_without_commit(schedule)
 
-    async def fetch_10_pending_scheduled_urls_mark_as_processing(self) -> list[dict]:
-        # WORKS
-        # Step 1: Subquery for Pending Schedules
-        _subquery = (
-            select(ScheduledUrl.id.label("id"))
-            .where(
-                ScheduledUrl.scheduled_time <= text("CURRENT_TIMESTAMP AT TIME ZONE 'UTC'"),
-                ScheduledUrl.status == SchedulerStatusType.PENDING.str_value,
-            )
-            .order_by(ScheduledUrl.scheduled_time.asc())
-            .limit(10)
-            .with_for_update(skip_locked=True)
-            .cte("subquery")
+    async def add_scheduled_urls(self, schedules: list[dict]) -> list[Row]:
+        """One multi-row insert; urls that are already scheduled are skipped and only new rows are returned."""
+        # `_url_hash_default` reads the row through `get_current_parameters()`, which raises KeyError on a
+        # multi-row VALUES built from the mapped class (its per-row bind names are table qualified)
+        _stmt = (
+            insert(ScheduledUrl)
+            .values([{**_schedule, "url_hash": url_hash(_schedule["url"])} for _schedule in schedules])
+            .on_conflict_do_nothing(index_elements=[ScheduledUrl.url_hash])
+            .returning(ScheduledUrl.id, ScheduledUrl.url)
         )
+        return await self.run_select_stmt_for_all_with_row(_stmt)
 
-        # Step 2: Lock and update schedules to PROCESSING
-        _locks = select(_subquery.c.id)
-        _stmt = (
-            update(ScheduledUrl)
-            .where(ScheduledUrl.id.in_(_locks))
-            .values(status=SchedulerStatusType.PROCESSING.str_value)
-            .returning(
-                ScheduledUrl.id,
-                ScheduledUrl.task_data,
-                ScheduledUrl.retry_count,
-                ScheduledUrl.url,
-                ScheduledUrl.scheduled_time,
-                ScheduledUrl.created_at,
-            )
-        ).cte("updated_schedules")
-
-        # Step 3: Define a CTE with row numbers partitioned by id
-        _numbered_schedules = (
-            select(
-                _stmt.c.id,
-                _stmt.c.task_data,
-                _stmt.c.retry_count,
-                _stmt.c.url,
-                _stmt.c.scheduled_time,
-                _stmt.c.created_at,
-                func.row_number().over(partition_by=_stmt.c.id, order_by=_stmt.c.created_at.desc()).label("row_num"),
+    async def claim_due_scheduled_urls(self, limit: int, owner: str, lease_duration: float) -> list[dict]:
+        return await self.update_stmt_with_commit_returning(claim_due_scheduled_urls_stmt(limit, owner, lease_duration))
+
+    async def get_next_due_time(self) -> Optional[datetime]:
+        """Earliest pending `scheduled_time` or lease deadline, whichever comes first."""
+        _stmt = select(
+            func.least(
+                select(func.min(ScheduledUrl.scheduled_time)).where(ScheduledUrl.status == _PENDING).scalar_subquery(),
+                _next_lease_deadline(ScheduledUrl),
             )
-        ).cte("numbered_schedules")
-
-        # Step 4: Select only the most recent schedules (where row_num == 1) from the updated records
-        _latest_schedules = select(
-            _numbered_schedules.c.id,
-            _numbered_schedules.c.task_data,
-            _numbered_schedules.c.row_num,
-            _numbered_schedules.c.retry_count,
-            _numbered_schedules.c.url,
-        ).filter(_numbered_schedules.c.row_num == 1)  # type: ignore
-
-        _schedules = await self.update_stmt_with_commit_returning(_latest_schedules)
-        return _schedules
-
-    async def update_scheduled_url_status_by_id(self, schedule_id, kwargs: dict):
-        _stmt = update(ScheduledUrl).where(ScheduledUrl.id == schedule_id).values(**kwargs)
-        await self.update_stmt_without_commit(_stmt)
-
-    async def fetch_10_pending_predefined_urls_mark_as_processing(self) -> list[dict]:
-        _subquery = (
-            select(PredefinedUrl.id.label("id"))
-            .where(
-                PredefinedUrl.status == SchedulerStatusType.PENDING.str_value,
+        )
+        return await self.run_select_stmt_for_one(_stmt)
+
+    async def claim_pending_predefined_urls(self, limit: int, owner: str, lease_duration: float) -> list[dict]:
+        return await self.update_stmt_with_commit_returning(claim_pending_predefined_urls_stmt(limit, owner, lease_duration))
+
+    async def get_next_predefined_due_time(self) -> Optional[datetime]:
+        """Pending predefined urls are due right away unless they wait for a retry, leased ones when the lease ends."""
+        _stmt = select(
+            func.least(
+                select(func.min(func.coalesce(PredefinedUrl.next_attempt_at, _NOW_UTC)))
+                .where(PredefinedUrl.status == _PENDING)
+                .scalar_subquery(),
+                _next_lease_deadline(PredefinedUrl),
             )
-            .limit(10)
-            .with_for_update(skip_locked=True)
-            .cte("subquery")
         )
+        return await self.run_select_stmt_for_one(_stmt)
 
-        _locks = select(_subquery.c.id)
-        _stmt = (
-            update(PredefinedUrl)
-            .where(PredefinedUrl.id.in_(_locks))
-            .values(status=SchedulerStatusType.PROCESSING.str_value)
-            .returning(
-                PredefinedUrl.id,
-                PredefinedUrl.url,
-                PredefinedUrl.retry_count,
-                PredefinedUrl.task_data,
-                PredefinedUrl.updated_at,
-            )
-        ).cte("updated_schedules")
-
-        _numbered_schedules = (
-            select(
-                _stmt.c.id,
-                _stmt.c.url,
-                _stmt.c.retry_count,
-                _stmt.c.task_data,
-                _stmt.c.updated_at,
-                func.row_number().over(partition_by=_stmt.c.id, order_by=_stmt.c.updated_at.desc()).label("row_num"),
-            )
-        ).cte("numbered_schedules")
-
-        _latest_schedules = select(
-            _numbered_schedules.c.id,
-            _numbered_schedules.c.url,
-            _numbered_schedules.c.row_num,
-            _numbered_schedules.c.retry_count,
-            _numbered_schedules.c.task_data,
-        ).filter(_numbered_schedules.c.row_num == 1)  # type: ignore
-
-        _schedules = await self.update_stmt_with_commit_returning(_latest_schedules)
-        return _schedules
-
-    async def update_predefined_url_status_by_id(self, predefined_url_id, kwargs: dict):
-        _stmt = update(PredefinedUrl).where(PredefinedUrl.id == predefined_url_id).values(**kwargs)
-        await self.update_stmt_without_commit(_stmt)
+    async def extend_leases(
+        self, model: type[ScheduledUrl | PredefinedUrl], ids: list[int], owner: str, lease_duration: float
+    ) -> int:
+        """Push the lease deadline of the rows still leased to `owner`; returns how many are."""
+        _result = await self.session.execute(extend_leases_stmt(model, ids, owner, lease_duration))
+        return _result.rowcount
+
+    async def record_outcomes(self, model: type[ScheduledUrl | PredefinedUrl], outcomes: list[ScheduleOutcome], owner: str):
+        await self.update_stmt_without_commit(record_outcomes_stmt(model, outcomes, owner))
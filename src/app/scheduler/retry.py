@@ -0,0 +1,77 @@
+import datetime
+import random
+from typing import Optional
+from urllib.parse import urlsplit
+
+from pydantic import ValidationError
+from pydantic_core import PydanticSerializationError
+
+from src.app.scheduler.dto import ScheduleOutcome, SchedulerStatusType
+
+# failures that fail again on every attempt: the message DTO cannot be built or serialized.
+# Everything else (broker, network, bugs fixed by a redeploy) gets another attempt
+_PERMANENT_ERRORS: tuple[type[Exception], ...] = (ValidationError, PydanticSerializationError)
+
+
+class RetryPolicy:
+    """
+    Decides what happens to a schedule whose dispatch failed.
+
+    Transient failures are retried `base_delay * 2^n` seconds later (n failures so far, capped at
+    `max_delay`) spread by up to ±`jitter` of that delay, so rows failing together do not come back
+    together. Permanent failures and schedules out of attempts are marked failed. Max attempts can be
+    overridden per news source; an override for `example.com` also applies to its subdomains.
+    A schedule whose lease expired more than `max_reclaims` times in a row (its dispatch keeps
+    killing the process) is marked failed as well.
+    """
+
+    def __init__(
+        self,
+        base_delay: float,
+        max_delay: float,
+        jitter: float,
+        max_attempts: int,
+        max_attempts_overrides: Optional[dict[str, int]] = None,
+        max_reclaims: int = 3,
+    ):
+        self._base_delay = base_delay
+        self._max_delay = max_delay
+        self._jitter = jitter
+        self._max_attempts = max_attempts
+        self._max_attempts_overrides = {k.lower(): v for k, v in (max_attempts_overrides or {}).items()}
+        self._max_reclaims = max_reclaims
+
+    def max_attempts_for(self, url: str) -> int:
+        _host = (urlsplit(url).hostname or "").lower()
+        while _host:
+            if _host in self._max_attempts_overrides:
+                return self._max_attempts_overrides[_host]
+            _, _, _host = _host.partition(".")
+        return self._max_attempts
+
+    def delay(self, failures: int) -> float:
+        _delay = min(self._base_delay * 2 ** max(failures - 1, 0), self._max_delay)
+        return max(0.0, _delay * (1 + random.uniform(-self._jitter, self._jitter)))
+
+    @staticmethod
+    def is_permanent(exception: BaseException) -> bool:
+        return isinstance(exception, _PERMANENT_ERRORS)
+
+    def is_exhausted(self, retry_count: int, url: str) -> bool:
+        """`retry_count` failed attempts leave none: the attempt limit may have been lowered since they were made."""
+        return retry_count >= self.max_attempts_for(url)
+
+    def is_abandoned(self, reclaim_count: int) -> bool:
+        return reclaim_count > self._max_reclaims
+
+    def on_failure(self, schedule_id: int, retry_count: int, url: str, exception: BaseException) -> ScheduleOutcome:
+        _failures = retry_count + 1
+        _info = f"{type(exception).__name__}: {exception}"
+        if self.is_permanent(exception):
+            return ScheduleOutcome(schedule_id, SchedulerStatusType.FAILED, _failures, f"Permanent failure: {_info}")
+        if self.is_exhausted(_failures, url):
+            return ScheduleOutcome(schedule_id, SchedulerStatusType.FAILED, _failures, f"Max attempts reached: {_info}")
+        _retry_at = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None) + datetime.timedelta(
+            seconds=self.delay(_failures)
+        )
+        return ScheduleOutcome(schedule_id, SchedulerStatusType.PENDING, _failures, _info, _retry_at)
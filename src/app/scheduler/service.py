@@ -6,16 +6,28 @@ from typing import Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.app.crawler.exception import UrlExistsError
-from src.app.scheduler.dto import SchedulerDto, SchedulerStatusType, TaskDataDto
-from src.app.scheduler.model import ScheduledUrl
+from src.app.scheduler.drain import AdaptiveBatchSize, DrainLoop
+from src.app.scheduler.dto import ScheduleOutcome, SchedulerDto, SchedulerStatusType, TaskDataDto
+from src.app.scheduler.lease import LeaseHeartbeat
+from src.app.scheduler.model import PredefinedUrl, ScheduledUrl
+from src.app.scheduler.outcomes import ScheduleOutcomeWriter
 from src.app.scheduler.repo import SchedulerRepository
+from src.app.scheduler.retry import RetryPolicy
 from src.app.worker.dto import FetchUrlDto
 from src.app.worker.events import RabbitMQEvents
+from src.core.db.pg_listener import PgNotificationListener
 from src.core.db.pg_uow import PgSQLAlchemyUnitOfWork
 from src.core.rmq.rmq_publisher import RabbitMQPublisher
 from src.core.utils.api.logger import LOGGER
 from src.core.utils.base_value_objects import UrlString
 from src.core.utils.repeat_at import repeat_at
+from src.core.utils.urls import normalize_url, url_hash
+
+SCHEDULER_RUN_MODE_CRON = "cron"
+SCHEDULER_RUN_MODE_DRAIN = "drain"
+# NOTIFY channels of the insert triggers, the scheduled_url payload is the earliest inserted due time
+SCHEDULED_URL_CHANNEL = "scheduled_url_inserted"
+PREDEFINED_URL_CHANNEL = "predefined_url_inserted"
 
 
 class SchedulerService:
@@ -23,9 +35,46 @@ class SchedulerService:
         self,
         uow: PgSQLAlchemyUnitOfWork,
         rmq_publisher: RabbitMQPublisher,
+        outcome_writer: ScheduleOutcomeWriter,
+        retry_policy: RetryPolicy,
+        owner: str,
+        lease_duration: float = 300.0,
+        heartbeat_interval: float = 60.0,
+        insert_batch_size: int = 1000,
+        claim_batch_size: int = 100,
+        run_mode: str = "cron",
+        min_claim_batch_size: int = 10,
+        max_claim_batch_size: int = 1000,
+        max_in_flight: int = 200,
+        target_publish_latency: float = 0.05,
+        max_idle: float = 60.0,
+        listener: Optional[PgNotificationListener] = None,
+        listen: bool = False,
     ):
         self._uow = uow
         self._rmq_publisher = rmq_publisher
+        self._outcome_writer = outcome_writer
+        self._retry_policy = retry_policy
+        self._owner = owner
+        self._lease_duration = lease_duration
+        self._scheduled_url_leases = LeaseHeartbeat(
+            "ScheduledUrl", self.extend_scheduled_url_leases, heartbeat_interval, logger=LOGGER
+        )
+        self._predefined_url_leases = LeaseHeartbeat(
+            "PredefinedUrl", self.extend_predefined_url_leases, heartbeat_interval, logger=LOGGER
+        )
+        self._insert_batch_size = insert_batch_size
+        self._claim_batch_size = claim_batch_size
+        self._run_mode = run_mode
+        self._min_claim_batch_size = min_claim_batch_size
+        self._max_claim_batch_size = max_claim_batch_size
+        self._max_in_flight = max_in_flight
+        self._target_publish_latency = target_publish_latency
+        self._max_idle = max_idle
+        self._listener = listener if listen else None
+        self.scheduled_url_drain: Optional[DrainLoop] = None
+        self.predefined_url_drain: Optional[DrainLoop] = None
+        self._cron_tasks: list[asyncio.Task] = []
 
     @staticmethod
     def current_time_plus_minute(x: int):
@@ -38,7 +87,8 @@ class SchedulerService:
             raise UrlExistsError(f"Url {url} already exists in scheduler")
         return _is_exists
 
-    async def add_scheduled_url(self, url: UrlString):
+    @staticmethod
+    def _new_schedule(url: UrlString) -> dict:
         _schedule = SchedulerDto(
             url=url,
             task_data=TaskDataDto(
@@ -47,54 +97,65 @@ class SchedulerService:
                 queue=RabbitMQEvents.fetch_url.queue,
             ),
             status=SchedulerStatusType.PENDING,
-            scheduled_time=SchedulerService.current_time_plus_minute(1),
-        )
-        _scheduler: ScheduledUrl = ScheduledUrl.factory(**_schedule.model_dump())
+            scheduled_time=datetime.datetime.now(tz=timezone.utc),  # due at once, the insert NOTIFY wakes the drain
+        ).model_dump()
+        _schedule["url"] = normalize_url(_schedule["url"])
+        return _schedule
+
+    async def add_scheduled_url(self, url: UrlString):
+        await self.add_scheduled_urls([url])
+
+    async def add_scheduled_urls(self, urls: list[UrlString]) -> list[str]:
+        """
+        Validate and normalize every url first, then schedule them with `INSERT ... ON CONFLICT DO NOTHING`
+        statements of up to `insert_batch_size` rows in one transaction. Returns the newly scheduled urls.
+        """
+        _schedules = list({url_hash(_schedule["url"]): _schedule for _schedule in map(self._new_schedule, urls)}.values())
+        if not _schedules:
+            return []
+        _new: list[str] = []
         async with self._uow.atomic() as _session:
-            _is_exists = await self.is_unique_url(_scheduler.url, _session, with_exception=False)
-            if _is_exists:
-                LOGGER.info(f"Url {_scheduler.url} already exists")
-                return
-            await self._uow.get_repository(SchedulerRepository, _session).add_scheduled_url(_scheduler)
+            _repo = self._uow.get_repository(SchedulerRepository, _session)
+            for _start in range(0, len(_schedules), self._insert_batch_size):
+                _rows = await _repo.add_scheduled_urls(_schedules[_start : _start + self._insert_batch_size])
+                _new.extend(_row.url for _row in _rows)
+        LOGGER.info(f"Scheduled {len(_new)} new urls, {len(_schedules) - len(_new)} already scheduled")
+        return _new
 
-    async def fetch_10_pending_scheduled_urls_mark_as_processing(self) -> list[dict]:
+    async def claim_due_scheduled_urls(self, batch_size: Optional[int] = None) -> list[dict]:
         async with self._uow.atomic(read_only=True) as _session:
-            _schedules = await self._uow.get_repository(
-                SchedulerRepository, _session
-            ).fetch_10_pending_scheduled_urls_mark_as_processing()
+            _schedules = await self._uow.get_repository(SchedulerRepository, _session).claim_due_scheduled_urls(
+                batch_size or self._claim_batch_size, self._owner, self._lease_duration
+            )
+        self._scheduled_url_leases.hold(_schedule["id"] for _schedule in _schedules)
         return _schedules
 
-    async def update_scheduled_url_status_by_id(
-        self,
-        schedule_id: int,
-        status: SchedulerStatusType,
-        retry_count: int,
-        exception=None,
-        schedule_time: Optional[datetime] = None,
-    ):
+    async def extend_scheduled_url_leases(self, ids: list[int]) -> int:
         async with self._uow.atomic() as _session:
-            await self._uow.get_repository(SchedulerRepository, _session).update_scheduled_url_status_by_id(
-                schedule_id,
-                {"status": status, "exception": exception, "retry_count": retry_count, "scheduled_time": schedule_time},
+            return await self._uow.get_repository(SchedulerRepository, _session).extend_leases(
+                ScheduledUrl, ids, self._owner, self._lease_duration
             )
-            LOGGER.info(f"ScheduledUrl with id {schedule_id} status updated to {status}")
 
     async def _process_scheduled_url(
         self,
         schedule_id: int,
         retry_count: int,
+        reclaim_count: int,
         task_data: TaskDataDto,
         url: UrlString,
-    ):
-        if retry_count > 3:
-            await self.update_scheduled_url_status_by_id(
-                schedule_id=schedule_id,
-                status=SchedulerStatusType.FAILED,
-                retry_count=retry_count,
-                exception="Max retry count exceeded",
+    ) -> asyncio.Future:
+        if self._retry_policy.is_abandoned(reclaim_count):
+            _recorded = self._outcome_writer.record_scheduled_url(
+                ScheduleOutcome(schedule_id, SchedulerStatusType.FAILED, retry_count, f"Lease expired {reclaim_count} times")
+            )
+            LOGGER.error(f"ScheduledUrl with id {schedule_id} abandoned after {reclaim_count} expired leases")
+            return _recorded
+        if self._retry_policy.is_exhausted(retry_count, url):
+            _recorded = self._outcome_writer.record_scheduled_url(
+                ScheduleOutcome(schedule_id, SchedulerStatusType.FAILED, retry_count, "Max attempts reached")
             )
             LOGGER.error(f"ScheduledUrl with id {schedule_id} failed")
-            return
+            return _recorded
         try:
             await self._rmq_publisher.publish(
                 message=FetchUrlDto(url=url),
@@ -102,56 +163,124 @@ class SchedulerService:
                 exchange_name=task_data.exchange,
             )
         except Exception as e:
-            LOGGER.error(f"ScheduledUrl with id {schedule_id} failed")
-            await self.update_scheduled_url_status_by_id(
-                schedule_id=schedule_id, status=SchedulerStatusType.PENDING, retry_count=retry_count + 1, exception=e
-            )
-        else:
-            await self.update_scheduled_url_status_by_id(
-                schedule_id=schedule_id, status=SchedulerStatusType.COMPLETED, retry_count=retry_count
-            )
+            _outcome = self._retry_policy.on_failure(schedule_id, retry_count, url, e)
+            LOGGER.error(f"ScheduledUrl with id {schedule_id} failed: {_outcome.exception_info}")
+            return self._outcome_writer.record_scheduled_url(_outcome)
+        return self._outcome_writer.record_scheduled_url(
+            ScheduleOutcome(schedule_id, SchedulerStatusType.COMPLETED, retry_count)
+        )
 
-    async def process_scheduled_urls(self):
-        _schedules = await self.fetch_10_pending_scheduled_urls_mark_as_processing()
-        _tasks = [
-            self._process_scheduled_url(
+    async def _dispatch_scheduled_url(self, schedule: dict):
+        _recorded: Optional[asyncio.Future] = None
+        try:
+            _recorded = await self._process_scheduled_url(
                 schedule_id=schedule["id"],
                 retry_count=schedule["retry_count"],
+                reclaim_count=schedule["reclaim_count"],
                 task_data=TaskDataDto.model_validate(schedule["task_data"]),
                 url=schedule["url"],
             )
-            for schedule in _schedules
-        ]
-        await asyncio.gather(*_tasks)
+        finally:
+            self._release_lease(self._scheduled_url_leases, schedule["id"], _recorded)
+
+    @staticmethod
+    def _release_lease(leases: LeaseHeartbeat, schedule_id: int, recorded: Optional[asyncio.Future]) -> None:
+        """Keep heartbeating the row until its outcome is written, not merely buffered by the outcome writer."""
+        if recorded is None:
+            leases.release(schedule_id)
+        else:
+            recorded.add_done_callback(lambda _: leases.release(schedule_id))
+
+    async def process_scheduled_urls(self):
+        _schedules = await self.claim_due_scheduled_urls()
+        await asyncio.gather(*[self._dispatch_scheduled_url(schedule) for schedule in _schedules])
+
+    async def next_scheduled_url_due_time(self) -> Optional[datetime.datetime]:
+        async with self._uow.atomic(read_only=True) as _session:
+            return await self._uow.get_repository(SchedulerRepository, _session).get_next_due_time()
+
+    def _drain_loop(self, name: str, claim, dispatch, next_due) -> DrainLoop:
+        return DrainLoop(
+            name=name,
+            claim=claim,
+            dispatch=dispatch,
+            next_due=next_due,
+            batch_size=AdaptiveBatchSize(
+                initial=self._claim_batch_size,
+                minimum=self._min_claim_batch_size,
+                maximum=self._max_claim_batch_size,
+                target_latency=self._target_publish_latency,
+            ),
+            max_in_flight=self._max_in_flight,
+            max_idle=self._max_idle,
+            logger=LOGGER,
+        )
+
+    @staticmethod
+    def _earliest_due(payloads: list[str]) -> Optional[datetime.datetime]:
+        """Earliest due time of a coalesced burst; None when any payload is missing, which means "check now"."""
+        try:
+            _due = [datetime.datetime.fromisoformat(_payload) for _payload in payloads]
+        except ValueError:
+            return None
+        return min(_due) if _due else None
+
+    async def start_scheduled_url_fetcher(self) -> asyncio.Task:
+        """
+        In `drain` mode due rows are dispatched continuously and inserts wake the loop through
+        LISTEN/NOTIFY, its `max_idle` poll staying as a safety net. In `cron` mode one batch every 5 minutes.
+        """
+        if self._run_mode == SCHEDULER_RUN_MODE_DRAIN:
+            if self.scheduled_url_drain is None:
+                self.scheduled_url_drain = _drain = self._drain_loop(
+                    "ScheduledUrl",
+                    self.claim_due_scheduled_urls,
+                    self._dispatch_scheduled_url,
+                    self.next_scheduled_url_due_time,
+                )
+                if self._listener:
+                    await self._listener.subscribe(
+                        SCHEDULED_URL_CHANNEL, lambda _payloads: _drain.notify_due(self._earliest_due(_payloads))
+                    )
+            return self.scheduled_url_drain.start()
+        _task = await self._start_scheduled_url_cron()
+        self._cron_tasks.append(_task)
+        return _task
 
     @repeat_at(cron="*/5 * * * *")
-    async def start_scheduled_url_fetcher(self):
+    async def _start_scheduled_url_cron(self):
         LOGGER.info("Scheduled URL Fetcher Started")
         await self.process_scheduled_urls()
 
-    async def update_predefined_url_status_by_id(
-        self, schedule_id: int, retry_count: int, status: SchedulerStatusType, exception=None
-    ):
-        async with self._uow.atomic() as _session:
-            await self._uow.get_repository(SchedulerRepository, _session).update_predefined_url_status_by_id(
-                schedule_id, {"status": status, "exception": exception, "retry_count": retry_count}
-            )
-            LOGGER.info(f"PredefinedUrl with id {schedule_id} status updated to {status}")
-
-    async def fetch_10_pending_predefined_urls_mark_as_processing(self):
+    async def claim_pending_predefined_urls(self, batch_size: Optional[int] = None) -> list[dict]:
         async with self._uow.atomic(read_only=True) as _session:
-            _schedules = await self._uow.get_repository(
-                SchedulerRepository, _session
-            ).fetch_10_pending_predefined_urls_mark_as_processing()
+            _schedules = await self._uow.get_repository(SchedulerRepository, _session).claim_pending_predefined_urls(
+                batch_size or self._claim_batch_size, self._owner, self._lease_duration
+            )
+        self._predefined_url_leases.hold(_schedule["id"] for _schedule in _schedules)
         return _schedules
 
-    async def _process_predefined_url(self, schedule_id: int, retry_count: int, url: UrlString, task_data: TaskDataDto):
-        if retry_count > 3:
-            await self.update_predefined_url_status_by_id(
-                schedule_id, retry_count, SchedulerStatusType.FAILED, "Max retry count exceeded"
+    async def extend_predefined_url_leases(self, ids: list[int]) -> int:
+        async with self._uow.atomic() as _session:
+            return await self._uow.get_repository(SchedulerRepository, _session).extend_leases(
+                PredefinedUrl, ids, self._owner, self._lease_duration
+            )
+
+    async def _process_predefined_url(
+        self, schedule_id: int, retry_count: int, reclaim_count: int, url: UrlString, task_data: TaskDataDto
+    ) -> asyncio.Future:
+        if self._retry_policy.is_abandoned(reclaim_count):
+            _recorded = self._outcome_writer.record_predefined_url(
+                ScheduleOutcome(schedule_id, SchedulerStatusType.FAILED, retry_count, f"Lease expired {reclaim_count} times")
+            )
+            LOGGER.error(f"PredefinedUrl with id {schedule_id} abandoned after {reclaim_count} expired leases")
+            return _recorded
+        if self._retry_policy.is_exhausted(retry_count, url):
+            _recorded = self._outcome_writer.record_predefined_url(
+                ScheduleOutcome(schedule_id, SchedulerStatusType.FAILED, retry_count, "Max attempts reached")
             )
             LOGGER.error(f"PredefinedUrl with id {schedule_id} failed")
-            return
+            return _recorded
         try:
             await self._rmq_publisher.publish(
                 message=FetchUrlDto(url=url),
@@ -159,25 +288,68 @@ class SchedulerService:
                 exchange_name=task_data.exchange,
             )
         except Exception as e:
-            LOGGER.error(f"PredefinedUrl with id {schedule_id} failed")
-            await self.update_predefined_url_status_by_id(schedule_id, retry_count + 1, SchedulerStatusType.PENDING, e)
-        else:
-            await self.update_predefined_url_status_by_id(schedule_id, retry_count, SchedulerStatusType.COMPLETED)
+            _outcome = self._retry_policy.on_failure(schedule_id, retry_count, url, e)
+            LOGGER.error(f"PredefinedUrl with id {schedule_id} failed: {_outcome.exception_info}")
+            return self._outcome_writer.record_predefined_url(_outcome)
+        return self._outcome_writer.record_predefined_url(
+            ScheduleOutcome(schedule_id, SchedulerStatusType.COMPLETED, retry_count)
+        )
 
-    async def process_predefined_urls(self):
-        _schedules = await self.fetch_10_pending_predefined_urls_mark_as_processing()
-        _tasks = [
-            self._process_predefined_url(
+    async def _dispatch_predefined_url(self, schedule: dict):
+        _recorded: Optional[asyncio.Future] = None
+        try:
+            _recorded = await self._process_predefined_url(
                 schedule_id=schedule["id"],
                 retry_count=schedule["retry_count"],
+                reclaim_count=schedule["reclaim_count"],
                 url=schedule["url"],
                 task_data=TaskDataDto.model_validate(schedule["task_data"]),
             )
-            for schedule in _schedules
-        ]
-        await asyncio.gather(*_tasks)
+        finally:
+            self._release_lease(self._predefined_url_leases, schedule["id"], _recorded)
+
+    async def process_predefined_urls(self):
+        _schedules = await self.claim_pending_predefined_urls()
+        await asyncio.gather(*[self._dispatch_predefined_url(schedule) for schedule in _schedules])
+
+    async def next_predefined_url_due_time(self) -> Optional[datetime.datetime]:
+        async with self._uow.atomic(read_only=True) as _session:
+            return await self._uow.get_repository(SchedulerRepository, _session).get_next_predefined_due_time()
+
+    async def start_predefined_url_fetcher(self) -> asyncio.Task:
+        if self._run_mode == SCHEDULER_RUN_MODE_DRAIN:
+            if self.predefined_url_drain is None:
+                self.predefined_url_drain = _drain = self._drain_loop(
+                    "PredefinedUrl",
+                    self.claim_pending_predefined_urls,
+                    self._dispatch_predefined_url,
+                    self.next_predefined_url_due_time,
+                )
+                if self._listener:
+                    await self._listener.subscribe(PREDEFINED_URL_CHANNEL, lambda _payloads: _drain.wake())
+            return self.predefined_url_drain.start()
+        _task = await self._start_predefined_url_cron()
+        self._cron_tasks.append(_task)
+        return _task
 
     @repeat_at(cron="*/10 * * * *")
-    async def start_predefined_url_fetcher(self):
+    async def _start_predefined_url_cron(self):
         LOGGER.info("Predefined URL Fetcher Started")
         await self.process_predefined_urls()
+
+    async def stop(self) -> None:
+        """
+        Stop claiming: the cron tasks are cancelled and the drain loops wait for their in-flight
+        dispatches, then the buffered outcomes are flushed so the lease heartbeats, stopped last,
+        no longer hold any row.
+        """
+        for _task in self._cron_tasks:
+            _task.cancel()
+        await asyncio.gather(*self._cron_tasks, return_exceptions=True)
+        self._cron_tasks.clear()
+        for _drain in (self.scheduled_url_drain, self.predefined_url_drain):
+            if _drain is not None:
+                await _drain.stop()
+        await self._outcome_writer.close()
+        await self._scheduled_url_leases.stop()
+        await self._predefined_url_leases.stop()
@@ -1,3 +1,5 @@
+from typing import Optional
+
 from src.core.utils.base_dtos import BaseDto, CamelBaseModel
 from src.core.utils.base_value_objects import UrlString
 
@@ -15,3 +17,4 @@ class ByDateFetchUrlDto(BaseDto, CamelBaseModel):
 
 class FetchedUrlDto(BaseDto, CamelBaseModel):
     url_id: int
+    blob_pointer: Optional[str] = None
@@ -5,6 +5,7 @@ class RabbitMQEvents(Enum):
     fetch_url = ("news.direct", "news.crawler.fetch_url", "crawler.fetch_url")
     check_sub_url_by_date = ("news.direct", "news.crawler.check_sub_url_by_date", "crawler.check_sub_url_by_date")
     content_fetched = ("news.direct", "news.crawler.content_fetched", "crawler.content_fetched")
+    discover_feed = ("news.direct", "news.crawler.discover_feed", "crawler.discover_feed")
 
     def __init__(self, exchange, queue, routing_key):
         self._exchange = exchange
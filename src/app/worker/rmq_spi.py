@@ -2,6 +2,8 @@ from typing import Any, Awaitable, Callable
 
 from faststream.rabbit import ExchangeType, RabbitExchange, RabbitMessage, RabbitQueue
 
+from src.app.crawler.links import LINKS_POOL
+from src.app.crawler.parsing import PARSING_POOL
 from src.app.worker.dto import ByDateFetchUrlDto, FetchedUrlDto, FetchUrlDto
 from src.app.worker.events import RabbitMQEvents
 from src.core.conf.settings import SETTINGS
@@ -16,10 +18,23 @@ consumer_app = CONTAINER.faststream_app()
 
 @consumer_app.on_startup
 async def startup():
+    await CONTAINER.http_clients().start()
+    await CONTAINER.process_pools().start(LINKS_POOL, PARSING_POOL)
     await rmq_broker.connect()
     await CONTAINER.scheduler_service().start_predefined_url_fetcher()
 
 
+@consumer_app.on_shutdown
+async def shutdown():
+    await CONTAINER.scheduler_service().stop()
+    await CONTAINER.http_clients().dispose()
+    await CONTAINER.pg_listener().stop()
+    await CONTAINER.article_writer().close()
+    await CONTAINER.schedule_outcome_writer().close()
+    await CONTAINER.process_pools().dispose()
+    CONTAINER.page_archive().close()
+
+
 async def subscriber_middleware(
     call_next: Callable[[Any], Awaitable[Any]],
     msg: RabbitMessage,
@@ -111,6 +126,28 @@ async def check_sub_url_dead_letter(message: RabbitMessage):
     )
 
 
+@rmq_broker.subscriber(
+    RabbitQueue(
+        RabbitMQEvents.discover_feed.queue_dead_letter,
+        durable=True,
+        routing_key=RabbitMQEvents.discover_feed.routing_key_dead_letter,
+        arguments={
+            "x-message-ttl": 3000,  # in ms
+        },
+    ),
+    RabbitExchange(RabbitMQEvents.discover_feed.exchange_dead_letter, durable=True, type=ExchangeType.DIRECT),
+    middlewares=[subscriber_middleware],  # type: ignore
+)
+@_process_dead_letter_message
+async def discover_feed_dead_letter(message: RabbitMessage):
+    await CONTAINER.rmq_publisher().publish(
+        message.body,
+        exchange_name=RabbitMQEvents.discover_feed.exchange,
+        routing_key=RabbitMQEvents.discover_feed.routing_key,
+        headers=message.headers,
+    )
+
+
 # End dead letter
 ###
 
@@ -132,7 +169,7 @@ async def fetch_info_from_url(message: FetchUrlDto):
     _url = await CONTAINER.crawling_service().fetch_info_from_url(message.url)
     LOGGER.info(f"----Message processed----: {message}")
     await CONTAINER.rmq_publisher().publish(
-        FetchedUrlDto(url_id=_url.id),
+        FetchedUrlDto(url_id=_url.id, blob_pointer=_url.blob_pointer),
         exchange_name=RabbitMQEvents.content_fetched.exchange,
         routing_key=RabbitMQEvents.content_fetched.routing_key,
     )
@@ -172,3 +209,21 @@ async def check_sub_url_by_date(message: ByDateFetchUrlDto):
     LOGGER.info(f"----Message received----: {message}")
     await CONTAINER.crawling_service().check_url_by_date_add_scheduled_url(message)
     LOGGER.info(f"----Message processed----: {message}")
+
+
+@rmq_broker.subscriber(
+    RabbitQueue(
+        RabbitMQEvents.discover_feed.queue,
+        durable=True,
+        routing_key=RabbitMQEvents.discover_feed.routing_key,
+        arguments={
+            "x-dead-letter-exchange": RabbitMQEvents.discover_feed.exchange_dead_letter,
+            "x-dead-letter-routing-key": RabbitMQEvents.discover_feed.routing_key_dead_letter,
+        },
+    ),
+    RabbitExchange(RabbitMQEvents.discover_feed.exchange, durable=True, type=ExchangeType.DIRECT),
+)
+async def discover_feed(message: FetchUrlDto):
+    LOGGER.info(f"----Message received----: {message}")
+    await CONTAINER.crawling_service().discover_urls_from_feed(message.url)
+    LOGGER.info(f"----Message processed----: {message}")
@@ -1,5 +1,7 @@
 import os
 import secrets
+import socket
+import tempfile
 from functools import lru_cache
 from typing import Literal
 
@@ -122,6 +124,130 @@ class ApiCallSettings(AppSettings):
         return self
 
 
+class HttpClientSettings(CustomSettings):
+    HTTP_MAX_CONNECTIONS: int = Field(default=100, alias="HTTP_MAX_CONNECTIONS")
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = Field(default=20, alias="HTTP_MAX_KEEPALIVE_CONNECTIONS")
+    HTTP_KEEPALIVE_EXPIRY: float = Field(default=30.0, alias="HTTP_KEEPALIVE_EXPIRY")  # in seconds
+    HTTP_HTTP2: bool = Field(default=False, alias="HTTP_HTTP2")  # negotiated through ALPN, falls back to HTTP/1.1
+    HTTP_TIMEOUT: float = Field(default=3.0, alias="HTTP_TIMEOUT")  # in seconds
+    HTTP_CONNECT_TIMEOUT: float = Field(default=5.0, alias="HTTP_CONNECT_TIMEOUT")  # in seconds
+    HTTP_MAX_REDIRECTS: int = Field(default=5, alias="HTTP_MAX_REDIRECTS")
+    HTTP_STREAM_ALLOWED_CONTENT_TYPES: list[str] = Field(
+        default=["text/html", "application/xhtml+xml"], alias="HTTP_STREAM_ALLOWED_CONTENT_TYPES"
+    )
+    HTTP_STREAM_MAX_BYTES: dict[str, int] = Field(
+        default={"text/html": 5 * 1024 * 1024, "application/xhtml+xml": 5 * 1024 * 1024},
+        alias="HTTP_STREAM_MAX_BYTES",
+    )
+    HTTP_STREAM_DEFAULT_MAX_BYTES: int = Field(default=2 * 1024 * 1024, alias="HTTP_STREAM_DEFAULT_MAX_BYTES")
+
+
+class FetchCacheSettings(CustomSettings):
+    FETCH_CACHE_BACKEND: Literal["memory", "sqlite"] = Field(default="memory", alias="FETCH_CACHE_BACKEND")
+    FETCH_CACHE_MAX_BYTES: int = Field(default=64 * 1024 * 1024, alias="FETCH_CACHE_MAX_BYTES")
+    FETCH_CACHE_TTL: float = Field(default=15 * 60, alias="FETCH_CACHE_TTL")  # in seconds
+    FETCH_CACHE_SQLITE_PATH: str = Field(
+        default=os.path.join(tempfile.gettempdir(), "news-fetch-cache.sqlite3"), alias="FETCH_CACHE_SQLITE_PATH"
+    )
+
+
+class PageArchiveSettings(CustomSettings):
+    # blob pointers are sent between the api and worker containers: this must be a volume both of them mount
+    PAGE_ARCHIVE_DIR: str = Field(default="/var/lib/news/page-archive", alias="PAGE_ARCHIVE_DIR")
+    PAGE_ARCHIVE_SEGMENT_MAX_BYTES: int = Field(default=256 * 1024 * 1024, alias="PAGE_ARCHIVE_SEGMENT_MAX_BYTES")
+    PAGE_ARCHIVE_COMPRESSION_LEVEL: int = Field(default=3, alias="PAGE_ARCHIVE_COMPRESSION_LEVEL")
+
+
+class CrawlerSettings(CustomSettings):
+    CRAWL_HOST_RATE: float = Field(default=1.0, alias="CRAWL_HOST_RATE")  # requests per second per host
+    CRAWL_HOST_BURST: int = Field(default=3, alias="CRAWL_HOST_BURST")
+    CRAWL_HOST_INITIAL_CONCURRENCY: int = Field(default=2, alias="CRAWL_HOST_INITIAL_CONCURRENCY")
+    CRAWL_HOST_MIN_CONCURRENCY: int = Field(default=1, alias="CRAWL_HOST_MIN_CONCURRENCY")
+    CRAWL_HOST_MAX_CONCURRENCY: int = Field(default=8, alias="CRAWL_HOST_MAX_CONCURRENCY")
+    CRAWL_HOST_TARGET_LATENCY: float = Field(default=2.0, alias="CRAWL_HOST_TARGET_LATENCY")  # in seconds
+    CRAWL_HOST_BACKOFF_FACTOR: float = Field(default=0.5, alias="CRAWL_HOST_BACKOFF_FACTOR")
+    CRAWL_SCRAPER_CONCURRENCY: int = Field(default=16, alias="CRAWL_SCRAPER_CONCURRENCY")
+    CRAWL_FEED_MAX_BYTES: int = Field(default=50 * 1024 * 1024, alias="CRAWL_FEED_MAX_BYTES")
+    CRAWL_FEED_MAX_SITEMAPS: int = Field(default=50, alias="CRAWL_FEED_MAX_SITEMAPS")
+
+
+class ArticleWriterSettings(CustomSettings):
+    ARTICLE_WRITER_BATCH_SIZE: int = Field(default=100, alias="ARTICLE_WRITER_BATCH_SIZE")  # articles per transaction
+    ARTICLE_WRITER_FLUSH_INTERVAL: float = Field(default=0.05, alias="ARTICLE_WRITER_FLUSH_INTERVAL")  # in seconds
+    ARTICLE_WRITER_COPY_THRESHOLD: int = Field(default=500, alias="ARTICLE_WRITER_COPY_THRESHOLD")  # COPY postings from
+
+
+class ProcessPoolSettings(CustomSettings):
+    PROCESS_POOL_DEFAULT_MAX_WORKERS: int = Field(default=os.cpu_count() or 1, alias="PROCESS_POOL_DEFAULT_MAX_WORKERS")
+    PROCESS_POOL_MAX_WORKERS: dict[str, int] = Field(default_factory=dict, alias="PROCESS_POOL_MAX_WORKERS")  # per pool name
+    PROCESS_POOL_START_METHOD: Literal["spawn", "forkserver", "fork"] = Field(
+        default="spawn", alias="PROCESS_POOL_START_METHOD"
+    )
+
+
+class BackfillSettings(CustomSettings):
+    BACKFILL_BATCH_SIZE: int = Field(default=1000, alias="BACKFILL_BATCH_SIZE")
+    BACKFILL_WORKERS: int = Field(default=os.cpu_count() or 1, alias="BACKFILL_WORKERS")
+    BACKFILL_CHUNK_SIZE: int = Field(default=50, alias="BACKFILL_CHUNK_SIZE")  # pages per process pool task
+    BACKFILL_CHECKPOINT_PATH: str = Field(
+        default=os.path.join(tempfile.gettempdir(), "news-backfill.checkpoint.json"), alias="BACKFILL_CHECKPOINT_PATH"
+    )
+
+
+class KeywordSettings(CustomSettings):
+    KEYWORDS_REFRESH_INTERVAL: float = Field(default=60, alias="KEYWORDS_REFRESH_INTERVAL")  # in seconds
+    KEYWORDS_SNAPSHOT_DIR: str = Field(
+        default=os.path.join(tempfile.gettempdir(), "news-keywords"), alias="KEYWORDS_SNAPSHOT_DIR"
+    )
+
+
+class ExtractionProfileSettings(CustomSettings):
+    EXTRACTION_PROFILES_REFRESH_INTERVAL: float = Field(default=60, alias="EXTRACTION_PROFILES_REFRESH_INTERVAL")  # in seconds
+
+
+class SchedulerSettings(CustomSettings):
+    SCHEDULER_INSERT_BATCH_SIZE: int = Field(default=1000, alias="SCHEDULER_INSERT_BATCH_SIZE")  # rows per INSERT statement
+    SCHEDULER_CLAIM_BATCH_SIZE: int = Field(default=100, alias="SCHEDULER_CLAIM_BATCH_SIZE")  # rows claimed per query
+    # cron: one batch per tick, drain: claim and publish until nothing is due
+    SCHEDULER_RUN_MODE: Literal["cron", "drain"] = Field(default="drain", alias="SCHEDULER_RUN_MODE")
+    SCHEDULER_MIN_CLAIM_BATCH_SIZE: int = Field(default=10, alias="SCHEDULER_MIN_CLAIM_BATCH_SIZE")
+    SCHEDULER_MAX_CLAIM_BATCH_SIZE: int = Field(default=1000, alias="SCHEDULER_MAX_CLAIM_BATCH_SIZE")
+    SCHEDULER_MAX_IN_FLIGHT: int = Field(default=200, alias="SCHEDULER_MAX_IN_FLIGHT")  # concurrent publishes
+    # time a claimed batch may take to publish before the claim batch size shrinks
+    SCHEDULER_TARGET_PUBLISH_LATENCY: float = Field(default=0.05, alias="SCHEDULER_TARGET_PUBLISH_LATENCY")  # in seconds
+    SCHEDULER_MAX_IDLE: float = Field(default=60, alias="SCHEDULER_MAX_IDLE")  # in seconds
+    SCHEDULER_LISTEN: bool = Field(default=True, alias="SCHEDULER_LISTEN")  # wake the drain loops on inserts
+    SCHEDULER_NOTIFY_DEBOUNCE: float = Field(default=0.05, alias="SCHEDULER_NOTIFY_DEBOUNCE")  # in seconds
+    SCHEDULER_OUTCOME_BATCH_SIZE: int = Field(default=500, alias="SCHEDULER_OUTCOME_BATCH_SIZE")  # rows per UPDATE
+    SCHEDULER_OUTCOME_FLUSH_INTERVAL: float = Field(default=0.05, alias="SCHEDULER_OUTCOME_FLUSH_INTERVAL")  # in seconds
+    # failed dispatch n is retried base * 2^(n-1) ± jitter seconds later
+    SCHEDULER_RETRY_BASE_DELAY: float = Field(default=30, alias="SCHEDULER_RETRY_BASE_DELAY")  # in seconds
+    SCHEDULER_RETRY_MAX_DELAY: float = Field(default=3600, alias="SCHEDULER_RETRY_MAX_DELAY")  # in seconds
+    SCHEDULER_RETRY_JITTER: float = Field(default=0.2, alias="SCHEDULER_RETRY_JITTER")  # fraction of the delay
+    SCHEDULER_RETRY_MAX_ATTEMPTS: int = Field(default=4, alias="SCHEDULER_RETRY_MAX_ATTEMPTS")
+    # e.g. {"hetq.am": 8}
+    SCHEDULER_RETRY_MAX_ATTEMPTS_OVERRIDES: dict[str, int] = Field(
+        default_factory=dict, alias="SCHEDULER_RETRY_MAX_ATTEMPTS_OVERRIDES"
+    )
+    # expired leases in a row after which a schedule is failed instead of dispatched again
+    SCHEDULER_RETRY_MAX_RECLAIMS: int = Field(default=3, alias="SCHEDULER_RETRY_MAX_RECLAIMS")
+    # owner of the rows this process claims, must differ between replicas
+    SCHEDULER_INSTANCE_ID: str = Field(
+        default_factory=lambda: f"{socket.gethostname()}-{os.getpid()}-{secrets.token_hex(4)}",
+        alias="SCHEDULER_INSTANCE_ID",
+    )
+    SCHEDULER_LEASE_DURATION: float = Field(default=300, alias="SCHEDULER_LEASE_DURATION")  # in seconds
+    SCHEDULER_HEARTBEAT_INTERVAL: float = Field(default=60, alias="SCHEDULER_HEARTBEAT_INTERVAL")  # in seconds
+
+
+class CircuitBreakerSettings(CustomSettings):
+    CIRCUIT_BREAKER_FAILURE_THRESHOLD: int = Field(default=3, alias="CIRCUIT_BREAKER_FAILURE_THRESHOLD")
+    CIRCUIT_BREAKER_RECOVERY_TIMEOUT: int = Field(default=5, alias="CIRCUIT_BREAKER_RECOVERY_TIMEOUT")  # in seconds
+    CIRCUIT_BREAKER_PATH_DEPTH: int = Field(default=0, alias="CIRCUIT_BREAKER_PATH_DEPTH")
+    # e.g. {"hetq.am": {"failure_threshold": 5, "recovery_timeout": 30}}
+    CIRCUIT_BREAKER_OVERRIDES: dict[str, dict[str, int]] = Field(default_factory=dict, alias="CIRCUIT_BREAKER_OVERRIDES")
+
+
 class Settings(BaseModel):
     APP_SETTINGS: AppSettings = Field(default_factory=AppSettings)
     DATABASE: DbSettings = Field(default_factory=DbSettings)
@@ -130,6 +256,17 @@ class Settings(BaseModel):
     S3: S3Settings = Field(default_factory=S3Settings)
     JWT: JWTSettings = Field(default_factory=JWTSettings)
     API_CALL: ApiCallSettings = Field(default_factory=ApiCallSettings)
+    HTTP_CLIENT: HttpClientSettings = Field(default_factory=HttpClientSettings)
+    FETCH_CACHE: FetchCacheSettings = Field(default_factory=FetchCacheSettings)
+    PAGE_ARCHIVE: PageArchiveSettings = Field(default_factory=PageArchiveSettings)
+    CRAWLER: CrawlerSettings = Field(default_factory=CrawlerSettings)
+    SCHEDULER: SchedulerSettings = Field(default_factory=SchedulerSettings)
+    ARTICLE_WRITER: ArticleWriterSettings = Field(default_factory=ArticleWriterSettings)
+    CIRCUIT_BREAKER: CircuitBreakerSettings = Field(default_factory=CircuitBreakerSettings)
+    KEYWORDS: KeywordSettings = Field(default_factory=KeywordSettings)
+    EXTRACTION_PROFILES: ExtractionProfileSettings = Field(default_factory=ExtractionProfileSettings)
+    PROCESS_POOL: ProcessPoolSettings = Field(default_factory=ProcessPoolSettings)
+    BACKFILL: BackfillSettings = Field(default_factory=BackfillSettings)
 
 
 @lru_cache
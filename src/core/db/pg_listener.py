@@ -0,0 +1,97 @@
+import asyncio
+from typing import Callable, Optional
+
+import asyncpg
+from sqlalchemy.engine import make_url
+
+NotificationHandler = Callable[[list[str]], None]
+
+
+class PgNotificationListener:
+    """
+    One dedicated asyncpg connection `LISTEN`ing on the subscribed channels.
+
+    Notifications of a channel are coalesced: the first one opens a `debounce` window and the
+    handler is called once with every payload received during it; handlers must not block.
+    A lost connection is reopened with exponential backoff, after which every handler is called
+    with no payloads since notifications sent in between are lost.
+    """
+
+    def __init__(self, url: str, debounce: float = 0.05, max_backoff: float = 30.0, logger=None):
+        # the application url carries the SQLAlchemy driver, asyncpg wants a plain postgresql:// dsn
+        self._dsn = make_url(url).set(drivername="postgresql").render_as_string(hide_password=False)
+        self._debounce = debounce
+        self._max_backoff = max_backoff
+        self._handlers: dict[str, list[NotificationHandler]] = {}
+        self._pending: dict[str, list[str]] = {}
+        self._connection: Optional[asyncpg.Connection] = None
+        self._task: Optional[asyncio.Task] = None
+        self._closed = asyncio.Event()
+        self._logger = logger
+
+    async def subscribe(self, channel: str, handler: NotificationHandler) -> None:
+        _is_new = channel not in self._handlers
+        self._handlers.setdefault(channel, []).append(handler)
+        if _is_new and self._connection is not None and not self._connection.is_closed():
+            await self._connection.add_listener(channel, self._on_notification)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="pg-listener")
+
+    def _on_notification(self, connection, pid: int, channel: str, payload: str) -> None:
+        _payloads = self._pending.get(channel)
+        if _payloads is not None:
+            _payloads.append(payload)
+            return
+        self._pending[channel] = [payload]
+        asyncio.get_running_loop().call_later(self._debounce, self._flush, channel)
+
+    def _flush(self, channel: str) -> None:
+        _payloads = self._pending.pop(channel, [])
+        for _handler in self._handlers.get(channel, []):
+            try:
+                _handler(_payloads)
+            except Exception as e:
+                if self._logger:
+                    self._logger.error(f"Notification handler of {channel} failed: {e}")
+
+    def _on_termination(self, connection) -> None:
+        self._closed.set()
+
+    async def _connect(self) -> asyncpg.Connection:
+        _connection = await asyncpg.connect(self._dsn)
+        _connection.add_termination_listener(self._on_termination)
+        for _channel in self._handlers:
+            await _connection.add_listener(_channel, self._on_notification)
+        return _connection
+
+    async def _run(self) -> None:
+        _backoff, _reconnect = 0.5, False
+        while True:
+            try:
+                self._closed.clear()
+                self._connection = await self._connect()
+                if self._logger:
+                    self._logger.info(f"Listening on {sorted(self._handlers)}")
+                if _reconnect:
+                    for _channel in self._handlers:
+                        self._flush(_channel)
+                _backoff, _reconnect = 0.5, True
+                await self._closed.wait()
+                if self._logger:
+                    self._logger.warning("Notification listener connection lost, reconnecting")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                if self._logger:
+                    self._logger.error(f"Notification listener failed to connect: {e}, retrying in {_backoff:0.1f}s")
+                await asyncio.sleep(_backoff)
+                _backoff = min(_backoff * 2, self._max_backoff)
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._connection is not None and not self._connection.is_closed():
+            await self._connection.close()
+        self._connection = None
@@ -1,9 +1,12 @@
 import enum
 
+from sqlalchemy import LargeBinary
 from sqlalchemy.ext.declarative import declared_attr
 from sqlalchemy.orm import  mapped_column
 from sqlalchemy.dialects.postgresql import ENUM
 
+from src.core.utils.urls import url_hash
+
 
 class StatusMixin:
     _status_nullable = False
@@ -21,4 +24,19 @@ class StatusMixin:
             nullable=self._status_nullable,
             index=self._status_index,
         )
-        return _status
\ No newline at end of file
+        return _status
+
+
+def _url_hash_default(context) -> bytes:
+    return url_hash(context.get_current_parameters()["url"])
+
+
+class UrlHashMixin:
+    """
+    `url_hash` (sha256 of the normalized `url`) with a unique B-tree index, filled from `url` by a
+    column default on insert. Url lookups and dedup go through it instead of scanning `url`.
+    """
+
+    @declared_attr
+    def url_hash(self):
+        return mapped_column(LargeBinary(32), nullable=False, unique=True, index=True, default=_url_hash_default)
@@ -3,16 +3,36 @@ from dependency_injector.providers import Factory, Singleton
 from faststream.asgi import AsgiFastStream
 from faststream.rabbit import RabbitBroker, RabbitRouter
 
-from src.app.crawler.repo import ContentRepository, IndexRepository, MetaRepository, UrlRepository
-from src.app.crawler.scrapping import FakeCrawler
+from src.app.crawler.backfill import ArticleBackfill
+from src.app.crawler.keywords import KeywordRegistry
+from src.app.crawler.profiles import ExtractionProfileRegistry
+from src.app.crawler.repo import (
+    ContentRepository,
+    ExtractionProfileRepository,
+    FeedSourceRepository,
+    IndexRepository,
+    KeywordRepository,
+    MetaRepository,
+    UrlRepository,
+)
+from src.app.crawler.scrapping import HttpScraper
 from src.app.crawler.service import CrawlerService, FetchingService, ParsingService
+from src.app.crawler.writer import ArticleWriter
+from src.app.scheduler.outcomes import ScheduleOutcomeWriter
 from src.app.scheduler.repo import SchedulerRepository
+from src.app.scheduler.retry import RetryPolicy
 from src.app.scheduler.service import SchedulerService
 from src.core.db.pg_base_repo import BaseRepository
 from src.core.db.pg_connection import PgAsyncSQLAlchemyAdapter
+from src.core.db.pg_listener import PgNotificationListener
 from src.core.db.pg_uow import PgSQLAlchemyUnitOfWork
 from src.core.rmq.rmq_publisher import RabbitMQPublisher
+from src.core.utils.api.circuit_breakers import CIRCUIT_BREAKERS
+from src.core.utils.api.fetch_cache import FETCH_CACHE
+from src.core.utils.api.http_client import HTTP_CLIENTS
 from src.core.utils.api.logger import LOGGER
+from src.core.utils.page_archive import PAGE_ARCHIVE
+from src.core.utils.process_pool import PROCESS_POOLS
 
 
 class DependencyContainer(containers.DeclarativeContainer):
@@ -41,6 +61,17 @@ class DependencyContainer(containers.DeclarativeContainer):
         config.RABBITMQ.BROKER_URL,
     )
     rmq_publisher = providers.Singleton(RabbitMQPublisher, broker_adapter=rmq_broker, logger=LOGGER)
+    pg_listener: Singleton[PgNotificationListener] = providers.Singleton(
+        PgNotificationListener,
+        url=config.DATABASE.DATABASE_URL,
+        debounce=config.SCHEDULER.SCHEDULER_NOTIFY_DEBOUNCE,
+        logger=LOGGER,
+    )
+    http_clients = providers.Object(HTTP_CLIENTS)
+    fetch_cache = providers.Object(FETCH_CACHE)
+    circuit_breakers = providers.Object(CIRCUIT_BREAKERS)
+    page_archive = providers.Object(PAGE_ARCHIVE)
+    process_pools = providers.Object(PROCESS_POOLS)
 
     uow: PgSQLAlchemyUnitOfWork = providers.Singleton(
         PgSQLAlchemyUnitOfWork,
@@ -52,15 +83,111 @@ class DependencyContainer(containers.DeclarativeContainer):
             ContentRepository.__name__: ContentRepository,
             UrlRepository.__name__: UrlRepository,
             MetaRepository.__name__: MetaRepository,
+            FeedSourceRepository.__name__: FeedSourceRepository,
+            KeywordRepository.__name__: KeywordRepository,
+            ExtractionProfileRepository.__name__: ExtractionProfileRepository,
             SchedulerRepository.__name__: SchedulerRepository,
         },
     )
     faststream_app = providers.Singleton(AsgiFastStream, rmq_broker)
 
-    parsing_service: Factory[ParsingService] = providers.Factory(ParsingService, uow=uow, scraper=FakeCrawler())
-    fetching_service: Factory[CrawlerService] = providers.Factory(FetchingService, uow=uow, scraper=FakeCrawler())
-    scheduler_service: Factory[SchedulerService] = providers.Factory(SchedulerService, uow=uow, rmq_publisher=rmq_publisher)
+    scraper: Singleton[HttpScraper] = providers.Singleton(
+        HttpScraper,
+        concurrency=config.CRAWLER.CRAWL_SCRAPER_CONCURRENCY,
+        logger=LOGGER,
+    )
+
+    keyword_registry: Singleton[KeywordRegistry] = providers.Singleton(
+        KeywordRegistry,
+        uow=uow,
+        snapshot_dir=config.KEYWORDS.KEYWORDS_SNAPSHOT_DIR,
+        refresh_interval=config.KEYWORDS.KEYWORDS_REFRESH_INTERVAL,
+        logger=LOGGER,
+    )
+
+    profile_registry: Singleton[ExtractionProfileRegistry] = providers.Singleton(
+        ExtractionProfileRegistry,
+        uow=uow,
+        refresh_interval=config.EXTRACTION_PROFILES.EXTRACTION_PROFILES_REFRESH_INTERVAL,
+        logger=LOGGER,
+    )
+
+    article_writer: Singleton[ArticleWriter] = providers.Singleton(
+        ArticleWriter,
+        uow=uow,
+        batch_size=config.ARTICLE_WRITER.ARTICLE_WRITER_BATCH_SIZE,
+        flush_interval=config.ARTICLE_WRITER.ARTICLE_WRITER_FLUSH_INTERVAL,
+        copy_threshold=config.ARTICLE_WRITER.ARTICLE_WRITER_COPY_THRESHOLD,
+        logger=LOGGER,
+    )
+
+    parsing_service: Factory[ParsingService] = providers.Factory(
+        ParsingService,
+        uow=uow,
+        process_pools=process_pools,
+        keyword_registry=keyword_registry,
+        profile_registry=profile_registry,
+        article_writer=article_writer,
+    )
+    fetching_service: Factory[CrawlerService] = providers.Factory(
+        FetchingService,
+        uow=uow,
+        scraper=scraper,
+        page_archive=page_archive,
+        feed_max_bytes=config.CRAWLER.CRAWL_FEED_MAX_BYTES,
+        feed_max_sitemaps=config.CRAWLER.CRAWL_FEED_MAX_SITEMAPS,
+    )
+    schedule_outcome_writer: Singleton[ScheduleOutcomeWriter] = providers.Singleton(
+        ScheduleOutcomeWriter,
+        uow=uow,
+        owner=config.SCHEDULER.SCHEDULER_INSTANCE_ID,
+        batch_size=config.SCHEDULER.SCHEDULER_OUTCOME_BATCH_SIZE,
+        flush_interval=config.SCHEDULER.SCHEDULER_OUTCOME_FLUSH_INTERVAL,
+        logger=LOGGER,
+    )
+    retry_policy: Singleton[RetryPolicy] = providers.Singleton(
+        RetryPolicy,
+        base_delay=config.SCHEDULER.SCHEDULER_RETRY_BASE_DELAY,
+        max_delay=config.SCHEDULER.SCHEDULER_RETRY_MAX_DELAY,
+        jitter=config.SCHEDULER.SCHEDULER_RETRY_JITTER,
+        max_attempts=config.SCHEDULER.SCHEDULER_RETRY_MAX_ATTEMPTS,
+        max_attempts_overrides=config.SCHEDULER.SCHEDULER_RETRY_MAX_ATTEMPTS_OVERRIDES,
+        max_reclaims=config.SCHEDULER.SCHEDULER_RETRY_MAX_RECLAIMS,
+    )
+    # one per process: it owns the drain loops and the lease heartbeats that shutdown has to stop
+    scheduler_service: Singleton[SchedulerService] = providers.Singleton(
+        SchedulerService,
+        uow=uow,
+        rmq_publisher=rmq_publisher,
+        outcome_writer=schedule_outcome_writer,
+        retry_policy=retry_policy,
+        owner=config.SCHEDULER.SCHEDULER_INSTANCE_ID,
+        lease_duration=config.SCHEDULER.SCHEDULER_LEASE_DURATION,
+        heartbeat_interval=config.SCHEDULER.SCHEDULER_HEARTBEAT_INTERVAL,
+        insert_batch_size=config.SCHEDULER.SCHEDULER_INSERT_BATCH_SIZE,
+        claim_batch_size=config.SCHEDULER.SCHEDULER_CLAIM_BATCH_SIZE,
+        run_mode=config.SCHEDULER.SCHEDULER_RUN_MODE,
+        min_claim_batch_size=config.SCHEDULER.SCHEDULER_MIN_CLAIM_BATCH_SIZE,
+        max_claim_batch_size=config.SCHEDULER.SCHEDULER_MAX_CLAIM_BATCH_SIZE,
+        max_in_flight=config.SCHEDULER.SCHEDULER_MAX_IN_FLIGHT,
+        target_publish_latency=config.SCHEDULER.SCHEDULER_TARGET_PUBLISH_LATENCY,
+        max_idle=config.SCHEDULER.SCHEDULER_MAX_IDLE,
+        listener=pg_listener,
+        listen=config.SCHEDULER.SCHEDULER_LISTEN,
+    )
 
     crawling_service: Factory[CrawlerService] = providers.Factory(
         CrawlerService, fetching_service=fetching_service, scheduler_service=scheduler_service, parsing_service=parsing_service
     )
+    article_backfill: Factory[ArticleBackfill] = providers.Factory(
+        ArticleBackfill,
+        uow=uow,
+        keyword_registry=keyword_registry,
+        profile_registry=profile_registry,
+        article_writer=article_writer,
+        workers=config.BACKFILL.BACKFILL_WORKERS,
+        batch_size=config.BACKFILL.BACKFILL_BATCH_SIZE,
+        chunk_size=config.BACKFILL.BACKFILL_CHUNK_SIZE,
+        checkpoint_path=config.BACKFILL.BACKFILL_CHECKPOINT_PATH,
+        logger=LOGGER,
+    )
@@ -0,0 +1,29 @@
+"""url fetch validators
+
+Revision ID: 13d94032ec0a
+Revises: 6b1d2bc0d2ad
+Create Date: 2026-10-18 09:12:41.201337
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "13d94032ec0a"
+down_revision: Union[str, None] = "6b1d2bc0d2ad"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("url", sa.Column("etag", sa.String(), nullable=True))
+    op.add_column("url", sa.Column("last_modified", sa.String(), nullable=True))
+    op.add_column("url", sa.Column("content_hash", sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("url", "content_hash")
+    op.drop_column("url", "last_modified")
+    op.drop_column("url", "etag")
@@ -0,0 +1,43 @@
+"""extraction profile
+
+Revision ID: 2b6e81f5c0d4
+Revises: c71f04d9e2a5
+Create Date: 2026-10-18 16:18:47.102385
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import mysql, postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "2b6e81f5c0d4"
+down_revision: Union[str, None] = "c71f04d9e2a5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "extraction_profile",
+        sa.Column("domain", sa.String(), nullable=False),
+        sa.Column("title_selector", sa.String(), nullable=True),
+        sa.Column("body_selector", sa.String(), nullable=True),
+        sa.Column("author_selector", sa.String(), nullable=True),
+        sa.Column("published_at_selector", sa.String(), nullable=True),
+        sa.Column("use_json_ld", sa.Boolean(), server_default=sa.text("true"), nullable=False),
+        sa.Column("use_open_graph", sa.Boolean(), server_default=sa.text("true"), nullable=False),
+        sa.Column("link_allow_patterns", postgresql.ARRAY(sa.String()), server_default="{}", nullable=False),
+        sa.Column("link_deny_patterns", postgresql.ARRAY(sa.String()), server_default="{}", nullable=False),
+        sa.Column("is_active", sa.Boolean(), server_default=sa.text("true"), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("id", mysql.BIGINT(), autoincrement=True, nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("domain"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("extraction_profile")
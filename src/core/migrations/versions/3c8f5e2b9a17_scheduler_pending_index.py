@@ -0,0 +1,42 @@
+"""scheduler pending index
+
+Revision ID: 3c8f5e2b9a17
+Revises: 9e4b7d2a61c8
+Create Date: 2026-10-18 18:31:07.204815
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3c8f5e2b9a17"
+down_revision: Union[str, None] = "9e4b7d2a61c8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # built concurrently, both tables keep taking writes while the indexes are created
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_scheduled_url_pending",
+            "scheduled_url",
+            ["scheduled_time"],
+            postgresql_where=sa.text("status = '1'"),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_predefined_url_pending",
+            "predefined_url",
+            ["id"],
+            postgresql_where=sa.text("status = '1'"),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_predefined_url_pending", table_name="predefined_url", postgresql_concurrently=True)
+        op.drop_index("ix_scheduled_url_pending", table_name="scheduled_url", postgresql_concurrently=True)
@@ -0,0 +1,25 @@
+"""url blob pointer
+
+Revision ID: 4f2a9c7e1b83
+Revises: 10531dcb66d1
+Create Date: 2026-10-18 11:26:54.318042
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "4f2a9c7e1b83"
+down_revision: Union[str, None] = "10531dcb66d1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("url", sa.Column("blob_pointer", sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("url", "blob_pointer")
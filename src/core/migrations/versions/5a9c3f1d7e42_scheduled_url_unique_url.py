@@ -0,0 +1,26 @@
+"""scheduled url unique url
+
+Revision ID: 5a9c3f1d7e42
+Revises: 2b6e81f5c0d4
+Create Date: 2026-10-18 17:05:12.530418
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5a9c3f1d7e42"
+down_revision: Union[str, None] = "2b6e81f5c0d4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # keep the oldest schedule of every url, the unique index below is the ON CONFLICT target
+    op.execute("DELETE FROM scheduled_url a USING scheduled_url b WHERE a.url = b.url AND a.id > b.id")
+    op.create_index("uq_scheduled_url_url", "scheduled_url", ["url"], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index("uq_scheduled_url_url", table_name="scheduled_url")
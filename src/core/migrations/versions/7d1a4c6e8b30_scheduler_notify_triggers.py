@@ -0,0 +1,68 @@
+"""scheduler notify triggers
+
+Revision ID: 7d1a4c6e8b30
+Revises: 3c8f5e2b9a17
+Create Date: 2026-10-18 19:12:44.630192
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "7d1a4c6e8b30"
+down_revision: Union[str, None] = "3c8f5e2b9a17"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # statement level: a multi-row INSERT sends one notification, and only when it added pending rows
+    op.execute(
+        """
+        CREATE FUNCTION notify_scheduled_url_inserted() RETURNS trigger AS $$
+        DECLARE
+            _due timestamp;
+        BEGIN
+            SELECT min(scheduled_time) INTO _due FROM inserted_rows WHERE status = '1';
+            IF _due IS NOT NULL THEN
+                PERFORM pg_notify('scheduled_url_inserted', _due::text);
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER scheduled_url_inserted AFTER INSERT ON scheduled_url
+        REFERENCING NEW TABLE AS inserted_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION notify_scheduled_url_inserted()
+        """
+    )
+    op.execute(
+        """
+        CREATE FUNCTION notify_predefined_url_inserted() RETURNS trigger AS $$
+        BEGIN
+            IF EXISTS (SELECT 1 FROM inserted_rows WHERE status = '1') THEN
+                PERFORM pg_notify('predefined_url_inserted', '');
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER predefined_url_inserted AFTER INSERT ON predefined_url
+        REFERENCING NEW TABLE AS inserted_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION notify_predefined_url_inserted()
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER predefined_url_inserted ON predefined_url")
+    op.execute("DROP FUNCTION notify_predefined_url_inserted()")
+    op.execute("DROP TRIGGER scheduled_url_inserted ON scheduled_url")
+    op.execute("DROP FUNCTION notify_scheduled_url_inserted()")
@@ -0,0 +1,35 @@
+"""keyword
+
+Revision ID: 8d3e5b0a6f21
+Revises: 4f2a9c7e1b83
+Create Date: 2026-10-18 13:41:09.527614
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import mysql
+
+# revision identifiers, used by Alembic.
+revision: str = "8d3e5b0a6f21"
+down_revision: Union[str, None] = "4f2a9c7e1b83"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "keyword",
+        sa.Column("keyword", sa.String(), nullable=False),
+        sa.Column("is_active", sa.Boolean(), server_default=sa.text("true"), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("id", mysql.BIGINT(), autoincrement=True, nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("keyword"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("keyword")
@@ -0,0 +1,109 @@
+"""url hash
+
+Revision ID: 9e4b7d2a61c8
+Revises: 5a9c3f1d7e42
+Create Date: 2026-10-18 17:48:20.914227
+
+"""
+import hashlib
+import re
+from typing import Sequence, Union
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "9e4b7d2a61c8"
+down_revision: Union[str, None] = "5a9c3f1d7e42"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_TABLES = ("url", "scheduled_url", "predefined_url")
+_URL_CHILDREN = ("content", "meta", "author", "index_posting")
+_BATCH_SIZE = 5000
+
+# frozen copies of `src.core.utils.urls` as of this revision: the migration must keep computing
+# the same urls and hashes whatever later changes are made to the application's versions
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+_TRACKING_PARAM_RE = re.compile(r"^(?:utm_\w+|fbclid|gclid|dclid|yclid|msclkid|mc_cid|mc_eid|igshid|_ga|_gl)$", re.IGNORECASE)
+
+
+def _normalize_url(url: str) -> str:
+    _parts = urlsplit(url.strip())
+    _scheme = _parts.scheme.lower()
+    _netloc = (_parts.hostname or "").lower()
+    if ":" in _netloc:
+        _netloc = f"[{_netloc}]"
+    if _parts.port and _parts.port != _DEFAULT_PORTS.get(_scheme):
+        _netloc = f"{_netloc}:{_parts.port}"
+    _query = _parts.query
+    if _query:
+        _params = parse_qsl(_query, keep_blank_values=True)
+        _kept = [(_key, _value) for _key, _value in _params if not _TRACKING_PARAM_RE.match(_key)]
+        if len(_kept) != len(_params):
+            _query = urlencode(_kept)
+    return urlunsplit((_scheme, _netloc, _parts.path or "/", _query, ""))
+
+
+def _normalize(url: str) -> str:
+    try:
+        return _normalize_url(url)
+    except ValueError:
+        return url
+
+
+def _url_hash(url: str) -> bytes:
+    try:
+        _url = _normalize_url(url)
+    except ValueError:
+        _url = url.strip()
+    else:
+        _scheme, _, _rest = _url.partition("://")
+        if _rest.startswith("www."):
+            _url = f"{_scheme}://{_rest[4:]}"
+    return hashlib.sha256(_url.encode()).digest()
+
+
+def _backfill(table: str) -> None:
+    # normalization lives in python, so rows are rewritten in id ordered batches
+    _conn = op.get_bind()
+    _select = sa.text(f"SELECT id, url FROM {table} WHERE id > :last_id ORDER BY id LIMIT :limit")
+    _update = sa.text(f"UPDATE {table} SET url = :url, url_hash = :url_hash WHERE id = :id")
+    _last_id = 0
+    while True:
+        _rows = _conn.execute(_select, {"last_id": _last_id, "limit": _BATCH_SIZE}).all()
+        if not _rows:
+            break
+        _conn.execute(
+            _update, [{"id": _row.id, "url": _normalize(_row.url), "url_hash": _url_hash(_row.url)} for _row in _rows]
+        )
+        _last_id = _rows[-1].id
+
+
+def upgrade() -> None:
+    # the backfill rewrites urls into their normalized spelling, which may collide until duplicates
+    # are removed below, so the unique url index goes first; url_hash takes over its role
+    op.drop_index("uq_scheduled_url_url", table_name="scheduled_url")
+    for _table in _TABLES:
+        op.add_column(_table, sa.Column("url_hash", sa.LargeBinary(length=32), nullable=True))
+        _backfill(_table)
+
+    # urls that only differed in spelling collapse into the oldest row
+    _duplicates = "SELECT a.id FROM url a JOIN url b ON a.url_hash = b.url_hash AND a.id > b.id"
+    for _child in _URL_CHILDREN:
+        op.execute(f"DELETE FROM {_child} WHERE url_id IN ({_duplicates})")
+    op.execute(f"DELETE FROM url WHERE id IN ({_duplicates})")
+    for _table in ("scheduled_url", "predefined_url"):
+        op.execute(f"DELETE FROM {_table} a USING {_table} b WHERE a.url_hash = b.url_hash AND a.id > b.id")
+
+    for _table in _TABLES:
+        op.alter_column(_table, "url_hash", nullable=False)
+        op.create_index(f"ix_{_table}_url_hash", _table, ["url_hash"], unique=True)
+
+
+def downgrade() -> None:
+    for _table in _TABLES:
+        op.drop_index(f"ix_{_table}_url_hash", table_name=_table)
+        op.drop_column(_table, "url_hash")
+    op.create_index("uq_scheduled_url_url", "scheduled_url", ["url"], unique=True)
@@ -0,0 +1,46 @@
+"""scheduler claim leases
+
+Revision ID: a4f9c2e7b153
+Revises: e5b2a8d4f716
+Create Date: 2026-10-18 21:02:36.871140
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a4f9c2e7b153"
+down_revision: Union[str, None] = "e5b2a8d4f716"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_TABLES = ("scheduled_url", "predefined_url")
+
+
+def upgrade() -> None:
+    for _table in _TABLES:
+        op.add_column(_table, sa.Column("claimed_by", sa.String(), nullable=True))
+        op.add_column(_table, sa.Column("lease_expires_at", sa.DateTime(), nullable=True))
+        # rows left processing by a dead process before leases existed are taken back on the next claim
+        op.execute(f"UPDATE {_table} SET lease_expires_at = CURRENT_TIMESTAMP AT TIME ZONE 'UTC' WHERE status = '4'")
+    # built concurrently, both tables keep taking writes while the indexes are created
+    with op.get_context().autocommit_block():
+        for _table in _TABLES:
+            op.create_index(
+                f"ix_{_table}_lease",
+                _table,
+                ["lease_expires_at"],
+                postgresql_where=sa.text("status = '4'"),
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for _table in _TABLES:
+            op.drop_index(f"ix_{_table}_lease", table_name=_table, postgresql_concurrently=True)
+    for _table in _TABLES:
+        op.drop_column(_table, "lease_expires_at")
+        op.drop_column(_table, "claimed_by")
@@ -0,0 +1,29 @@
+"""scheduler reclaim count
+
+Revision ID: b8e3d15f9a62
+Revises: a4f9c2e7b153
+Create Date: 2026-10-18 23:41:07.529384
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b8e3d15f9a62"
+down_revision: Union[str, None] = "a4f9c2e7b153"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_TABLES = ("scheduled_url", "predefined_url")
+
+
+def upgrade() -> None:
+    for _table in _TABLES:
+        op.add_column(_table, sa.Column("reclaim_count", sa.Integer(), nullable=False, server_default="0"))
+
+
+def downgrade() -> None:
+    for _table in _TABLES:
+        op.drop_column(_table, "reclaim_count")
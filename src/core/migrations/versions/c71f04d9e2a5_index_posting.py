@@ -0,0 +1,80 @@
+"""index posting
+
+Revision ID: c71f04d9e2a5
+Revises: 8d3e5b0a6f21
+Create Date: 2026-10-18 15:02:33.846120
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import mysql, postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "c71f04d9e2a5"
+down_revision: Union[str, None] = "8d3e5b0a6f21"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "index_posting",
+        sa.Column("url_id", sa.INTEGER(), nullable=False),
+        sa.Column("keyword_ids", postgresql.ARRAY(sa.INTEGER()), nullable=False),
+        sa.Column("frequencies", postgresql.ARRAY(sa.INTEGER()), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.ForeignKeyConstraint(["url_id"], ["url.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("url_id"),
+    )
+    op.create_index(
+        "ix_index_posting_keyword_ids", "index_posting", ["keyword_ids"], unique=False, postgresql_using="gin"
+    )
+    # every keyword ever indexed gets a dictionary id; ones that are not on the watchlist stay inactive
+    op.execute(
+        'INSERT INTO keyword (keyword, is_active) SELECT DISTINCT keyword, false FROM "index" '
+        "ON CONFLICT (keyword) DO NOTHING"
+    )
+    op.execute(
+        """
+        INSERT INTO index_posting (url_id, keyword_ids, frequencies)
+        SELECT url_id, array_agg(keyword_id ORDER BY keyword_id), array_agg(frequency ORDER BY keyword_id)
+        FROM (
+            SELECT i.url_id, k.id AS keyword_id, sum(i.frequency)::integer AS frequency
+            FROM "index" i JOIN keyword k ON k.keyword = i.keyword
+            GROUP BY i.url_id, k.id
+        ) AS postings
+        GROUP BY url_id
+        """
+    )
+    op.drop_table("index")
+
+
+def downgrade() -> None:
+    op.create_table(
+        "index",
+        sa.Column("keyword", sa.String(), nullable=False),
+        sa.Column("frequency", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("id", mysql.BIGINT(), autoincrement=True, nullable=False),
+        sa.Column("url_id", sa.INTEGER(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["url_id"],
+            ["url.id"],
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.execute(
+        """
+        INSERT INTO "index" (url_id, keyword, frequency)
+        SELECT p.url_id, k.keyword, postings.frequency
+        FROM index_posting p
+        CROSS JOIN LATERAL unnest(p.keyword_ids, p.frequencies) AS postings(keyword_id, frequency)
+        JOIN keyword k ON k.id = postings.keyword_id
+        """
+    )
+    op.drop_index("ix_index_posting_keyword_ids", table_name="index_posting", postgresql_using="gin")
+    op.drop_table("index_posting")
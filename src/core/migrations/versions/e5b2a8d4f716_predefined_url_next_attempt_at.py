@@ -0,0 +1,25 @@
+"""predefined url next attempt at
+
+Revision ID: e5b2a8d4f716
+Revises: 7d1a4c6e8b30
+Create Date: 2026-10-18 20:05:51.318427
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e5b2a8d4f716"
+down_revision: Union[str, None] = "7d1a4c6e8b30"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("predefined_url", sa.Column("next_attempt_at", sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("predefined_url", "next_attempt_at")
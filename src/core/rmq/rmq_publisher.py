@@ -51,3 +51,4 @@ class RabbitMQPublisher:
             )
         except Exception as e:
             self._logger.error(f"Failed to publish message to RMQ: {e}")
+            raise
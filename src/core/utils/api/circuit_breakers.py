@@ -0,0 +1,128 @@
+from typing import Any, Awaitable, Callable, Optional
+from urllib.parse import urlsplit
+
+import circuitbreaker
+
+from src.core.conf.settings import SETTINGS, CircuitBreakerSettings
+from src.core.utils.api.http_exceptions import BadGatewayException, ServiceUnavailableException, TimeoutException
+from src.core.utils.api.logger import LOGGER
+
+
+class CustomCircuitBreaker(circuitbreaker.CircuitBreaker):
+    FAILURE_THRESHOLD = 3
+    RECOVERY_TIMEOUT = 5
+    EXPECTED_EXCEPTION = Exception
+
+
+class HostCircuitBreaker(CustomCircuitBreaker):
+    """
+    Breaker for a single origin. Only upstream failures (unavailable, bad gateway, timeout) count
+    and only a successful response resets the count: client errors such as a 404 say nothing about
+    the health of the host and leave it untouched. While half-open a single probe request is let
+    through; everything else fails fast until the probe succeeds (closes the circuit) or fails
+    (reopens it).
+    """
+
+    EXPECTED_EXCEPTION = (ServiceUnavailableException, BadGatewayException, TimeoutException)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._probing = False
+
+    def __exit__(self, exc_type, exc_value, _traceback):
+        if exc_type and not self.is_failure(exc_type, exc_value):
+            return False
+        return super().__exit__(exc_type, exc_value, _traceback)
+
+    async def call_guarded(self, func: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        _state = self.state
+        if _state == circuitbreaker.STATE_OPEN or (_state == circuitbreaker.STATE_HALF_OPEN and self._probing):
+            raise circuitbreaker.CircuitBreakerError(self)
+        _is_probe = _state == circuitbreaker.STATE_HALF_OPEN
+        self._probing = self._probing or _is_probe
+        try:
+            return await self.call_async(func, *args, **kwargs)
+        finally:
+            if _is_probe:
+                self._probing = False
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "state": self.state,
+            "failure_count": self.failure_count,
+            "failure_threshold": self._failure_threshold,
+            "recovery_timeout": self._recovery_timeout,
+            "open_remaining": max(self.open_remaining, 0) if self.state != circuitbreaker.STATE_CLOSED else 0,
+            "last_failure": repr(self.last_failure) if self.last_failure else None,
+        }
+
+
+class CircuitBreakerRegistry:
+    """
+    Keeps one `HostCircuitBreaker` per origin (optionally per leading path segments),
+    so a dead news site never opens the circuit for healthy ones.
+    Thresholds can be overridden per host; an override for `example.com` also applies to its subdomains.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int,
+        recovery_timeout: int,
+        path_depth: int = 0,
+        overrides: Optional[dict[str, dict]] = None,
+        logger=None,
+    ):
+        self._failure_threshold = failure_threshold
+        self._recovery_timeout = recovery_timeout
+        self._path_depth = path_depth
+        self._overrides = {k.lower(): v for k, v in (overrides or {}).items()}
+        self._breakers: dict[str, HostCircuitBreaker] = {}
+        self._logger = logger
+
+    @classmethod
+    def from_settings(cls, settings: CircuitBreakerSettings, logger=None) -> "CircuitBreakerRegistry":
+        return cls(
+            failure_threshold=settings.CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+            recovery_timeout=settings.CIRCUIT_BREAKER_RECOVERY_TIMEOUT,
+            path_depth=settings.CIRCUIT_BREAKER_PATH_DEPTH,
+            overrides=settings.CIRCUIT_BREAKER_OVERRIDES,
+            logger=logger,
+        )
+
+    def key_for(self, url: str) -> str:
+        _parts = urlsplit(url)
+        _key = _parts.netloc.lower()
+        if self._path_depth:
+            _segments = [_segment for _segment in _parts.path.split("/") if _segment][: self._path_depth]
+            _key = "/".join([_key, *_segments])
+        return _key
+
+    def _override_for(self, host: str) -> dict:
+        _host = host.split(":")[0]
+        while _host:
+            if _host in self._overrides:
+                return self._overrides[_host]
+            _, _, _host = _host.partition(".")
+        return {}
+
+    def breaker_for(self, url: str) -> HostCircuitBreaker:
+        _key = self.key_for(url)
+        _breaker = self._breakers.get(_key)
+        if _breaker is None:
+            _override = self._override_for(_key.split("/")[0])
+            _breaker = self._breakers[_key] = HostCircuitBreaker(
+                failure_threshold=_override.get("failure_threshold", self._failure_threshold),
+                recovery_timeout=_override.get("recovery_timeout", self._recovery_timeout),
+                name=_key,
+            )
+            circuitbreaker.CircuitBreakerMonitor.register(_breaker)
+            if self._logger:
+                self._logger.debug(f"Circuit breaker created for {_key}")
+        return _breaker
+
+    def snapshot(self) -> list[dict]:
+        return [_breaker.to_dict() for _breaker in self._breakers.values()]
+
+
+CIRCUIT_BREAKERS = CircuitBreakerRegistry.from_settings(SETTINGS.CIRCUIT_BREAKER, logger=LOGGER)
@@ -1,42 +1,72 @@
+import codecs
+import inspect
 import json
+import time
 from functools import wraps
-from typing import Any, Callable, Dict, Tuple
+from http import HTTPStatus
+from typing import Any, Callable, Optional
 
 import circuitbreaker
 import httpx
 from retry_async import retry
 
+from src.core.conf.settings import SETTINGS
+from src.core.utils.api.circuit_breakers import CIRCUIT_BREAKERS
+from src.core.utils.api.fetch_cache import FETCH_CACHE, build_cache_key
+from src.core.utils.api.http_client import HTTP_CLIENTS
 from src.core.utils.api.http_exceptions import (
     BadGatewayException,
     RequestError,
+    ResponseTooLargeError,
     ServiceUnavailableException,
     TimeoutException,
+    UnsupportedContentTypeError,
 )
 from src.core.utils.api.logger import LOGGER
+from src.core.utils.base_dtos import BaseDto
+from src.core.utils.charset import SNIFF_BYTES, detect_charset, mime_type
 
-CACHE: Dict[Tuple[str, str], Any] = {}  # todo: move to redis or memcache
+STREAM_SETTINGS = SETTINGS.HTTP_CLIENT
 
 
-def cache_request(func: Callable[..., Any]) -> Callable[..., Any]:
+class StreamedResponseDto(BaseDto):
+    url: str
+    status_code: int
+    headers: dict[str, str]
+    content_type: str
+    encoding: str
+    size: int
+    elapsed: float
+    redirects: int = 0
+    text: Optional[str] = None
+
+
+def _cache_request(func: Callable[..., Any], dump=None, load=None) -> Callable[..., Any]:
     @wraps(func)
     async def wrapper(*args, **kwargs):
-        cache_key = (
-            kwargs.get("url", ""),
-            json.dumps(kwargs.get("params", {}), sort_keys=True),
-        )
-        if kwargs.get("cache", 0) == 1:
-            if cache_key in CACHE:
-                LOGGER.info(f"Returning from cache: {cache_key}")
-                return CACHE[cache_key]
-        response = await func(*args, **kwargs)
-        if kwargs.get("cache", 0) == 1:
-            LOGGER.info("Returning as normal request")
-            CACHE[cache_key] = response
-        return response
+        _ttl = kwargs.pop("cache_ttl", None)
+        if kwargs.get("cache", 0) != 1 or kwargs.get("on_chunk"):
+            return await func(*args, **kwargs)
+        cache_key = build_cache_key(f"{kwargs.get('base_url', '')}{kwargs.get('url', '')}", kwargs.get("params"))
+
+        async def _fetch():
+            _response = await func(*args, **kwargs)
+            return dump(_response) if dump else _response
+
+        _value = await FETCH_CACHE.get_or_fetch(cache_key, _fetch, ttl=_ttl)
+        return load(_value) if load else _value
 
     return wrapper
 
 
+def cache_request(func: Callable[..., Any]) -> Callable[..., Any]:
+    return _cache_request(func)
+
+
+def cache_streamed_request(func: Callable[..., Any]) -> Callable[..., Any]:
+    return _cache_request(func, dump=lambda r: r.model_dump(), load=StreamedResponseDto.model_validate)
+
+
 def handle_circuit_breaker_exception(func):
     async def wrapper(*args, **kwargs):
         try:
@@ -47,14 +77,7 @@ def handle_circuit_breaker_exception(func):
     return wrapper
 
 
-class CustomCircuitBreaker(circuitbreaker.CircuitBreaker):
-    FAILURE_THRESHOLD = 3
-    RECOVERY_TIMEOUT = 5
-    EXPECTED_EXCEPTION = Exception
-
-
 def request_exception_handler(func: Callable[..., Any]) -> Callable[..., Any]:
-    @CustomCircuitBreaker()
     @retry(
         exceptions=(ServiceUnavailableException, BadGatewayException, TimeoutException),
         tries=3,
@@ -62,17 +85,23 @@ def request_exception_handler(func: Callable[..., Any]) -> Callable[..., Any]:
         backoff=1,
         is_async=True,
     )
-    async def wrapper(*args, **kwargs):
+    async def _retrying(*args, **kwargs):
         try:
             return await func(*args, **kwargs)
         except httpx.HTTPStatusError as e:
+            if e.response.status_code >= 500:
+                raise BadGatewayException(message=f"Third Service responded with an error. REASON: {e}") from e
             raise RequestError(
                 message=f"Something went wrong. Problem likes network issue or server error. REASON: {e}",
             ) from e
-        except httpx.ConnectError as e:
-            raise ServiceUnavailableException(message=f"Third Service Unavailable. REASON: {e}") from e
-        except httpx.ConnectTimeout as e:
+        except httpx.TimeoutException as e:
             raise TimeoutException(message="Connection Timeout") from e
+        except httpx.TransportError as e:
+            raise ServiceUnavailableException(message=f"Third Service Unavailable. REASON: {e}") from e
+
+    async def wrapper(*args, **kwargs):
+        _breaker = CIRCUIT_BREAKERS.breaker_for(f"{kwargs.get('base_url', '')}{kwargs.get('url', '')}")
+        return await _breaker.call_guarded(_retrying, *args, **kwargs)
 
     return wrapper
 
@@ -80,9 +109,8 @@ def request_exception_handler(func: Callable[..., Any]) -> Callable[..., Any]:
 def run_request(func):
     @wraps(func)
     async def wrapper(*args, **kwargs):
-        async with httpx.AsyncClient() as client:
-            kwargs["client"] = client
-            kwargs["timeout"] = 3  # this is in seconds
+        async with HTTP_CLIENTS.host_slot(f"{kwargs.get('base_url', '')}{kwargs.get('url', '')}"):
+            kwargs["client"] = HTTP_CLIENTS.client()
             response: httpx.Response = await func(*args, **kwargs)
             response.raise_for_status()
             try:
@@ -100,9 +128,9 @@ def run_request(func):
 
 
 @handle_circuit_breaker_exception
+@cache_request
 @request_exception_handler
 @run_request
-@cache_request
 async def create_get_request(url, client, base_url, cache=0, **kwargs):
     LOGGER.info(f"Making GET request to {base_url}{url}")
     return await client.get(f"{base_url}{url}", **kwargs)
@@ -138,3 +166,101 @@ async def create_post_request(url, client, base_url, data=None, **kwargs):
 async def create_delete_request(url, client, base_url, **kwargs):
     LOGGER.info(f"Making DELETE request to {base_url}{url}")
     return await client.delete(f"{base_url}{url}", **kwargs)
+
+
+def _max_bytes_for(mime: str) -> int:
+    return STREAM_SETTINGS.HTTP_STREAM_MAX_BYTES.get(mime, STREAM_SETTINGS.HTTP_STREAM_DEFAULT_MAX_BYTES)
+
+
+async def _emit(on_chunk: Callable[[str], Any], text: str):
+    _result = on_chunk(text)
+    if inspect.isawaitable(_result):
+        await _result
+
+
+async def _read_body(
+    response: httpx.Response, url: str, limit: int, content_type: str, sink: Callable[[str], Any]
+) -> tuple[int, str]:
+    """Decode the body into `sink` as it arrives; returns its size in bytes and the detected charset."""
+    _size = 0
+    _head = bytearray()
+    _decoder = None
+    _encoding = ""
+    async for _chunk in response.aiter_bytes():
+        _size += len(_chunk)
+        if _size > limit:
+            raise ResponseTooLargeError(message=f"{url} exceeds {limit} bytes")
+        if _decoder is None:
+            _head.extend(_chunk)
+            if len(_head) < SNIFF_BYTES:
+                continue
+            _encoding = detect_charset(content_type, bytes(_head))
+            _decoder = codecs.getincrementaldecoder(_encoding)(errors="replace")
+            _chunk, _head = bytes(_head), bytearray()
+        _text = _decoder.decode(_chunk)
+        if _text:
+            await _emit(sink, _text)
+    if _decoder is None:
+        _encoding = detect_charset(content_type, bytes(_head))
+        _decoder = codecs.getincrementaldecoder(_encoding)(errors="replace")
+        _tail = _decoder.decode(bytes(_head), final=True)
+    else:
+        _tail = _decoder.decode(b"", final=True)
+    if _tail:
+        await _emit(sink, _tail)
+    return _size, _encoding
+
+
+@handle_circuit_breaker_exception
+@cache_streamed_request
+@request_exception_handler
+async def create_streaming_get_request(
+    url,
+    base_url,
+    on_chunk: Optional[Callable[[str], Any]] = None,
+    max_bytes: Optional[int] = None,
+    allowed_content_types: Optional[set[str]] = None,
+    cache=0,
+    **kwargs,
+) -> StreamedResponseDto:
+    """
+    GET a document without buffering the raw body.
+
+    The body is read through `client.stream`, rejected early when its content type is not allowed or it
+    outgrows the size cap for that type, and decoded incrementally (charset from BOM, header or `<meta>`).
+    Decoded text is passed to `on_chunk` as it arrives; without a callback it is joined into `text`.
+    A `304 Not Modified` answer to a conditional request is returned as is, with an empty body.
+    """
+    _full_url = f"{base_url}{url}"
+    _allowed = allowed_content_types or set(STREAM_SETTINGS.HTTP_STREAM_ALLOWED_CONTENT_TYPES)
+    LOGGER.info(f"Making streaming GET request to {_full_url}")
+    _parts: list[str] = []
+    async with HTTP_CLIENTS.host_slot(_full_url):
+        _started = time.perf_counter()
+        async with HTTP_CLIENTS.client().stream("GET", _full_url, **kwargs) as response:
+            if response.status_code == HTTPStatus.NOT_MODIFIED:
+                # answer to a conditional request, the caller keeps its stored copy
+                _mime, _size, _encoding = "", 0, ""
+            else:
+                response.raise_for_status()
+                _content_type = response.headers.get("content-type", "")
+                _mime = mime_type(_content_type)
+                if _mime and _mime not in _allowed:
+                    raise UnsupportedContentTypeError(message=f"Content type {_mime} is not allowed for {_full_url}")
+                _limit = max_bytes or _max_bytes_for(_mime)
+                _declared = response.headers.get("content-length")
+                if _declared and _declared.isdigit() and int(_declared) > _limit:
+                    raise ResponseTooLargeError(message=f"{_full_url} declares {_declared} bytes, limit is {_limit}")
+                _size, _encoding = await _read_body(response, _full_url, _limit, _content_type, on_chunk or _parts.append)
+
+        return StreamedResponseDto(
+            url=str(response.url),
+            status_code=response.status_code,
+            headers=dict(response.headers),
+            content_type=_mime,
+            encoding=_encoding,
+            size=_size,
+            elapsed=time.perf_counter() - _started,
+            redirects=len(response.history),
+            text=None if on_chunk else "".join(_parts),
+        )
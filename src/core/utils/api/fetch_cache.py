@@ -0,0 +1,254 @@
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Any, Optional, Protocol
+
+from src.core.conf.settings import SETTINGS, FetchCacheSettings
+from src.core.utils.api.logger import LOGGER
+
+_BYTES_PREFIX = b"b"
+_JSON_PREFIX = b"j"
+
+
+def build_cache_key(url: str, params: Optional[dict] = None) -> str:
+    _raw = f"{url}|{json.dumps(params or {}, sort_keys=True)}"
+    return hashlib.sha256(_raw.encode()).hexdigest()
+
+
+def encode_cache_value(value: Any) -> bytes:
+    if isinstance(value, bytes):
+        return _BYTES_PREFIX + value
+    return _JSON_PREFIX + json.dumps(value).encode()
+
+
+def decode_cache_value(payload: bytes) -> Any:
+    if payload[:1] == _BYTES_PREFIX:
+        return payload[1:]
+    return json.loads(payload[1:])
+
+
+@dataclass
+class FetchCacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    entries: int = 0
+    total_bytes: int = 0
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+class FetchCacheBackend(Protocol):
+    async def get(self, key: str) -> Optional[bytes]: ...
+
+    async def set(self, key: str, payload: bytes, ttl: float) -> None: ...
+
+    async def stats(self) -> FetchCacheStats: ...
+
+
+class InMemoryFetchCache:
+    """LRU cache bounded by the total size of stored payloads, local to the current process."""
+
+    def __init__(self, max_bytes: int):
+        self._max_bytes = max_bytes
+        self._entries: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+        self._total_bytes = 0
+        self._stats = FetchCacheStats()
+
+    def _drop(self, key: str) -> None:
+        _, _payload = self._entries.pop(key)
+        self._total_bytes -= len(_payload)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        _entry = self._entries.get(key)
+        if _entry is None:
+            self._stats.misses += 1
+            return None
+        _expires_at, _payload = _entry
+        if _expires_at <= time.monotonic():
+            self._drop(key)
+            self._stats.expirations += 1
+            self._stats.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self._stats.hits += 1
+        return _payload
+
+    async def set(self, key: str, payload: bytes, ttl: float) -> None:
+        if len(payload) > self._max_bytes:
+            return
+        if key in self._entries:
+            self._drop(key)
+        self._entries[key] = (time.monotonic() + ttl, payload)
+        self._total_bytes += len(payload)
+        while self._total_bytes > self._max_bytes:
+            self._drop(next(iter(self._entries)))
+            self._stats.evictions += 1
+
+    async def stats(self) -> FetchCacheStats:
+        self._stats.entries = len(self._entries)
+        self._stats.total_bytes = self._total_bytes
+        return self._stats
+
+
+class SqliteFetchCache:
+    """
+    LRU cache stored in a local SQLite file, so every uvicorn/faststream worker on the host shares it.
+    Hit/miss/eviction counters are tracked per process.
+    """
+
+    _SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS fetch_cache ("
+        "key TEXT PRIMARY KEY, payload BLOB NOT NULL, size INTEGER NOT NULL, "
+        "expires_at REAL NOT NULL, accessed_at REAL NOT NULL)",
+        "CREATE INDEX IF NOT EXISTS ix_fetch_cache_accessed_at ON fetch_cache (accessed_at)",
+    )
+    _EVICT_CHUNK = 32
+
+    def __init__(self, path: str, max_bytes: int):
+        self._path = path
+        self._max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+        self._stats = FetchCacheStats()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self._connection = sqlite3.connect(self._path, timeout=5, check_same_thread=False, isolation_level=None)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            for _stmt in self._SCHEMA:
+                self._connection.execute(_stmt)
+        return self._connection
+
+    def _get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            _conn = self._connect()
+            _row = _conn.execute("SELECT payload, expires_at FROM fetch_cache WHERE key = ?", (key,)).fetchone()
+            if _row is None:
+                self._stats.misses += 1
+                return None
+            _payload, _expires_at = _row
+            _now = time.time()
+            if _expires_at <= _now:
+                _conn.execute("DELETE FROM fetch_cache WHERE key = ?", (key,))
+                self._stats.expirations += 1
+                self._stats.misses += 1
+                return None
+            _conn.execute("UPDATE fetch_cache SET accessed_at = ? WHERE key = ?", (_now, key))
+            self._stats.hits += 1
+            return _payload
+
+    def _set(self, key: str, payload: bytes, ttl: float) -> None:
+        if len(payload) > self._max_bytes:
+            return
+        with self._lock:
+            _conn = self._connect()
+            _now = time.time()
+            _conn.execute("BEGIN IMMEDIATE")
+            try:
+                _conn.execute(
+                    "INSERT OR REPLACE INTO fetch_cache (key, payload, size, expires_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                    (key, payload, len(payload), _now + ttl, _now),
+                )
+                _conn.execute("DELETE FROM fetch_cache WHERE expires_at <= ?", (_now,))
+                (_total,) = _conn.execute("SELECT COALESCE(SUM(size), 0) FROM fetch_cache").fetchone()
+                while _total > self._max_bytes:
+                    _victims = _conn.execute(
+                        "SELECT key, size FROM fetch_cache ORDER BY accessed_at LIMIT ?", (self._EVICT_CHUNK,)
+                    ).fetchall()
+                    for _victim_key, _size in _victims:
+                        _conn.execute("DELETE FROM fetch_cache WHERE key = ?", (_victim_key,))
+                        self._stats.evictions += 1
+                        _total -= _size
+                        if _total <= self._max_bytes:
+                            break
+                _conn.execute("COMMIT")
+            except Exception:
+                _conn.execute("ROLLBACK")
+                raise
+
+    def _read_stats(self) -> FetchCacheStats:
+        with self._lock:
+            _entries, _total = self._connect().execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM fetch_cache").fetchone()
+        self._stats.entries = _entries
+        self._stats.total_bytes = _total
+        return self._stats
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await asyncio.to_thread(self._get, key)
+
+    async def set(self, key: str, payload: bytes, ttl: float) -> None:
+        await asyncio.to_thread(self._set, key, payload, ttl)
+
+    async def stats(self) -> FetchCacheStats:
+        return await asyncio.to_thread(self._read_stats)
+
+
+class FetchCache:
+    """
+    Front for a `FetchCacheBackend` that encodes values and collapses concurrent
+    misses for the same key into a single upstream request.
+    """
+
+    def __init__(self, backend: FetchCacheBackend, default_ttl: float, logger=None):
+        self._backend = backend
+        self._default_ttl = default_ttl
+        self._in_flight: dict[str, asyncio.Future] = {}
+        self._logger = logger
+
+    async def get(self, key: str) -> tuple[bool, Any]:
+        _payload = await self._backend.get(key)
+        if _payload is None:
+            return False, None
+        return True, decode_cache_value(_payload)
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        await self._backend.set(key, encode_cache_value(value), ttl if ttl is not None else self._default_ttl)
+
+    async def get_or_fetch(self, key: str, fetch, ttl: Optional[float] = None) -> Any:
+        _found, _value = await self.get(key)
+        if _found:
+            if self._logger:
+                self._logger.info(f"Returning from cache: {key}")
+            return _value
+        _pending = self._in_flight.get(key)
+        if _pending is not None:
+            return await asyncio.shield(_pending)
+        _future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = _future
+        try:
+            _value = await fetch()
+            await self.set(key, _value, ttl)
+            _future.set_result(_value)
+            return _value
+        except asyncio.CancelledError:
+            _future.cancel()
+            raise
+        except Exception as e:
+            _future.set_exception(e)
+            _future.exception()  # mark as retrieved when nobody else is waiting
+            raise
+        finally:
+            self._in_flight.pop(key, None)
+
+    async def stats(self) -> FetchCacheStats:
+        return await self._backend.stats()
+
+
+def create_fetch_cache(settings: FetchCacheSettings, logger=None) -> FetchCache:
+    if settings.FETCH_CACHE_BACKEND == "sqlite":
+        _backend: FetchCacheBackend = SqliteFetchCache(settings.FETCH_CACHE_SQLITE_PATH, settings.FETCH_CACHE_MAX_BYTES)
+    else:
+        _backend = InMemoryFetchCache(settings.FETCH_CACHE_MAX_BYTES)
+    return FetchCache(_backend, default_ttl=settings.FETCH_CACHE_TTL, logger=logger)
+
+
+FETCH_CACHE = create_fetch_cache(SETTINGS.FETCH_CACHE, logger=LOGGER)
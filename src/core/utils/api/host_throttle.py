@@ -0,0 +1,157 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import AsyncGenerator
+from urllib.parse import urlsplit
+
+import httpx
+
+from src.core.conf.settings import CrawlerSettings
+from src.core.utils.api.circuit_breakers import HostCircuitBreaker
+
+
+def is_host_failure(exception: BaseException) -> bool:
+    """
+    Same rule as `HostCircuitBreaker`: transport errors, timeouts and 5xx responses say the host is
+    struggling; a 4xx or a body rejected for its type or size is a problem of the page only.
+    """
+    if isinstance(exception, httpx.HTTPStatusError):
+        return exception.response.status_code >= 500
+    return isinstance(exception, (httpx.TransportError, *HostCircuitBreaker.EXPECTED_EXCEPTION))
+
+
+@dataclass
+class HostState:
+    tokens: float
+    concurrency: float
+    refilled_at: float = field(default_factory=time.monotonic)
+    in_flight: int = 0
+    latency: float = 0.0
+    successes: int = 0
+    failures: int = 0
+    condition: asyncio.Condition = field(default_factory=asyncio.Condition)
+
+
+class HostThrottle:
+    """
+    Per-host politeness scheduler for outbound fetches.
+
+    Every host gets its own token bucket (requests per second + burst) and an in-flight cap.
+    The cap grows additively while the host answers fast and is cut multiplicatively on slow
+    responses or host failures (AIMD), so fragile sites are backed off while healthy ones run at full
+    speed. Requests that fail for any other reason (see `is_host_failure`) leave the host's state as is.
+    It is the only per-host limit: `HttpClientRegistry.host_slot` takes a slot around each network
+    request, so responses served from the fetch cache never consume a token.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int,
+        initial_concurrency: int,
+        min_concurrency: int,
+        max_concurrency: int,
+        target_latency: float,
+        backoff_factor: float,
+        logger=None,
+    ):
+        self._rate = rate
+        self._burst = burst
+        self._initial_concurrency = initial_concurrency
+        self._min_concurrency = min_concurrency
+        self._max_concurrency = max_concurrency
+        self._target_latency = target_latency
+        self._backoff_factor = backoff_factor
+        self._hosts: dict[str, HostState] = {}
+        self._logger = logger
+
+    @classmethod
+    def from_settings(cls, settings: CrawlerSettings, logger=None) -> "HostThrottle":
+        return cls(
+            rate=settings.CRAWL_HOST_RATE,
+            burst=settings.CRAWL_HOST_BURST,
+            initial_concurrency=settings.CRAWL_HOST_INITIAL_CONCURRENCY,
+            min_concurrency=settings.CRAWL_HOST_MIN_CONCURRENCY,
+            max_concurrency=settings.CRAWL_HOST_MAX_CONCURRENCY,
+            target_latency=settings.CRAWL_HOST_TARGET_LATENCY,
+            backoff_factor=settings.CRAWL_HOST_BACKOFF_FACTOR,
+            logger=logger,
+        )
+
+    @staticmethod
+    def host_of(url: str) -> str:
+        return urlsplit(url).netloc.lower()
+
+    def _state(self, host: str) -> HostState:
+        _state = self._hosts.get(host)
+        if _state is None:
+            _state = self._hosts[host] = HostState(tokens=float(self._burst), concurrency=float(self._initial_concurrency))
+        return _state
+
+    def _refill(self, state: HostState) -> None:
+        _now = time.monotonic()
+        state.tokens = min(float(self._burst), state.tokens + (_now - state.refilled_at) * self._rate)
+        state.refilled_at = _now
+
+    async def _acquire(self, state: HostState) -> None:
+        async with state.condition:
+            await state.condition.wait_for(lambda: state.in_flight < int(state.concurrency))
+            state.in_flight += 1
+        try:
+            while True:
+                self._refill(state)
+                if state.tokens >= 1:
+                    state.tokens -= 1
+                    return
+                await asyncio.sleep((1 - state.tokens) / self._rate)
+        except BaseException:
+            await self._release(state)
+            raise
+
+    async def _release(self, state: HostState) -> None:
+        async with state.condition:
+            state.in_flight -= 1
+            state.condition.notify_all()
+
+    def _record(self, host: str, state: HostState, latency: float, failed: bool) -> None:
+        state.latency = latency if not state.latency else 0.8 * state.latency + 0.2 * latency
+        if failed or state.latency > self._target_latency:
+            state.failures += int(failed)
+            _concurrency = max(float(self._min_concurrency), state.concurrency * self._backoff_factor)
+            if self._logger and int(_concurrency) < int(state.concurrency):
+                self._logger.info(f"Backing off {host}: concurrency {int(_concurrency)}, latency {state.latency:0.3f}s")
+            state.concurrency = _concurrency
+        else:
+            state.successes += 1
+            state.concurrency = min(float(self._max_concurrency), state.concurrency + 1 / state.concurrency)
+
+    @asynccontextmanager
+    async def slot(self, url: str) -> AsyncGenerator[None, None]:
+        _host = self.host_of(url)
+        _state = self._state(_host)
+        await self._acquire(_state)
+        _started = time.perf_counter()
+        try:
+            yield
+        except BaseException as e:
+            if is_host_failure(e):
+                self._record(_host, _state, time.perf_counter() - _started, failed=True)
+            raise
+        else:
+            self._record(_host, _state, time.perf_counter() - _started, failed=False)
+        finally:
+            await self._release(_state)
+
+    def snapshot(self) -> dict[str, dict]:
+        return {
+            _host: {
+                "concurrency": int(_state.concurrency),
+                "in_flight": _state.in_flight,
+                "tokens": round(_state.tokens, 2),
+                "latency": round(_state.latency, 4),
+                "successes": _state.successes,
+                "failures": _state.failures,
+            }
+            for _host, _state in self._hosts.items()
+        }
@@ -0,0 +1,98 @@
+from contextlib import asynccontextmanager
+from typing import AsyncGenerator, Optional
+
+import httpx
+
+from src.core.conf.settings import SETTINGS, HttpClientSettings
+from src.core.utils.api.host_throttle import HostThrottle
+from src.core.utils.api.logger import LOGGER
+
+DEFAULT_CLIENT = "default"
+
+
+class HttpClientRegistry:
+    """
+    Process-wide registry of pooled `httpx.AsyncClient` instances.
+
+    Clients are created once (on application startup or lazily on first use) and reused
+    by every outbound request, so connections to the same host stay warm between calls.
+    """
+
+    def __init__(
+        self,
+        max_connections: int,
+        max_keepalive_connections: int,
+        throttle: HostThrottle,
+        keepalive_expiry: float,
+        http2: bool,
+        timeout: float,
+        connect_timeout: float,
+        max_redirects: int,
+        logger=None,
+    ):
+        self._limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self._timeout = httpx.Timeout(timeout, connect=connect_timeout)
+        self._http2 = http2
+        self._max_redirects = max_redirects
+        self._throttle = throttle
+        self._clients: dict[str, httpx.AsyncClient] = {}
+        self._logger = logger
+
+    @classmethod
+    def from_settings(cls, settings: HttpClientSettings, throttle: HostThrottle, logger=None) -> "HttpClientRegistry":
+        return cls(
+            max_connections=settings.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            throttle=throttle,
+            keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+            http2=settings.HTTP_HTTP2,
+            timeout=settings.HTTP_TIMEOUT,
+            connect_timeout=settings.HTTP_CONNECT_TIMEOUT,
+            max_redirects=settings.HTTP_MAX_REDIRECTS,
+            logger=logger,
+        )
+
+    def _create_client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            limits=self._limits, timeout=self._timeout, http2=self._http2, max_redirects=self._max_redirects
+        )
+
+    async def start(self, *names: str) -> None:
+        for _name in names or (DEFAULT_CLIENT,):
+            self.client(_name)
+        if self._logger:
+            self._logger.info(f"HTTP clients started: {list(self._clients)}")
+
+    def client(self, name: str = DEFAULT_CLIENT) -> httpx.AsyncClient:
+        _client = self._clients.get(name)
+        if _client is None or _client.is_closed:
+            _client = self._clients[name] = self._create_client()
+        return _client
+
+    @property
+    def throttle(self) -> HostThrottle:
+        return self._throttle
+
+    @asynccontextmanager
+    async def host_slot(self, url: str) -> AsyncGenerator[None, None]:
+        """Throttle slot for one network request to the host of `url`."""
+        async with self._throttle.slot(url):
+            yield
+
+    async def dispose(self, name: Optional[str] = None) -> None:
+        _names = [name] if name else list(self._clients)
+        for _name in _names:
+            _client = self._clients.pop(_name, None)
+            if _client is not None:
+                await _client.aclose()
+        if self._logger:
+            self._logger.info(f"HTTP clients disposed: {_names}")
+
+
+HTTP_CLIENTS = HttpClientRegistry.from_settings(
+    SETTINGS.HTTP_CLIENT, throttle=HostThrottle.from_settings(SETTINGS.CRAWLER, logger=LOGGER), logger=LOGGER
+)
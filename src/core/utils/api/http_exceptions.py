@@ -101,6 +101,16 @@ class TimeoutException(ServiceException):
     code = "TIMEOUT"
 
 
+class ResponseTooLargeError(RequestError):
+    message = "Response body exceeds the allowed size"
+    code = "RESPONSE_TOO_LARGE"
+
+
+class UnsupportedContentTypeError(RequestError):
+    message = "Response content type is not supported"
+    code = "UNSUPPORTED_CONTENT_TYPE"
+
+
 def pydantic_error_to_str(_errors):
     _errors = _errors.errors()
     _error_msg = [f"{_error['loc']}: {_error['msg']}" for _error in _errors]
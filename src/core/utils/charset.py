@@ -0,0 +1,50 @@
+import codecs
+import re
+from typing import Optional
+
+DEFAULT_CHARSET = "utf-8"
+SNIFF_BYTES = 2048
+
+_CONTENT_TYPE_CHARSET = re.compile(r"charset\s*=\s*[\"']?([\w.:-]+)", re.IGNORECASE)
+_META_CHARSET = re.compile(rb"<meta[^>]+charset\s*=\s*[\"']?\s*([\w.:-]+)", re.IGNORECASE)
+_XML_ENCODING = re.compile(rb"<\?xml[^>]+encoding\s*=\s*[\"']([\w.:-]+)", re.IGNORECASE)
+_BOMS = (
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+
+
+def normalize_charset(name: Optional[str]) -> Optional[str]:
+    if not name:
+        return None
+    try:
+        return codecs.lookup(name.strip()).name
+    except LookupError:
+        return None
+
+
+def charset_from_content_type(content_type: Optional[str]) -> Optional[str]:
+    _match = _CONTENT_TYPE_CHARSET.search(content_type or "")
+    return normalize_charset(_match.group(1)) if _match else None
+
+
+def sniff_charset(head: bytes) -> Optional[str]:
+    for _bom, _name in _BOMS:
+        if head.startswith(_bom):
+            return _name
+    _head = head[:SNIFF_BYTES]
+    _match = _XML_ENCODING.search(_head) or _META_CHARSET.search(_head)
+    return normalize_charset(_match.group(1).decode("ascii", "ignore")) if _match else None
+
+
+def detect_charset(content_type: Optional[str], head: bytes, default: str = DEFAULT_CHARSET) -> str:
+    """Resolve the document charset: byte order mark, then HTTP header, then `<meta>`/XML declaration."""
+    for _bom, _name in _BOMS:
+        if head.startswith(_bom):
+            return _name
+    return charset_from_content_type(content_type) or sniff_charset(head) or default
+
+
+def mime_type(content_type: Optional[str]) -> str:
+    return (content_type or "").split(";")[0].strip().lower()
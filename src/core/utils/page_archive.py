@@ -0,0 +1,205 @@
+import asyncio
+import hashlib
+import mmap
+import os
+import struct
+import threading
+from dataclasses import dataclass
+from typing import BinaryIO, Optional
+
+import zstandard
+
+from src.core.conf.settings import SETTINGS, PageArchiveSettings
+from src.core.utils.api.logger import LOGGER
+
+SEGMENT_SUFFIX = ".seg"
+INDEX_SUFFIX = ".idx"
+
+# segment record: sha256 digest + compressed length, followed by the zstd frame
+_RECORD_HEADER = struct.Struct(">32sI")
+# index entry: sha256 digest + offset of the zstd frame + compressed length
+_INDEX_ENTRY = struct.Struct(">32sQI")
+
+
+@dataclass(frozen=True)
+class BlobPointer:
+    """Location of an archived page; its string form is what gets stored on `Url` and sent over RMQ."""
+
+    digest: str
+    segment: str
+    offset: int
+    length: int
+
+    def __str__(self) -> str:
+        return f"{self.segment}:{self.offset}:{self.length}:{self.digest}"
+
+    @classmethod
+    def parse(cls, value: str) -> "BlobPointer":
+        _segment, _offset, _length, _digest = value.rsplit(":", 3)
+        return cls(digest=_digest, segment=_segment, offset=int(_offset), length=int(_length))
+
+
+class PageArchive:
+    """
+    Content-addressed store for fetched pages.
+
+    Bodies are keyed by their sha256, compressed with zstd and appended to segment files that
+    belong to the writing process (`<pid>-<seq>.seg`), so uvicorn and faststream workers never
+    contend for the same file. Every segment has a fixed-width `.idx` sidecar. Writes deduplicate
+    only against the segment this process is appending to, so a put never touches other files and
+    the in-memory index is bounded by one segment; `find` scans the other sidecars on a miss.
+    Reads go straight to the pointed offset through a memory map of the segment.
+
+    Blob pointers cross processes and containers, so `directory` must be shared by all of them.
+    """
+
+    def __init__(self, directory: str, segment_max_bytes: int, compression_level: int = 3, logger=None):
+        self._directory = directory
+        self._segment_max_bytes = segment_max_bytes
+        self._compressor = zstandard.ZstdCompressor(level=compression_level)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._index: dict[bytes, BlobPointer] = {}  # records of the segment being appended to
+        self._maps: dict[str, mmap.mmap] = {}
+        self._writer: Optional[tuple[str, BinaryIO, BinaryIO]] = None
+        self._writer_pid: Optional[int] = None
+        self._sequence = 0
+        self._logger = logger
+
+    @classmethod
+    def from_settings(cls, settings: PageArchiveSettings, logger=None) -> "PageArchive":
+        return cls(
+            directory=settings.PAGE_ARCHIVE_DIR,
+            segment_max_bytes=settings.PAGE_ARCHIVE_SEGMENT_MAX_BYTES,
+            compression_level=settings.PAGE_ARCHIVE_COMPRESSION_LEVEL,
+            logger=logger,
+        )
+
+    def _path(self, segment: str, suffix: str) -> str:
+        return os.path.join(self._directory, segment + suffix)
+
+    def _scan_index(self, digest: bytes) -> Optional[BlobPointer]:
+        """Look `digest` up in the sidecars of every segment, including other processes' ones."""
+        if not os.path.isdir(self._directory):
+            return None
+        for _name in os.listdir(self._directory):
+            if not _name.endswith(INDEX_SUFFIX):
+                continue
+            _segment = _name[: -len(INDEX_SUFFIX)]
+            with open(self._path(_segment, INDEX_SUFFIX), "rb") as _file:
+                _raw = _file.read()
+            _usable = len(_raw) - len(_raw) % _INDEX_ENTRY.size  # ignore a half-written trailing entry
+            for _digest, _offset, _length in _INDEX_ENTRY.iter_unpack(_raw[:_usable]):
+                if _digest == digest:
+                    return BlobPointer(digest=_digest.hex(), segment=_segment, offset=_offset, length=_length)
+        return None
+
+    def _open_writer(self) -> tuple[str, BinaryIO, BinaryIO]:
+        _pid = os.getpid()
+        if self._writer is not None and self._writer_pid == _pid:
+            _segment, _data, _idx = self._writer
+            if _data.tell() < self._segment_max_bytes:
+                return self._writer
+            _data.close()
+            _idx.close()
+        self._index.clear()
+        os.makedirs(self._directory, exist_ok=True)
+        while True:
+            self._sequence += 1
+            _segment = f"{_pid}-{self._sequence:06d}"
+            if not os.path.exists(self._path(_segment, SEGMENT_SUFFIX)):
+                break
+        self._writer = (
+            _segment,
+            open(self._path(_segment, SEGMENT_SUFFIX), "ab"),
+            open(self._path(_segment, INDEX_SUFFIX), "ab"),
+        )
+        self._writer_pid = _pid
+        if self._logger:
+            self._logger.info(f"Page archive segment opened: {_segment}")
+        return self._writer
+
+    def _put(self, data: bytes) -> BlobPointer:
+        _digest = hashlib.sha256(data).digest()
+        with self._lock:
+            _segment, _data, _idx = self._open_writer()
+            _pointer = self._index.get(_digest)
+            if _pointer is not None:
+                return _pointer
+            _frame = self._compressor.compress(data)
+            _offset = _data.tell() + _RECORD_HEADER.size
+            _data.write(_RECORD_HEADER.pack(_digest, len(_frame)) + _frame)
+            _data.flush()
+            # the index entry is written only once the record is on disk, so it never points past the data
+            _idx.write(_INDEX_ENTRY.pack(_digest, _offset, len(_frame)))
+            _idx.flush()
+            _pointer = self._index[_digest] = BlobPointer(
+                digest=_digest.hex(), segment=_segment, offset=_offset, length=len(_frame)
+            )
+            return _pointer
+
+    def _read(self, pointer: BlobPointer) -> bytes:
+        _end = pointer.offset + pointer.length
+        with self._lock:
+            _map = self._maps.get(pointer.segment)
+            if _map is None or len(_map) < _end:
+                if _map is not None:
+                    _map.close()  # the segment grew since it was mapped
+                with open(self._path(pointer.segment, SEGMENT_SUFFIX), "rb") as _file:
+                    _map = self._maps[pointer.segment] = mmap.mmap(_file.fileno(), 0, access=mmap.ACCESS_READ)
+            return _map[pointer.offset : _end]
+
+    def _decompressor(self) -> zstandard.ZstdDecompressor:
+        _decompressor = getattr(self._local, "decompressor", None)
+        if _decompressor is None:
+            _decompressor = self._local.decompressor = zstandard.ZstdDecompressor()
+        return _decompressor
+
+    def read(self, pointer: BlobPointer | str) -> bytes:
+        """Blocking read, for callers that are not on the event loop (e.g. process pool workers)."""
+        if isinstance(pointer, str):
+            pointer = BlobPointer.parse(pointer)
+        _data = self._decompressor().decompress(self._read(pointer))
+        if hashlib.sha256(_data).hexdigest() != pointer.digest:
+            raise ValueError(f"Archived page {pointer} is corrupted")
+        return _data
+
+    def read_text(self, pointer: BlobPointer | str) -> str:
+        return self.read(pointer).decode()
+
+    def _find(self, digest: str) -> Optional[BlobPointer]:
+        _digest = bytes.fromhex(digest)
+        with self._lock:
+            _pointer = self._index.get(_digest)
+        return _pointer or self._scan_index(_digest)
+
+    async def put(self, data: bytes) -> BlobPointer:
+        return await asyncio.to_thread(self._put, data)
+
+    async def put_text(self, text: str) -> BlobPointer:
+        return await self.put(text.encode())
+
+    async def get(self, pointer: BlobPointer | str) -> bytes:
+        return await asyncio.to_thread(self.read, pointer)
+
+    async def get_text(self, pointer: BlobPointer | str) -> str:
+        return (await self.get(pointer)).decode()
+
+    async def find(self, digest: str) -> Optional[BlobPointer]:
+        return await asyncio.to_thread(self._find, digest)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._writer is not None:
+                _, _data, _idx = self._writer
+                _data.close()
+                _idx.close()
+                self._writer = None
+            for _map in self._maps.values():
+                _map.close()
+            self._maps.clear()
+        if self._logger:
+            self._logger.info("Page archive closed")
+
+
+PAGE_ARCHIVE = PageArchive.from_settings(SETTINGS.PAGE_ARCHIVE, logger=LOGGER)
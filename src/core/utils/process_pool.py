@@ -0,0 +1,81 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional
+
+from src.core.conf.settings import SETTINGS, ProcessPoolSettings
+from src.core.utils.api.logger import LOGGER
+
+DEFAULT_POOL = "default"
+
+
+class ProcessPoolRegistry:
+    """
+    Process-wide registry of named `ProcessPoolExecutor`s for CPU-bound work (HTML parsing,
+    link extraction) that must not run on the event loop of the API or the RMQ consumers.
+
+    Pools are created on startup or lazily on first use; a pool whose worker died is dropped
+    and transparently recreated by the next call.
+    """
+
+    def __init__(
+        self,
+        default_max_workers: int,
+        max_workers: Optional[dict[str, int]] = None,
+        start_method: str = "spawn",
+        logger=None,
+    ):
+        self._default_max_workers = default_max_workers
+        self._max_workers = max_workers or {}
+        self._context = multiprocessing.get_context(start_method)
+        self._pools: dict[str, ProcessPoolExecutor] = {}
+        self._logger = logger
+
+    @classmethod
+    def from_settings(cls, settings: ProcessPoolSettings, logger=None) -> "ProcessPoolRegistry":
+        return cls(
+            default_max_workers=settings.PROCESS_POOL_DEFAULT_MAX_WORKERS,
+            max_workers=settings.PROCESS_POOL_MAX_WORKERS,
+            start_method=settings.PROCESS_POOL_START_METHOD,
+            logger=logger,
+        )
+
+    async def start(self, *names: str) -> None:
+        for _name in names or (DEFAULT_POOL,):
+            self.pool(_name)
+        if self._logger:
+            self._logger.info(f"Process pools started: {list(self._pools)}")
+
+    def max_workers(self, name: str = DEFAULT_POOL) -> int:
+        return self._max_workers.get(name, self._default_max_workers)
+
+    def pool(self, name: str = DEFAULT_POOL) -> ProcessPoolExecutor:
+        _pool = self._pools.get(name)
+        if _pool is None:
+            _pool = self._pools[name] = ProcessPoolExecutor(max_workers=self.max_workers(name), mp_context=self._context)
+        return _pool
+
+    async def run(self, func: Callable, *args: Any, pool: str = DEFAULT_POOL) -> Any:
+        _pool = self.pool(pool)
+        try:
+            return await asyncio.get_running_loop().run_in_executor(_pool, func, *args)
+        except BrokenProcessPool:
+            if self._pools.get(pool) is _pool:
+                del self._pools[pool]
+                _pool.shutdown(wait=False, cancel_futures=True)
+            if self._logger:
+                self._logger.warning(f"Process pool {pool} is broken, it will be recreated")
+            raise
+
+    async def dispose(self, name: Optional[str] = None) -> None:
+        _names = [name] if name else list(self._pools)
+        for _name in _names:
+            _pool = self._pools.pop(_name, None)
+            if _pool is not None:
+                await asyncio.to_thread(_pool.shutdown, wait=True, cancel_futures=True)
+        if self._logger:
+            self._logger.info(f"Process pools disposed: {_names}")
+
+
+PROCESS_POOLS = ProcessPoolRegistry.from_settings(SETTINGS.PROCESS_POOL, logger=LOGGER)
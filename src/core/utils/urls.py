@@ -0,0 +1,56 @@
+import hashlib
+import re
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+# analytics / click ids that never change the page they are appended to
+_TRACKING_PARAM_RE = re.compile(r"^(?:utm_\w+|fbclid|gclid|dclid|yclid|msclkid|mc_cid|mc_eid|igshid|_ga|_gl)$", re.IGNORECASE)
+
+
+def domain_of(url: str) -> str:
+    _host = (urlsplit(url).hostname or "").lower()
+    return _host[4:] if _host.startswith("www.") else _host
+
+
+def is_same_site(url: str, domain: str) -> bool:
+    """`url` is served by `domain` or by one of its subdomains."""
+    _domain = domain_of(url)
+    return _domain == domain or _domain.endswith(f".{domain}")
+
+
+def normalize_url(url: str) -> str:
+    """
+    Canonical spelling of an absolute url: lowercase scheme and host, no default port, no
+    fragment, no tracking parameters and `/` for an empty path. Everything else is kept as is.
+    This is the url that is stored and fetched, so the host keeps its `www.`; see `url_hash`.
+    """
+    _parts = urlsplit(url.strip())
+    _scheme = _parts.scheme.lower()
+    _netloc = (_parts.hostname or "").lower()
+    if ":" in _netloc:
+        _netloc = f"[{_netloc}]"
+    if _parts.port and _parts.port != _DEFAULT_PORTS.get(_scheme):
+        _netloc = f"{_netloc}:{_parts.port}"
+    _query = _parts.query
+    if _query:
+        _params = parse_qsl(_query, keep_blank_values=True)
+        _kept = [(_key, _value) for _key, _value in _params if not _TRACKING_PARAM_RE.match(_key)]
+        if len(_kept) != len(_params):
+            _query = urlencode(_kept)
+    return urlunsplit((_scheme, _netloc, _parts.path or "/", _query, ""))
+
+
+def url_hash(url: str) -> bytes:
+    """
+    Fixed width lookup and dedup key of a url: sha256 of its normalized form with a leading `www.`
+    dropped from the host (as in `domain_of`), so both spellings of a page share one row.
+    """
+    try:
+        _url = normalize_url(url)
+    except ValueError:  # not a parsable url, hash it as is
+        _url = url.strip()
+    else:
+        _scheme, _, _rest = _url.partition("://")
+        if _rest.startswith("www."):
+            _url = f"{_scheme}://{_rest[4:]}"
+    return hashlib.sha256(_url.encode()).digest()
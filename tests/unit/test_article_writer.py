@@ -0,0 +1,59 @@
+import asyncio
+import datetime
+from types import SimpleNamespace
+
+import pytest
+
+from src.app.crawler.writer import ArticleWriter
+
+_NOW = datetime.datetime(2026, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+class _FakeWriter(ArticleWriter):
+    """Fails every transaction that holds one of the `broken` urls."""
+
+    def __init__(self, broken: set[int]):
+        super().__init__(uow=None, batch_size=3, flush_interval=10)
+        self.broken = broken
+        self.transactions: list[list[int]] = []
+
+    async def write(self, articles, published_fallback) -> None:
+        _url_ids = [_article.url_id for _article in articles]
+        self.transactions.append(_url_ids)
+        if self.broken.intersection(_url_ids):
+            raise ValueError(f"bad article in {_url_ids}")
+
+
+async def _submit_all(writer: ArticleWriter, url_ids: list[int]) -> list:
+    return await asyncio.gather(
+        *(writer.submit(SimpleNamespace(url_id=_url_id), _NOW) for _url_id in url_ids), return_exceptions=True
+    )
+
+
+def test_batch_is_written_in_one_transaction():
+    _writer = _FakeWriter(broken=set())
+
+    assert asyncio.run(_submit_all(_writer, [1, 2, 3])) == [None, None, None]
+    assert _writer.transactions == [[1, 2, 3]]
+
+
+def test_failed_batch_falls_back_to_one_article_per_transaction():
+    _writer = _FakeWriter(broken={2})
+
+    _results = asyncio.run(_submit_all(_writer, [1, 2, 3]))
+
+    assert _results[0] is None and _results[2] is None
+    assert isinstance(_results[1], ValueError)
+    assert _writer.transactions == [[1, 2, 3], [1], [2], [3]]
+
+
+def test_single_article_batch_is_not_retried():
+    _writer = _FakeWriter(broken={1})
+
+    async def _run():
+        await _writer.submit(SimpleNamespace(url_id=1), _NOW)
+
+    _writer._batch_size = 1
+    with pytest.raises(ValueError):
+        asyncio.run(_run())
+    assert _writer.transactions == [[1]]
@@ -0,0 +1,36 @@
+import asyncio
+
+import pytest
+
+from src.core.utils.api.circuit_breakers import HostCircuitBreaker
+from src.core.utils.api.http_exceptions import BadGatewayException, RequestError
+
+
+def _call(breaker: HostCircuitBreaker, exception: Exception | None):
+    async def _request():
+        if exception:
+            raise exception
+        return "ok"
+
+    return asyncio.run(breaker.call_guarded(_request))
+
+
+def test_client_errors_do_not_reset_the_failure_count():
+    _breaker = HostCircuitBreaker(failure_threshold=3, recovery_timeout=60, name="example.com")
+    for _ in range(2):
+        with pytest.raises(BadGatewayException):
+            _call(_breaker, BadGatewayException(message="502"))
+        with pytest.raises(RequestError):
+            _call(_breaker, RequestError(message="404"))
+    assert _breaker.failure_count == 2
+    with pytest.raises(BadGatewayException):
+        _call(_breaker, BadGatewayException(message="502"))
+    assert _breaker.opened
+
+
+def test_success_resets_the_failure_count():
+    _breaker = HostCircuitBreaker(failure_threshold=3, recovery_timeout=60, name="example.com")
+    with pytest.raises(BadGatewayException):
+        _call(_breaker, BadGatewayException(message="502"))
+    assert _call(_breaker, None) == "ok"
+    assert _breaker.failure_count == 0
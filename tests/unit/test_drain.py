@@ -0,0 +1,61 @@
+import asyncio
+
+from src.app.scheduler.drain import AdaptiveBatchSize, DrainLoop
+
+
+def test_batch_size_grows_additively_and_backs_off_multiplicatively():
+    _size = AdaptiveBatchSize(initial=100, minimum=10, maximum=130, target_latency=1.0, increment=10)
+
+    _size.record(0.1)
+    _size.record(0.1)
+    assert _size.value == 120
+    _size.record(0.1)
+    _size.record(0.1)
+    assert _size.value == 130
+
+    _size.record(50.0)
+    assert _size.value == 65
+    for _ in range(10):
+        _size.record(50.0)
+    assert _size.value == 10
+
+
+def test_latency_is_recorded_once_per_claimed_batch():
+    _recorded: list[float] = []
+
+    class _Recording(AdaptiveBatchSize):
+        def record(self, latency: float) -> None:
+            _recorded.append(latency)
+            super().record(latency)
+
+    _batches = [[{"id": 1}, {"id": 2}, {"id": 3}], [{"id": 4}]]
+    _dispatched: list[int] = []
+
+    async def _claim(limit: int) -> list[dict]:
+        return _batches.pop(0) if _batches else []
+
+    async def _dispatch(row: dict) -> None:
+        await asyncio.sleep(0)
+        _dispatched.append(row["id"])
+
+    async def _next_due():
+        return None
+
+    async def _run():
+        _loop = DrainLoop(
+            "test",
+            _claim,
+            _dispatch,
+            _next_due,
+            _Recording(initial=10, minimum=1, maximum=10, target_latency=1.0),
+            max_in_flight=10,
+            max_idle=0.05,
+        )
+        _loop.start()
+        await asyncio.sleep(0.02)
+        await _loop.stop()
+
+    asyncio.run(_run())
+
+    assert sorted(_dispatched) == [1, 2, 3, 4]
+    assert len(_recorded) == 2
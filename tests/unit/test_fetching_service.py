@@ -0,0 +1,89 @@
+import asyncio
+import contextlib
+import hashlib
+from http import HTTPStatus
+from types import SimpleNamespace
+
+from src.app.crawler.dto import ScrapedPageDto
+from src.app.crawler.service import FetchingService
+
+
+class _Repository:
+    def __init__(self, updates: list):
+        self._updates = updates
+
+    async def update_url(self, url_id, kwargs):
+        self._updates.append(kwargs)
+
+
+class _Uow:
+    def __init__(self):
+        self.updates: list[dict] = []
+
+    @contextlib.asynccontextmanager
+    async def atomic(self, read_only=False):
+        yield None
+
+    def get_repository(self, repository, session):
+        return _Repository(self.updates)
+
+
+class _Scraper:
+    def __init__(self, status_code: int, text: str = "", headers: dict | None = None):
+        self._page = ScrapedPageDto(
+            url="https://example.com/a",
+            final_url="https://example.com/a",
+            status_code=status_code,
+            headers=headers or {},
+            content_type="text/html",
+            encoding="utf-8",
+            size=len(text),
+            elapsed=0.01,
+            text=text,
+        )
+        self.headers = None
+
+    async def fetch_page(self, url, headers=None):
+        self.headers = headers
+        return self._page
+
+
+class _Archive:
+    async def put_text(self, text: str) -> str:
+        return "segment:0:1"
+
+
+def _url(**kwargs):
+    _values = {"id": 1, "url": "https://example.com/a", "etag": None, "last_modified": None, "content_hash": None}
+    return SimpleNamespace(**{**_values, **kwargs})
+
+
+def _service(scraper, uow):
+    return FetchingService(uow=uow, scraper=scraper, page_archive=_Archive(), feed_max_bytes=1024, feed_max_sitemaps=1)
+
+
+def test_not_modified_page_is_skipped():
+    _uow, _scraper = _Uow(), _Scraper(HTTPStatus.NOT_MODIFIED)
+    _page = asyncio.run(_service(_scraper, _uow).fetch_info_from_url(_url(etag='"v1"', content_hash="h")))
+    assert _page is None
+    assert _scraper.headers == {"If-None-Match": '"v1"'}
+    assert list(_uow.updates[0]) == ["crawled_at"]
+
+
+def test_changed_page_returns_validators_without_storing_them():
+    _uow, _scraper = _Uow(), _Scraper(HTTPStatus.OK, text="<html>new</html>", headers={"etag": '"v2"'})
+    _page = asyncio.run(_service(_scraper, _uow).fetch_info_from_url(_url(content_hash="old")))
+    assert _page.text == "<html>new</html>"
+    assert (_page.content_type, _page.http_status) == ("text/html", 200)
+    assert _page.validators.etag == '"v2"'
+    assert _page.validators.content_hash == hashlib.sha256(b"<html>new</html>").hexdigest()
+    assert set(_uow.updates[0]) == {"crawled_at", "blob_pointer"}
+
+
+def test_unchanged_body_stores_validators():
+    _text = "<html>same</html>"
+    _uow, _scraper = _Uow(), _Scraper(HTTPStatus.OK, text=_text, headers={"etag": '"v3"'})
+    _hash = hashlib.sha256(_text.encode()).hexdigest()
+    assert asyncio.run(_service(_scraper, _uow).fetch_info_from_url(_url(content_hash=_hash))) is None
+    assert _uow.updates[0]["etag"] == '"v3"'
+    assert _uow.updates[0]["content_hash"] == _hash
@@ -0,0 +1,60 @@
+import asyncio
+
+import httpx
+import pytest
+
+from src.core.utils.api.host_throttle import HostThrottle
+from src.core.utils.api.http_exceptions import ResponseTooLargeError, UnsupportedContentTypeError
+
+_URL = "https://example.am/news/1"
+
+
+def _throttle() -> HostThrottle:
+    return HostThrottle(
+        rate=1000,
+        burst=1000,
+        initial_concurrency=4,
+        min_concurrency=1,
+        max_concurrency=8,
+        target_latency=10,
+        backoff_factor=0.5,
+    )
+
+
+def _status_error(status_code: int) -> httpx.HTTPStatusError:
+    _request = httpx.Request("GET", _URL)
+    return httpx.HTTPStatusError("error", request=_request, response=httpx.Response(status_code, request=_request))
+
+
+async def _fail_in_slot(throttle: HostThrottle, exception: BaseException) -> None:
+    with pytest.raises(type(exception)):
+        async with throttle.slot(_URL):
+            raise exception
+
+
+@pytest.mark.parametrize(
+    "exception",
+    [
+        _status_error(404),
+        UnsupportedContentTypeError(message="image/png is not allowed"),
+        ResponseTooLargeError(message="too large"),
+    ],
+)
+def test_page_errors_leave_the_host_concurrency_unchanged(exception):
+    _throttle_ = _throttle()
+
+    asyncio.run(_fail_in_slot(_throttle_, exception))
+
+    assert _throttle_.snapshot()["example.am"]["concurrency"] == 4
+    assert _throttle_.snapshot()["example.am"]["failures"] == 0
+    assert _throttle_.snapshot()["example.am"]["in_flight"] == 0
+
+
+@pytest.mark.parametrize("exception", [_status_error(503), httpx.ConnectError("refused"), httpx.ReadTimeout("slow")])
+def test_host_failures_back_the_host_off(exception):
+    _throttle_ = _throttle()
+
+    asyncio.run(_fail_in_slot(_throttle_, exception))
+
+    assert _throttle_.snapshot()["example.am"]["concurrency"] == 2
+    assert _throttle_.snapshot()["example.am"]["failures"] == 1
@@ -0,0 +1,29 @@
+from src.app.crawler.dto import IndexDto
+from src.app.crawler.keywords import KeywordAutomaton
+
+
+def test_overlapping_keywords_are_all_counted():
+    _automaton = KeywordAutomaton([(1, "new york"), (2, "york city"), (3, "york")])
+
+    assert _automaton.count("New York City, new york.") == {1: 2, 2: 1, 3: 2}
+
+
+def test_keywords_match_whole_words_only():
+    _automaton = KeywordAutomaton([(1, "art")])
+
+    assert _automaton.count("Party art, ART! smart") == {1: 2}
+
+
+def test_armenian_keywords_are_casefolded_and_counted():
+    _automaton = KeywordAutomaton([(7, "Գյումրի"), (8, "Հայաստան")])
+
+    assert _automaton.count("ԳՅՈՒՄՐԻ — Հայաստանի երկրորդ քաղաքը Գյումրին չէ, այլ Գյումրի։") == {7: 2}
+
+
+def test_counts_are_keyed_by_keyword_id():
+    _automaton = KeywordAutomaton([(42, "budget"), (5, "Budget"), (9, "tax")])
+
+    _counts = _automaton.count("The budget and the tax; budget again.")
+
+    assert _counts == {42: 2, 9: 1}  # the duplicate keyword keeps the first id
+    assert IndexDto.from_counts(_counts).to_counts() == _counts
@@ -0,0 +1,39 @@
+import asyncio
+import hashlib
+
+from src.core.utils.page_archive import PageArchive
+
+
+def test_put_deduplicates_within_the_current_segment(tmp_path):
+    _archive = PageArchive(str(tmp_path), segment_max_bytes=1 << 20)
+
+    _first = asyncio.run(_archive.put_text("<html>page</html>"))
+    _second = asyncio.run(_archive.put_text("<html>page</html>"))
+
+    assert _first == _second
+    assert _archive.read_text(str(_first)) == "<html>page</html>"
+    _archive.close()
+
+
+def test_index_is_reset_when_the_segment_rolls_over(tmp_path):
+    _archive = PageArchive(str(tmp_path), segment_max_bytes=1)
+
+    asyncio.run(_archive.put_text("first"))
+    _pointer = asyncio.run(_archive.put_text("second"))
+
+    assert list(_archive._index.values()) == [_pointer]
+    _archive.close()
+
+
+def test_find_falls_back_to_other_segments(tmp_path):
+    _writer = PageArchive(str(tmp_path), segment_max_bytes=1 << 20)
+    _pointer = asyncio.run(_writer.put_text("shared body"))
+    _writer.close()
+
+    _reader = PageArchive(str(tmp_path), segment_max_bytes=1 << 20)
+    _digest = hashlib.sha256(b"shared body").hexdigest()
+
+    assert asyncio.run(_reader.find(_digest)) == _pointer
+    assert asyncio.run(_reader.find("00" * 32)) is None
+    assert _reader.read_text(_pointer) == "shared body"
+    _reader.close()
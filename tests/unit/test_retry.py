@@ -0,0 +1,78 @@
+import asyncio
+import datetime
+
+import pytest
+from pydantic import BaseModel
+
+from src.app.scheduler.dto import SchedulerStatusType
+from src.app.scheduler.retry import RetryPolicy
+
+
+class _Message(BaseModel):
+    url: int
+
+
+def _validation_error() -> Exception:
+    try:
+        _Message(url="not a number")
+    except Exception as e:
+        return e
+    raise AssertionError("expected a validation error")
+
+
+def _policy(**kwargs) -> RetryPolicy:
+    return RetryPolicy(
+        **{"base_delay": 10, "max_delay": 100, "jitter": 0.2, "max_attempts": 4, "max_attempts_overrides": None, **kwargs}
+    )
+
+
+@pytest.mark.parametrize("failures, expected", [(0, 10), (1, 10), (2, 20), (3, 40), (4, 80), (5, 100), (30, 100)])
+def test_delay_doubles_up_to_the_cap(failures, expected):
+    assert _policy(jitter=0).delay(failures) == expected
+
+
+@pytest.mark.parametrize("failures", [1, 3, 10])
+def test_jitter_stays_within_bounds(failures):
+    _policy_ = _policy()
+    _base = _policy(jitter=0).delay(failures)
+    _delays = [_policy_.delay(failures) for _ in range(500)]
+
+    assert all(_base * 0.8 <= _delay <= _base * 1.2 for _delay in _delays)
+    assert len(set(_delays)) > 1
+
+
+def test_validation_errors_are_permanent():
+    assert RetryPolicy.is_permanent(_validation_error())
+
+
+@pytest.mark.parametrize(
+    "exception", [ValueError("x"), TypeError("x"), KeyError("x"), AttributeError("x"), OSError("x"), asyncio.TimeoutError()]
+)
+def test_other_errors_are_transient(exception):
+    assert not RetryPolicy.is_permanent(exception)
+
+
+def test_on_failure_reschedules_transient_errors():
+    _before = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+
+    _outcome = _policy(jitter=0).on_failure(7, 1, "https://example.am/a", ConnectionError("refused"))
+
+    assert _outcome.status == SchedulerStatusType.PENDING
+    assert _outcome.retry_count == 2
+    assert _outcome.retry_at - _before >= datetime.timedelta(seconds=20)
+
+
+def test_on_failure_fails_permanent_errors_and_exhausted_rows():
+    _policy_ = _policy(max_attempts_overrides={"example.am": 2})
+
+    assert _policy_.on_failure(1, 0, "https://example.am/a", _validation_error()).status == SchedulerStatusType.FAILED
+    assert _policy_.on_failure(1, 1, "https://news.example.am/a", OSError()).status == SchedulerStatusType.FAILED
+    assert _policy_.on_failure(1, 1, "https://other.am/a", OSError()).status == SchedulerStatusType.PENDING
+
+
+def test_rows_reclaimed_too_often_are_abandoned():
+    _policy_ = _policy(max_reclaims=2)
+
+    assert not _policy_.is_abandoned(0)
+    assert not _policy_.is_abandoned(2)
+    assert _policy_.is_abandoned(3)
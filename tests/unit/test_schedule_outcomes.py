@@ -0,0 +1,66 @@
+import asyncio
+
+from src.app.scheduler.dto import ScheduleOutcome, SchedulerStatusType
+from src.app.scheduler.lease import LeaseHeartbeat
+from src.app.scheduler.model import ScheduledUrl
+from src.app.scheduler.outcomes import ScheduleOutcomeWriter
+from src.app.scheduler.service import SchedulerService
+
+
+class _FakeWriter(ScheduleOutcomeWriter):
+    def __init__(self, fail: bool = False):
+        super().__init__(uow=None, owner="test", batch_size=100, flush_interval=0.01)
+        self.fail = fail
+        self.written: list[list[int]] = []
+
+    async def write(self, model, outcomes) -> None:
+        await asyncio.sleep(0)
+        if self.fail:
+            raise ConnectionError("database is gone")
+        self.written.append([_outcome.id for _outcome in outcomes])
+
+
+def _outcome(schedule_id: int) -> ScheduleOutcome:
+    return ScheduleOutcome(schedule_id, SchedulerStatusType.COMPLETED, 0)
+
+
+def test_record_resolves_once_the_flush_wrote_the_outcome():
+    _writer = _FakeWriter()
+
+    async def _run():
+        _first = _writer.record_scheduled_url(_outcome(1))
+        _second = _writer.record_scheduled_url(_outcome(2))
+        assert not _first.done()
+        await asyncio.gather(_first, _second)
+
+    asyncio.run(_run())
+    assert _writer.written == [[1, 2]]
+
+
+def test_record_resolves_when_the_flush_fails():
+    _writer = _FakeWriter(fail=True)
+
+    async def _run():
+        await asyncio.wait_for(_writer.record_scheduled_url(_outcome(1)), timeout=1)
+
+    asyncio.run(_run())
+
+
+def test_lease_is_held_until_the_outcome_is_flushed():
+    _writer = _FakeWriter()
+
+    async def _extend(ids: list[int]) -> int:
+        return len(ids)
+
+    async def _run():
+        _leases = LeaseHeartbeat(ScheduledUrl.__name__, _extend, interval=60)
+        _leases.hold([1])
+        _recorded = _writer.record_scheduled_url(_outcome(1))
+        SchedulerService._release_lease(_leases, 1, _recorded)
+        assert _leases._held == {1}
+        await _recorded
+        await asyncio.sleep(0)
+        assert _leases._held == set()
+        await _leases.stop()
+
+    asyncio.run(_run())
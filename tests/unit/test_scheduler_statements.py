@@ -0,0 +1,25 @@
+from sqlalchemy.dialects import postgresql
+
+from src.app.scheduler.dto import ScheduleOutcome, SchedulerStatusType
+from src.app.scheduler.model import ScheduledUrl
+from src.app.scheduler.repo import claim_due_scheduled_urls_stmt, record_outcomes_stmt
+
+
+def _sql(stmt) -> str:
+    return str(stmt.compile(dialect=postgresql.dialect()))
+
+
+def test_claim_counts_reclaims_but_not_attempts():
+    _sql_ = _sql(claim_due_scheduled_urls_stmt(100, "replica", 300))
+
+    assert "reclaim_count=(scheduled_url.reclaim_count + CASE WHEN (scheduled_url.status = '4')" in _sql_
+    assert "retry_count=" not in _sql_
+    assert (
+        "RETURNING scheduled_url.id, scheduled_url.task_data, scheduled_url.retry_count, scheduled_url.reclaim_count" in _sql_
+    )
+
+
+def test_recorded_outcome_resets_the_reclaim_count():
+    _outcomes = [ScheduleOutcome(1, SchedulerStatusType.COMPLETED, 0)]
+
+    assert "reclaim_count=" in _sql(record_outcomes_stmt(ScheduledUrl, _outcomes, "replica"))
@@ -0,0 +1,49 @@
+import asyncio
+from http import HTTPStatus
+
+import httpx
+import pytest
+
+from src.core.utils.api.custom_requests import create_streaming_get_request
+from src.core.utils.api.http_client import DEFAULT_CLIENT, HTTP_CLIENTS
+from src.core.utils.api.http_exceptions import RequestError
+
+
+@pytest.fixture
+def respond(monkeypatch):
+    def _install(handler):
+        monkeypatch.setitem(HTTP_CLIENTS._clients, DEFAULT_CLIENT, httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+
+    return _install
+
+
+def test_not_modified_is_returned_without_raising(respond):
+    _seen = {}
+
+    def _handler(request: httpx.Request) -> httpx.Response:
+        _seen.update(request.headers)
+        return httpx.Response(HTTPStatus.NOT_MODIFIED, headers={"etag": '"v1"'})
+
+    respond(_handler)
+    _response = asyncio.run(
+        create_streaming_get_request(url="", base_url="https://example.com/a", headers={"If-None-Match": '"v1"'})
+    )
+    assert _seen["if-none-match"] == '"v1"'
+    assert _response.status_code == HTTPStatus.NOT_MODIFIED
+    assert _response.text == ""
+    assert _response.headers["etag"] == '"v1"'
+
+
+def test_client_error_still_raises(respond):
+    respond(lambda request: httpx.Response(HTTPStatus.NOT_FOUND))
+    with pytest.raises(RequestError):
+        asyncio.run(create_streaming_get_request(url="", base_url="https://example.com/missing"))
+
+
+def test_body_is_decoded(respond):
+    _body = "<html><body>Բարեւ</body></html>".encode() * 200
+    respond(lambda request: httpx.Response(HTTPStatus.OK, headers={"content-type": "text/html; charset=utf-8"}, content=_body))
+    _response = asyncio.run(create_streaming_get_request(url="", base_url="https://example.com/a"))
+    assert _response.status_code == HTTPStatus.OK
+    assert _response.size == len(_body)
+    assert _response.text == _body.decode()
@@ -0,0 +1,64 @@
+import importlib
+
+import pytest
+
+from src.app.crawler.dto import ExtractionProfileDto
+from src.app.crawler.links import filter_links
+from src.core.utils.urls import normalize_url, url_hash
+
+
+@pytest.mark.parametrize(
+    "url, expected",
+    [
+        ("HTTPS://WWW.Example.AM", "https://www.example.am/"),
+        ("https://www.example.am/news/1", "https://www.example.am/news/1"),
+        ("http://example.am:80/a#comments", "http://example.am/a"),
+        ("https://example.am:8443/a", "https://example.am:8443/a"),
+        ("https://example.am/a?id=3&utm_source=fb&fbclid=x", "https://example.am/a?id=3"),
+        ("https://example.am/a?b=2&a=1", "https://example.am/a?b=2&a=1"),
+        ("https://wwwexample.am/", "https://wwwexample.am/"),
+        ("http://[::1]:8080/", "http://[::1]:8080/"),
+    ],
+)
+def test_normalize_url(url, expected):
+    assert normalize_url(url) == expected
+
+
+def test_www_and_bare_host_share_a_hash():
+    assert url_hash("https://WWW.example.am/a?utm_source=x") == url_hash("https://example.am/a")
+    assert url_hash("https://wwwexample.am/a") != url_hash("https://example.am/a")
+
+
+def test_filter_links_keeps_normalized_same_site_pages():
+    _links = [
+        "https://www.example.am/news/1?utm_medium=rss",
+        "https://example.am/news/1",
+        "https://sport.example.am/match",
+        "https://other.am/news/2",
+        "https://example.am/logo.PNG",
+        "https://www.example.am/",
+        "https://example.am:bad/port",
+    ]
+
+    assert filter_links(_links, "https://www.example.am") == [
+        "https://www.example.am/news/1",
+        "https://sport.example.am/match",
+    ]
+
+
+def test_filter_links_applies_profile_patterns():
+    _profile = ExtractionProfileDto(
+        domain="www.example.am", link_allow_patterns=(r"/news/",), link_deny_patterns=(r"/news/tag/",)
+    )
+    _links = ["https://example.am/news/1", "https://example.am/news/tag/x", "https://example.am/about"]
+
+    assert filter_links(_links, "https://example.am/news", _profile) == ["https://example.am/news/1"]
+
+
+def test_url_hash_migration_matches_the_current_url_hash():
+    # when url_hash changes, rehash the rows in a new migration: 9e4b7d2a61c8 must stay as it is
+    _migration = importlib.import_module("src.core.migrations.versions.9e4b7d2a61c8_url_hash")
+
+    assert "url_hash" not in vars(_migration) and "normalize_url" not in vars(_migration)
+    for _url in ("https://WWW.example.am/a?utm_source=x&id=1#top", "http://example.am:80", "not a url"):
+        assert _migration._url_hash(_url) == url_hash(_url)